@@ -0,0 +1,69 @@
+"""Benchmark utils.async_extract dibandingkan scrape_fashion berbasis thread pada katalog lokal.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.async_benchmark [--pages 50] [--latency-ms 50] [--workers 8]
+
+Selain durasi, diukur juga jeda terbesar event loop selama scraping async (coroutine lain yang
+berjalan bersamaan), yang harus tetap kecil karena fetch dan parsing tidak memblokir loop.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+
+from benchmarks.server import CatalogServer
+from utils.async_extract import async_scrape_fashion
+from utils.extract import Fetcher, scrape_fashion
+
+
+def scrape_threads(server, workers):
+    with Fetcher(pool_size=workers) as fetcher, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        rows = len(scrape_fashion(server.base_url, delay=0, max_workers=workers, fetcher=fetcher,
+                                  parser='auto', initial_url=server.initial_url))
+        return time.perf_counter() - start, rows, None
+
+
+async def scrape_async(server, workers):
+    longest_gap = 0.0
+
+    async def heartbeat():
+        nonlocal longest_gap
+        last = time.perf_counter()
+        while True:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            longest_gap = max(longest_gap, now - last)
+            last = now
+
+    task = asyncio.create_task(heartbeat())
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        rows = len(await async_scrape_fashion(server.base_url, max_workers=workers, parser='auto',
+                                              initial_url=server.initial_url))
+        seconds = time.perf_counter() - start
+    task.cancel()
+    return seconds, rows, longest_gap
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', type=int, default=50)
+    arg_parser.add_argument('--latency-ms', type=float, default=50.0)
+    arg_parser.add_argument('--workers', type=int, default=8)
+    args = arg_parser.parse_args()
+
+    with CatalogServer(args.pages, latency=args.latency_ms / 1000) as server:
+        print(f"{args.pages} halaman, latensi {args.latency_ms:g} ms, {args.workers} request bersamaan\n")
+        print(f"{'strategi':<28} {'detik':>8} {'halaman/s':>10} {'produk':>8} {'jeda loop (ms)':>15}")
+        for name, run in (("thread (scrape_fashion)", lambda: scrape_threads(server, args.workers)),
+                          ("asyncio (async_scrape)", lambda: asyncio.run(scrape_async(server, args.workers)))):
+            seconds, rows, gap = run()
+            shown = '-' if gap is None else f"{gap * 1000:.1f}"
+            print(f"{name:<28} {seconds:>8.2f} {args.pages / seconds:>10.1f} {rows:>8} {shown:>15}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Benchmark menulis dan membaca ulang hasil pipeline dalam format CSV, CSV gzip, Parquet, dan Arrow.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.files_benchmark [--rows 1000000]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.transform_benchmark import synthetic_rows
+from utils.files import append_to_csv, read_history, store_to_feather, store_to_parquet
+from utils.transform import TransformEngine
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def folder_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    data, _ = TransformEngine(16000).transform(synthetic_rows(args.rows))
+    print(f"{len(data):,} baris hasil transformasi\n")
+
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path = os.path.join(folder, 'fashion_data.csv')
+        gzip_path = os.path.join(folder, 'fashion_data.csv.gz')
+        parquet_dir = os.path.join(folder, 'parquet')
+        arrow_dir = os.path.join(folder, 'arrow')
+
+        cases = [
+            ("csv", csv_path,
+             lambda: data.to_csv(csv_path, index=False),
+             lambda: pd.read_csv(csv_path)),
+            ("csv.gz", gzip_path,
+             lambda: append_to_csv(data, gzip_path),
+             lambda: pd.read_csv(gzip_path)),
+            ("parquet zstd", parquet_dir,
+             lambda: store_to_parquet(data, parquet_dir),
+             lambda: read_history(parquet_dir)),
+            ("arrow (mmap)", arrow_dir,
+             lambda: store_to_feather(data, arrow_dir, compression='uncompressed'),
+             lambda: read_history(arrow_dir, fmt='feather')),
+        ]
+
+        print(f"{'format':<14} {'tulis s':>8} {'baca s':>8} {'ukuran MB':>10}")
+        for name, path, write, read in cases:
+            _, write_seconds = timed(write)
+            _, read_seconds = timed(read)
+            print(f"{name:<14} {write_seconds:>8.2f} {read_seconds:>8.2f} {folder_size(path) / 1e6:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
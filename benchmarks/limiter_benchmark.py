@@ -0,0 +1,49 @@
+"""Benchmark jeda tetap dibandingkan AdaptiveLimiter terhadap server lokal yang membatasi laju.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.limiter_benchmark [--pages 200] [--rate-limit 20] [--latency-ms 100] [--delay 0.2]
+
+Server (benchmarks.server) membalas 429 + Retry-After jika menerima lebih dari --rate-limit
+request per detik. Jeda tetap yang terlalu kecil banyak terkena 429, sedangkan jeda tetap yang
+aman jauh lebih lambat dari kapasitas origin; AdaptiveLimiter diharapkan mendekati kapasitas itu.
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.server import CatalogServer
+from utils.extract import AdaptiveLimiter, Fetcher, available_parsers, scrape_fashion
+
+
+def run(args, name, delay=2, max_workers=1, limiter=None):
+    with CatalogServer(args.pages, latency=args.latency_ms / 1000, rate_limit=args.rate_limit) as server:
+        with Fetcher(pool_size=max(max_workers, 10), limiter=limiter) as fetcher:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                data = scrape_fashion(server.base_url, delay=delay, max_workers=max_workers, fetcher=fetcher,
+                                      parser=available_parsers()[0], initial_url=server.initial_url)
+            seconds = time.perf_counter() - start
+        print(f"{name:<28} {seconds:>8.1f} {server.requests / seconds:>10.1f} {server.throttled:>6} {len(data):>8}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', type=int, default=200)
+    arg_parser.add_argument('--rate-limit', type=float, default=20.0)
+    arg_parser.add_argument('--latency-ms', type=float, default=100.0)
+    arg_parser.add_argument('--delay', type=float, default=0.2, help='jeda tetap pembanding (detik)')
+    arg_parser.add_argument('--workers', type=int, default=8)
+    args = arg_parser.parse_args()
+
+    print(f"{args.pages} halaman, origin maksimal {args.rate_limit:g} req/s, latensi {args.latency_ms:g} ms\n")
+    print(f"{'strategi':<28} {'detik':>8} {'req/s':>10} {'429':>6} {'produk':>8}")
+    run(args, f"jeda tetap {args.delay:g} s", delay=args.delay)
+    run(args, "jeda tetap 0 s", delay=0)
+    run(args, f"adaptive, {args.workers} worker", max_workers=args.workers,
+        limiter=AdaptiveLimiter(max_concurrency=args.workers, max_rate=args.rate_limit * 2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark memori list of dict dibandingkan FashionColumns untuk hasil extract.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.memory_benchmark [--products 100000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.synthetic import render_page
+from utils.extract import FashionColumns, available_parsers, parse_page
+from utils.transform import transform_to_DataFrame
+
+PRODUCTS_PER_PAGE = 1000
+
+
+def pages(products):
+    """Menghasilkan halaman sintetis berisi total `products` produk, satu per satu."""
+    total_pages = max(products // PRODUCTS_PER_PAGE, 1)
+    for page_number in range(1, total_pages + 1):
+        yield render_page(page_number, total_pages, PRODUCTS_PER_PAGE).encode()
+
+
+def retained_bytes(build, products, parser):
+    """Mengukur memori yang tertahan oleh struktur hasil `build` setelah seluruh halaman diproses."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    container = build()
+    for content in pages(products):
+        records, _ = parse_page(content, parser)
+        container.extend(records)
+        del records, content
+
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained, container
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--products', type=int, default=100_000)
+    args = arg_parser.parse_args()
+    parser = available_parsers()[0]
+
+    rows_bytes, rows = retained_bytes(list, args.products, parser)
+    columns_bytes, columns = retained_bytes(FashionColumns, args.products, parser)
+    scale = 100_000 / len(rows)
+
+    print(f"{len(rows):,} produk valid (parser {parser})\n")
+    print(f"{'representasi':<16} {'MB per 100k':>12} {'byte/baris':>11}")
+    for name, size in (("list of dict", rows_bytes), ("FashionColumns", columns_bytes)):
+        print(f"{name:<16} {size * scale / 1e6:>12.1f} {size / len(rows):>11.0f}")
+    print(f"\npenghematan: {(rows_bytes - columns_bytes) * scale / 1e6:.1f} MB per 100k produk "
+          f"({1 - columns_bytes / rows_bytes:.0%})")
+
+    df_rows = transform_to_DataFrame(rows).memory_usage(deep=True).sum()
+    df_columns = transform_to_DataFrame(columns).memory_usage(deep=True).sum()
+    print(f"DataFrame mentah: {df_rows / 1e6:.1f} MB -> {df_columns / 1e6:.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark waktu parsing per halaman untuk setiap backend parser di utils.extract.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.parse_benchmark [folder_html] [--repeat N]
+
+Secara bawaan memakai halaman HTML tersimpan di benchmarks/pages. Halaman asli dapat
+disimpan ke folder lain (misalnya dengan curl) lalu diberikan sebagai argumen.
+"""
+import argparse
+import glob
+import os
+import statistics
+import time
+
+from utils.extract import available_parsers, parse_page
+
+PAGES_DIR = os.path.join(os.path.dirname(__file__), 'pages')
+
+
+def load_pages(folder):
+    """Membaca seluruh file .html pada folder sebagai bytes."""
+    paths = sorted(glob.glob(os.path.join(folder, '*.html')))
+    if not paths:
+        raise SystemExit(f"Tidak ada file HTML di {folder}")
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as file:
+            pages.append(file.read())
+    return pages
+
+
+def bench_parser(parser, pages, repeat):
+    """Mengukur waktu parsing setiap halaman sebanyak `repeat` kali, dalam milidetik."""
+    timings = []
+    for _ in range(repeat):
+        for content in pages:
+            start = time.perf_counter()
+            parse_page(content, parser)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('folder', nargs='?', default=PAGES_DIR)
+    arg_parser.add_argument('--repeat', type=int, default=20)
+    args = arg_parser.parse_args()
+
+    pages = load_pages(args.folder)
+    reference = [parse_page(content, 'html.parser')[0] for content in pages]
+    products = sum(len(records) for records in reference)
+    print(f"{len(pages)} halaman, {products} produk valid, {args.repeat} pengulangan\n")
+    print(f"{'backend':<12} {'median ms/hal':>14} {'p95 ms/hal':>11} {'speedup':>8}  hasil sama")
+
+    baseline = None
+    for parser in reversed(available_parsers()):
+        timings = bench_parser(parser, pages, args.repeat)
+        median = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        baseline = baseline or median
+
+        # Kolom Timestamp diabaikan karena dibuat saat parsing
+        same = all(
+            [dict(r, Timestamp=None) for r in parse_page(content, parser)[0]]
+            == [dict(r, Timestamp=None) for r in records]
+            for content, records in zip(pages, reference)
+        )
+        print(f"{parser:<12} {median:>14.2f} {p95:>11.2f} {baseline / median:>7.1f}x  {same}")
+
+
+if __name__ == '__main__':
+    main()
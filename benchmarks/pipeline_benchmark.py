@@ -0,0 +1,273 @@
+"""Benchmark offline seluruh pipeline: scraping dari server lokal, transformasi, dan setiap sink.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.pipeline_benchmark [--pages 50] [--products-per-page 20] [--workers 4]
+        [--latency-ms 0] [--parse-workers N] [--repeat 3] [--save-baseline] [--baseline benchmarks/baseline.json]
+
+Katalog sintetis disajikan oleh benchmarks.server, sink ditulis ke target lokal (SQLite,
+file sementara, dan Google Sheets palsu). Setiap tahap dicatat throughput, persentil latensi,
+dan puncak memori (tracemalloc, pada satu run terpisah agar tidak memperlambat pengukuran
+waktu). Dengan --save-baseline hasilnya disimpan sebagai baseline; tanpa itu hasil dibandingkan
+dengan baseline dan proses keluar dengan kode 1 jika ada regresi melebihi --tolerance.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.server import CatalogServer
+from utils.extract import Fetcher, ParsePool, available_parsers, scrape_fashion
+from utils.files import append_to_csv, store_to_parquet
+from utils.load import get_engine, store_to_csv, upsert_to_mysql
+from utils.sheets import SpreadsheetWriter, store_to_sheets
+from utils.transform import transform_data, transform_to_DataFrame
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Metrik yang dibandingkan dengan baseline: nama -> True jika nilai lebih besar lebih baik
+COMPARED_METRICS = {'throughput': True, 'p95_ms': False, 'peak_memory_mb': False}
+
+
+class TimedFetcher(Fetcher):
+    """Fetcher yang mencatat latensi setiap request dalam milidetik."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.latencies = []
+
+    def get(self, url):
+        start = time.perf_counter()
+        try:
+            return super().get(url)
+        finally:
+            self.latencies.append((time.perf_counter() - start) * 1000)
+
+
+class FakeSheetsService:
+    """Pengganti service Google Sheets yang hanya menampung baris di memori."""
+
+    def __init__(self):
+        self.rows = []
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, **kwargs):
+        return _Request(lambda: {'values': self.rows[:1]})
+
+    def append(self, body, **kwargs):
+        return _Request(lambda: self.rows.extend(body['values']) or {})
+
+
+class _Request:
+    def __init__(self, execute):
+        self.execute = execute
+
+
+def percentile(values, fraction):
+    """Persentil sederhana (nearest-rank) dari list angka."""
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def measure(function, repeat, units):
+    """Menjalankan `function` sebanyak `repeat` kali lalu sekali lagi di bawah tracemalloc.
+
+    `units(result)` memberi jumlah unit kerja (halaman, baris) untuk menghitung throughput.
+    Mengembalikan (hasil terakhir, statistik) dengan latensi per run dalam milidetik.
+    """
+    timings = []
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = function()
+            timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    seconds = statistics.median(timings)
+    stats = {
+        'seconds': seconds,
+        'throughput': units(result) / seconds if seconds else 0.0,
+        'p50_ms': percentile(timings, 0.50) * 1000,
+        'p95_ms': percentile(timings, 0.95) * 1000,
+        'peak_memory_mb': peak / 1e6,
+    }
+    return result, stats
+
+
+def bench_extract(server, args, parser):
+    """Mengukur scraping seluruh katalog; latensi dihitung per request HTTP.
+
+    Dengan --parse-workers, parsing dilakukan di ParsePool yang dibuat sekali di luar pengukuran.
+    """
+    latencies = []
+    pool = ParsePool(args.parse_workers) if args.parse_workers else None
+
+    def scrape():
+        fetcher = TimedFetcher(pool_size=max(args.workers, 10))
+        try:
+            data = scrape_fashion(server.base_url, delay=0, max_workers=args.workers, fetcher=fetcher,
+                                  parser=parser, columnar=True, initial_url=server.initial_url, parse_pool=pool)
+        finally:
+            fetcher.close()
+        latencies[:] = fetcher.latencies
+        return data
+
+    try:
+        data, stats = measure(scrape, args.repeat, lambda _: args.pages)
+    finally:
+        if pool is not None:
+            pool.close()
+    stats['unit'] = 'halaman/s'
+    stats['p50_ms'] = percentile(latencies, 0.50)
+    stats['p95_ms'] = percentile(latencies, 0.95)
+    return data, stats
+
+
+def bench_sinks(data, folder, repeat):
+    """Mengukur setiap sink secara terpisah terhadap target lokal."""
+    engine = get_engine(f"sqlite:///{os.path.join(folder, 'bench.sqlite')}")
+    sinks = {
+        'sqlite upsert': lambda: upsert_to_mysql(data, engine, raise_errors=True),
+        'csv': lambda: store_to_csv(data, os.path.join(folder, 'fashion_data.csv'), raise_errors=True),
+        'csv.gz append': lambda: append_to_csv(data, os.path.join(folder, 'fashion_data.csv.gz'),
+                                               raise_errors=True),
+        'parquet': lambda: store_to_parquet(data, os.path.join(folder, 'parquet'), raise_errors=True),
+        'sheets (palsu)': lambda: store_to_sheets(
+            data,
+            SpreadsheetWriter(FakeSheetsService(), checkpoint_path=os.path.join(folder, 'checkpoint.json')),
+            run_id=str(time.perf_counter_ns()),
+            raise_errors=True,
+        ),
+    }
+
+    results = {}
+    for name, sink in sinks.items():
+        _, stats = measure(sink, repeat, lambda _: len(data))
+        stats['unit'] = 'baris/s'
+        results[f'sink:{name}'] = stats
+    engine.dispose()
+    return results
+
+
+def run(args):
+    parser = args.parser or available_parsers()[0]
+    config = {
+        'pages': args.pages,
+        'products_per_page': args.products_per_page,
+        'workers': args.workers,
+        'latency_ms': args.latency_ms,
+        'parse_workers': args.parse_workers,
+        'parser': parser,
+    }
+    stages = {}
+
+    with CatalogServer(args.pages, args.products_per_page, latency=args.latency_ms / 1000) as server:
+        columns, stages['extract'] = bench_extract(server, args, parser)
+
+    raw = transform_to_DataFrame(columns)
+    data, stages['transform'] = measure(lambda: transform_data(raw, 16000), args.repeat, lambda _: len(raw))
+    stages['transform']['unit'] = 'baris/s'
+
+    with tempfile.TemporaryDirectory() as folder:
+        stages.update(bench_sinks(data, folder, args.repeat))
+
+    return {
+        'config': config,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'rows': {'extracted': len(columns), 'transformed': len(data)},
+        'stages': stages,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Membandingkan hasil dengan baseline; mengembalikan list pesan regresi."""
+    if baseline['config'] != result['config']:
+        print("Peringatan: konfigurasi berbeda dengan baseline, perbandingan mungkin tidak adil.")
+
+    regressions = []
+    for stage, stats in result['stages'].items():
+        reference = baseline['stages'].get(stage)
+        if reference is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = reference.get(metric), stats.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{stage} {metric}: {old:.2f} -> {new:.2f} ({change:+.0%})")
+    return regressions
+
+
+def report(result):
+    rows = result['rows']
+    print(f"{result['config']}\n{rows['extracted']:,} produk diekstrak, {rows['transformed']:,} baris valid\n")
+    print(f"{'tahap':<18} {'throughput':>14} {'':<10} {'p50 ms':>9} {'p95 ms':>9} {'puncak MB':>10}")
+    for stage, stats in result['stages'].items():
+        print(f"{stage:<18} {stats['throughput']:>14,.0f} {stats['unit']:<10} "
+              f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['peak_memory_mb']:>10.1f}")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--pages', type=int, default=50)
+    arg_parser.add_argument('--products-per-page', type=int, default=20)
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--latency-ms', type=float, default=0.0)
+    arg_parser.add_argument('--parser', choices=available_parsers())
+    arg_parser.add_argument('--parse-workers', type=int, default=0, help='jumlah proses parsing (0: proses utama)')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--baseline', default=BASELINE_PATH)
+    arg_parser.add_argument('--save-baseline', action='store_true')
+    arg_parser.add_argument('--tolerance', type=float, default=0.2)
+    arg_parser.add_argument('--output', help='menyimpan hasil run ini sebagai JSON')
+    args = arg_parser.parse_args()
+
+    result = run(args)
+    report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+        print(f"\nBaseline disimpan ke {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nBelum ada baseline di {args.baseline}; jalankan dengan --save-baseline.")
+        return
+
+    with open(args.baseline, encoding='utf-8') as file:
+        regressions = compare(result, json.load(file), args.tolerance)
+    if regressions:
+        print(f"\nRegresi melebihi {args.tolerance:.0%} dibanding baseline:")
+        for message in regressions:
+            print(f"  {message}")
+        sys.exit(1)
+    print(f"\nTidak ada regresi melebihi {args.tolerance:.0%} dibanding baseline.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Server HTTP lokal yang menyajikan katalog sintetis (benchmarks.synthetic) untuk benchmark offline.
+
+Halaman awal tersedia di "/" dan halaman berikutnya di "/page{n}", sama seperti situs aslinya.
+Halaman dibuat sekali di awal sehingga waktu pembuatan HTML tidak ikut terukur.
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.synthetic import render_page
+
+
+class CatalogServer:
+    """Menjalankan ThreadingHTTPServer di thread latar; dipakai sebagai context manager.
+
+    `latency` (detik) menambahkan jeda pada setiap respons untuk meniru jaringan sungguhan.
+    `rate_limit` (request/detik) meniru origin yang membalas 429 dengan Retry-After jika dibanjiri.
+    """
+
+    def __init__(self, pages=50, products_per_page=20, latency=0.0, seed=0, host='127.0.0.1', port=0,
+                 rate_limit=None):
+        self.pages = {
+            page_number: render_page(page_number, pages, products_per_page, seed).encode()
+            for page_number in range(1, pages + 1)
+        }
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.requests = 0
+        self.throttled = 0
+        self._tokens = float(rate_limit or 0)
+        self._refilled = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def initial_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def base_url(self):
+        return self.initial_url + "page{}"
+
+    def _take_token(self):
+        """Token bucket sederhana berkapasitas satu detik trafik; False jika request harus ditolak."""
+        if not self.rate_limit:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._refilled) * self.rate_limit, self.rate_limit)
+            self._refilled = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.throttled += 1
+            return False
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Header dan body dikirim terpisah; tanpa ini Nagle + delayed ACK menambah ~40 ms per respons
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                if not server._take_token():
+                    self.send_response(429)
+                    self.send_header('Retry-After', '1')
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                path = self.path.rstrip('/')
+                page_number = 1 if path == '' else None
+                if path.startswith('/page') and path[5:].isdigit():
+                    page_number = int(path[5:])
+
+                content = server.pages.get(page_number)
+                if content is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
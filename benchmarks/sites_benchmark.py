@@ -0,0 +1,58 @@
+"""Benchmark scraping beberapa katalog: satu per satu dibandingkan bersamaan lewat utils.sites.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.sites_benchmark [--sites 3] [--pages 20] [--latency-ms 50] [--concurrency 2]
+
+Setiap situs adalah server lokal (benchmarks.server) dengan spesifikasi FASHION_STUDIO yang
+diarahkan ke alamatnya dan anggaran --concurrency request bersamaan per situs.
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.server import CatalogServer
+from utils.extract import AdaptiveLimiter, Fetcher
+from utils.sites import FASHION_STUDIO, SiteExtractor, iter_sites, site_limits, site_pages
+
+
+def scrape(extractors, concurrent):
+    limiter = AdaptiveLimiter(initial_rate=1000, max_rate=1000, host_limits=site_limits(extractors, 1000))
+    with Fetcher(pool_size=sum(extractor.concurrency for extractor in extractors), limiter=limiter) as fetcher:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if concurrent:
+                sources = {extractor.name: site_pages(extractor, fetcher) for extractor in extractors}
+                rows = sum(len(records) for _, _, records in iter_sites(sources))
+            else:
+                rows = sum(len(records) for extractor in extractors for _, records in site_pages(extractor, fetcher))
+        return time.perf_counter() - start, rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--sites', type=int, default=3)
+    arg_parser.add_argument('--pages', type=int, default=20)
+    arg_parser.add_argument('--latency-ms', type=float, default=50.0)
+    arg_parser.add_argument('--concurrency', type=int, default=2)
+    args = arg_parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        servers = [stack.enter_context(CatalogServer(args.pages, latency=args.latency_ms / 1000, seed=index))
+                   for index in range(args.sites)]
+        extractors = [
+            SiteExtractor(dict(FASHION_STUDIO, name=f"toko-{index}", initial_url=server.initial_url,
+                               page_url=server.base_url, concurrency=args.concurrency, requests_per_second=None))
+            for index, server in enumerate(servers)
+        ]
+        print(f"{args.sites} situs x {args.pages} halaman, latensi {args.latency_ms:g} ms, "
+              f"{args.concurrency} request bersamaan per situs\n")
+        print(f"{'strategi':<24} {'detik':>8} {'halaman/s':>10} {'produk':>8}")
+        for name, concurrent in (("satu per satu", False), ("bersamaan (iter_sites)", True)):
+            seconds, rows = scrape(extractors, concurrent)
+            print(f"{name:<24} {seconds:>8.2f} {args.sites * args.pages / seconds:>10.1f} {rows:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark waktu cold start main.py untuk run scraping saja (mode extract) dan run CSV saja.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.startup_benchmark [--repeat 5] [--pages 2]
+
+Setiap run adalah proses Python baru yang menjalankan main.py terhadap server lokal
+(benchmarks.server) dengan katalog kecil, sehingga waktunya didominasi impor dan inisialisasi.
+Pembanding "impor eager" mengimpor pandas, SQLAlchemy, dan Google API client terlebih dahulu,
+seperti yang terjadi sebelum sink diimpor secara lazy. Diukur juga waktu impor modul saja.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.server import CatalogServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EAGER_IMPORTS = "import pandas, sqlalchemy, googleapiclient.discovery, google.oauth2.service_account"
+
+
+def run_main(arguments, eager, workdir):
+    """Menjalankan main.py di proses baru dan mengembalikan durasinya dalam detik."""
+    code = "import runpy, sys\n"
+    if eager:
+        code += EAGER_IMPORTS + "\n"
+    code += f"sys.path.insert(0, {ROOT!r})\nsys.argv = ['main.py'] + {arguments!r}\n"
+    code += f"runpy.run_path({os.path.join(ROOT, 'main.py')!r}, run_name='__main__')\n"
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=workdir, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def run_import(statement):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def median(function, repeat):
+    return statistics.median(function() for _ in range(repeat))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--pages', type=int, default=2)
+    args = arg_parser.parse_args()
+
+    print(f"median {args.repeat} proses baru per skenario\n")
+    print(f"{'skenario':<34} {'lazy (s)':>9} {'eager (s)':>10} {'selisih':>9}")
+
+    lazy = median(lambda: run_import("import main"), args.repeat)
+    eager = median(lambda: run_import(f"{EAGER_IMPORTS}; import main"), args.repeat)
+    print(f"{'impor main':<34} {lazy:>9.3f} {eager:>10.3f} {eager - lazy:>9.3f}")
+
+    with CatalogServer(args.pages) as server:
+        common = ['--base-url', server.base_url, '--initial-url', server.initial_url, '--max-workers', '1',
+                  '--max-requests-per-second', '1000']
+        scenarios = {
+            'scraping saja (--mode extract)': common + ['--mode', 'extract'],
+            'CSV saja (--sinks csv)': common + ['--sinks', 'csv'],
+        }
+        for name, arguments in scenarios.items():
+            with tempfile.TemporaryDirectory() as workdir:
+                lazy = median(lambda: run_main(arguments, False, workdir), args.repeat)
+            with tempfile.TemporaryDirectory() as workdir:
+                eager = median(lambda: run_main(arguments, True, workdir), args.repeat)
+            print(f"{name:<34} {lazy:>9.3f} {eager:>10.3f} {eager - lazy:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Pembuat halaman HTML sintetis yang meniru struktur katalog fashion-studio.dicoding.dev."""
+import random
+
+PRODUCT_TYPES = ["T-shirt", "Hoodie", "Pants", "Outerwear", "Jacket", "Shirt", "Dress"]
+SIZES = ["S", "M", "L", "XL", "XXL"]
+GENDERS = ["Men", "Women", "Unisex"]
+
+PRODUCT_TEMPLATE = """
+        <div class="collection-card">
+            <div style="position: relative;">
+                <img src="https://picsum.photos/280/350?random={index}" class="collection-image" alt="{title}">
+            </div>
+            <div class="product-details">
+                <h3 class="product-title">{title}</h3>
+                <div class="price-container"><span class="price">{price}</span></div>
+                <p style="font-size: 14px; color: #777;">Rating: {rating}</p>
+                <p style="font-size: 14px; color: #777;">{colors} Colors</p>
+                <p style="font-size: 14px; color: #777;">Size: {size}</p>
+                <p style="font-size: 14px; color: #777;">Gender: {gender}</p>
+            </div>
+        </div>"""
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Fashion Studio</title>
+</head>
+<body>
+    <div class="collection-grid" id="collectionList">{products}
+    </div>
+    <ul class="pagination">
+        <li class="page-item previous"><a class="page-link" href="/page{previous}">Previous</a></li>
+{links}
+{next_button}
+    </ul>
+</body>
+</html>
+"""
+
+
+def render_product(index, rng):
+    """Membuat satu kartu produk, sesekali berisi nilai kotor seperti pada situs aslinya."""
+    roll = rng.random()
+    title = f"{rng.choice(PRODUCT_TYPES)} {index}"
+    price = f"${rng.uniform(10, 500):.2f}"
+    rating = f"⭐ {rng.uniform(1, 5):.1f} / 5"
+
+    if roll < 0.02:
+        title = "Unknown Product"
+    elif roll < 0.04:
+        price = "Price Unavailable"
+    elif roll < 0.06:
+        rating = "⭐ Invalid Rating / 5"
+    elif roll < 0.07:
+        rating = "Not Rated"
+
+    return PRODUCT_TEMPLATE.format(
+        index=index,
+        title=title,
+        price=price,
+        rating=rating,
+        colors=rng.randint(1, 8),
+        size=rng.choice(SIZES),
+        gender=rng.choice(GENDERS),
+    )
+
+
+def render_page(page_number, total_pages, products_per_page=20, seed=0):
+    """Membuat satu halaman katalog lengkap dengan widget pagination."""
+    rng = random.Random(seed * 1_000_003 + page_number)
+    first_index = (page_number - 1) * products_per_page + 1
+    products = "".join(
+        render_product(index, rng) for index in range(first_index, first_index + products_per_page)
+    )
+
+    links = "\n".join(
+        f'        <li class="page-item{" active" if number == page_number else ""}">'
+        f'<a class="page-link" href="/page{number}">{number}</a></li>'
+        for number in range(1, total_pages + 1)
+    )
+    next_button = ""
+    if page_number < total_pages:
+        next_button = f'        <li class="page-item next"><a class="page-link" href="/page{page_number + 1}">Next</a></li>'
+
+    return PAGE_TEMPLATE.format(
+        products=products,
+        previous=max(page_number - 1, 1),
+        links=links,
+        next_button=next_button,
+    )
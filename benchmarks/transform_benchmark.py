@@ -0,0 +1,70 @@
+"""Benchmark transform_data dibandingkan TransformEngine pada data sintetis.
+
+Jalankan dari root repository:
+
+    python -m benchmarks.transform_benchmark [--rows 1000000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.transform import TransformEngine, transform_data
+
+EXCHANGE_RATE = 16000
+
+
+def synthetic_rows(rows, seed=0):
+    """Membuat DataFrame mentah seperti keluaran scrape_fashion, termasuk nilai kotor."""
+    rng = np.random.default_rng(seed)
+    prices = np.char.add('$', np.round(rng.uniform(10, 500, rows), 2).astype(str)).astype(object)
+    prices[rng.random(rows) < 0.02] = "Price Unavailable"
+    ratings = np.char.add(np.char.add('⭐ ', np.round(rng.uniform(1, 5, rows), 1).astype(str)), ' / 5').astype(object)
+    ratings[rng.random(rows) < 0.02] = "⭐ Invalid Rating / 5"
+    # Timestamp dibuat per detik scraping sehingga berulang untuk banyak produk
+    seconds = np.sort(rng.integers(0, rows // 20 + 1, rows))
+    timestamps = (pd.Timestamp('2025-05-28 18:00:00') + pd.to_timedelta(seconds, unit='s')).strftime('%Y-%m-%d %H:%M:%S')
+
+    return pd.DataFrame({
+        "Title": np.char.add('T-shirt ', rng.integers(0, rows, rows).astype(str)).astype(object),
+        "Price": prices,
+        "Rating": ratings,
+        "Colors": rng.integers(1, 9, rows).astype(str).astype(object),
+        "Size": rng.choice(["S", "M", "L", "XL", "XXL"], rows).astype(object),
+        "Gender": rng.choice(["Men", "Women", "Unisex"], rows).astype(object),
+        "Timestamp": np.asarray(timestamps, dtype=object),
+    })
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--rows', type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    raw = synthetic_rows(args.rows)
+    print(f"{len(raw):,} baris mentah, {raw.memory_usage(deep=True).sum() / 1e6:.1f} MB\n")
+
+    legacy, legacy_seconds = timed(transform_data, raw, EXCHANGE_RATE)
+    (engine_df, report), engine_seconds = timed(TransformEngine(EXCHANGE_RATE).transform, raw)
+
+    print(f"{'fungsi':<18} {'detik':>8} {'baris keluar':>13} {'memori MB':>10}")
+    for name, df, seconds in (
+        ("transform_data", legacy, legacy_seconds),
+        ("TransformEngine", engine_df, engine_seconds),
+    ):
+        memory = df.memory_usage(deep=True).sum() / 1e6
+        print(f"{name:<18} {seconds:>8.2f} {len(df):>13,} {memory:>10.1f}")
+
+    print(f"\nspeedup: {legacy_seconds / engine_seconds:.1f}x")
+    print(f"baris ditolak per aturan: {report['rejected']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,22 +1,243 @@
-from utils.extract import scrape_fashion
-from utils.transform import transform_data, transform_to_DataFrame
-from utils.load import store_to_mysql, store_to_csv, store_to_spreedsheet
-
-def main():
-    """Fungsi utama untuk keseluruhan proses scraping hingga menyimpannya."""
-    BASE_URL = 'https://fashion-studio.dicoding.dev/page{}'
-    all_fashions_data = scrape_fashion(BASE_URL)
-    dataframe = transform_to_DataFrame(all_fashions_data)
-    dataframe = transform_data(dataframe, 16000)
-    
-    #koneksi ke Database
-    db_url = 'mysql+mysqlconnector://root:@localhost/dicoding'
-
-    #Menyimpan data
-    store_to_mysql(dataframe, db_url)
-    store_to_csv(dataframe)
-    store_to_spreedsheet(dataframe)
+import json
+import os
+from utils.cache import PageCache
+from utils.config import load_config, parse_args
+from utils.extract import AdaptiveLimiter, FashionColumns, Fetcher, ParsePool, iter_fashion_pages
+from utils.journal import RunJournal
+from utils.load import run_sinks, sinks_from_config, spreadsheet_writer, store_batches
+from utils.metrics import RunMetrics
+
+def store_raw(pages, path):
+    """Menyimpan data hasil scraping apa adanya sebagai JSON Lines (mode extract); mengembalikan jumlah baris."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    rows = 0
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        for records in pages:
+            for fashion in records:
+                file.write(json.dumps(fashion, ensure_ascii=False) + '\n')
+                rows += 1
+    os.replace(temporary_path, path)
+    return rows
+
+def main(mode=None, resume=None, config=None):
+    """Fungsi utama untuk keseluruhan proses scraping hingga menyimpannya.
+
+    Seluruh pengaturan (sumber, sink, konkurensi, mode) berasal dari `config`
+    (utils.config.PipelineConfig); tanpa config dipakai load_config(): nilai bawaan, file
+    etl_config.json, lalu environment variable ETL_*. `mode` dan `resume` menimpa config.
+
+    mode='batch' memproses seluruh katalog sekaligus, mode='stream' mengalirkan data per halaman
+    dari extract hingga load sehingga memori tetap terbatas (hash deduplikasi dibatasi
+    config.dedup_memory_mb, kelebihannya ditumpahkan ke disk), dan mode='extract' hanya scraping
+    lalu menyimpan hasil mentahnya ke config.raw_path. Sink dijalankan secara paralel dan
+    ringkasan hasilnya (lihat utils.load.run_sinks) dikembalikan. Metrik run (durasi per tahap,
+    HTTP, baris, sink) ditulis sebagai laporan JSON dan file Prometheus.
+
+    Setiap run dicatat di jurnal (utils.journal.RunJournal). Dengan resume=True, run terakhir
+    dengan mode yang sama dilanjutkan jika belum selesai: halaman yang sudah diambil tidak di-fetch ulang dan sink
+    yang sudah commit tidak menulis ulang batch yang sama.
+
+    Dengan config.cdc, hasil transformasi dibandingkan dengan snapshot run sebelumnya (utils.cdc)
+    dan sink hanya menerima perubahan (insert, update, delete), bukan seluruh katalog. Pada run
+    incremental tidak ada delete karena produk di halaman yang tidak berubah tidak terlihat.
+
+    Dengan config.sites, beberapa katalog di-scrape bersamaan memakai spesifikasi extractor
+    deklaratif (utils.sites), masing-masing dengan anggaran laju dan konkurensinya sendiri.
+    Data dari situs mendapat kolom Site yang ikut menjadi identitas produk di CDC, MySQL, dan
+    riwayat produk (utils.load.product_key).
+
+    Sink history (utils.history) mencatat setiap run ke riwayat produk lokal berindeks untuk
+    query seperti riwayat harga per produk dan perubahan harga terbesar.
+
+    Baris yang gagal validasi (utils.validate) ditulis ke config.quarantine_path beserta alasannya.
+
+    Dengan config.transform_engine, data ditransformasi dengan TransformEngine (tipe kolom ringkas)
+    sebagai pengganti transform_data, baik pada mode batch maupun stream.
+
+    pandas, modul transformasi/CDC, dan dependensi sink baru diimpor jika dibutuhkan run ini.
+    """
+    config = config or load_config()
+    if mode is not None or resume is not None:
+        config = config.replace(**{name: value for name, value in (('mode', mode), ('resume', resume))
+                                   if value is not None})
+    mode = config.mode
+
+    journal = RunJournal(config.journal_path)
+    run_id = journal.resumable_run(mode) if config.resume else None
+    resumed = run_id is not None
+    if not resumed:
+        run_id = journal.start_run(mode)
+    else:
+        print(f"Melanjutkan run {run_id}")
+
+    # Satu session HTTP dipakai bersama untuk seluruh halaman; request yang gagal dilempar agar
+    # run tercatat gagal dan dapat dilanjutkan, bukan dianggap sebagai akhir katalog
+    metrics = RunMetrics(run_id)
+    snapshot = None
+    seen = None
+    tracker = None
+    cache = None
+    if config.incremental:
+        cache = PageCache(config.cache_path)
+        # Hasil fetch run gagal sebelumnya yang tidak dilanjutkan tidak boleh menjadi acuan perubahan
+        if not resumed:
+            cache.discard()
+    # parse_workers=None memakai satu proses parser per core CPU; 0 mem-parse di thread scraping
+    parse_pool = ParsePool(config.parse_workers) if config.parse_workers != 0 else None
+
+    # Dengan config.sites, beberapa katalog di-scrape bersamaan dengan anggaran laju/konkurensi per situs
+    extractors = []
+    if config.sites:
+        from utils.sites import compile_sites, iter_sites, site_limits, site_pages
+
+        extractors = compile_sites(config.sites)
+    limiter = AdaptiveLimiter(initial_rate=1.0, max_rate=config.max_requests_per_second,
+                              max_concurrency=config.max_workers,
+                              host_limits=site_limits(extractors, config.max_requests_per_second) if extractors else None)
+    pool_size = max(config.max_workers, sum(extractor.concurrency for extractor in extractors))
+    fetcher = Fetcher(pool_size=pool_size, cache=cache, metrics=metrics, raise_errors=True, limiter=limiter)
+
+    def fetch_pages(last_page):
+        options = dict(max_workers=config.max_workers, fetcher=fetcher, parser=config.parser,
+                       incremental=config.incremental, parse_pool=parse_pool)
+        if last_page is None:
+            return iter_fashion_pages(config.base_url, initial_url=config.initial_url, **options)
+        return iter_fashion_pages(config.base_url, start_page=last_page + 1, initial_url=None, **options)
+
+    def fetch_site_pages(extractor):
+        def fetch(last_page):
+            return site_pages(extractor, fetcher, start_page=None if last_page is None else last_page + 1,
+                              include_initial=last_page is None, incremental=config.incremental,
+                              parse_pool=parse_pool)
+        return fetch
+
+    def journaled_pages():
+        if not extractors:
+            return journal.pages(run_id, fetch_pages)
+        sources = {extractor.name: journal.pages(run_id, fetch_site_pages(extractor), source=extractor.name)
+                   for extractor in extractors}
+        return ((f"{name}/{page_number}", records) for name, page_number, records in iter_sites(sources))
+
+    try:
+        exchange_rate = config.exchange_rate
+        if config.rates_path and mode != 'extract':
+            from utils.currency import exchange_rate_from_config
+
+            exchange_rate = exchange_rate_from_config(config)
+        quarantine = None
+        if config.quarantine_path and mode != 'extract':
+            from utils.validate import QuarantineWriter
+
+            quarantine = QuarantineWriter(config.quarantine_path)
+
+        with metrics.profile(config.profile_path if config.profile else None, trace_memory=config.profile):
+            pages = journaled_pages()
+            if mode == 'extract':
+                with metrics.stage('extract'):
+                    rows = store_raw((records for _, records in pages), config.raw_path)
+                print(f"{rows} data mentah disimpan ke {config.raw_path}")
+                summary = {"status": "success", "rows": rows, "seconds": metrics.stages['extract']['seconds'],
+                           "sinks": {}}
+            elif mode == 'stream':
+                from utils.dedup import RowHashSet
+                from utils.transform import TransformEngine, transform_batches
+
+                report = {}
+                seen = RowHashSet(max_memory=int(config.dedup_memory_mb * 2 ** 20), path=config.dedup_path or None)
+                pages = (records for _, records in pages)
+                # Extract, transform, dan load saling tumpang tindih sehingga dicatat sebagai satu tahap
+                with metrics.stage('stream'):
+                    engine = TransformEngine(exchange_rate, quarantine=quarantine) if config.transform_engine else None
+                    batches = transform_batches(pages, exchange_rate, report=report, quarantine=quarantine, seen=seen,
+                                                engine=engine)
+                    sinks_factory = lambda first_batch, upload_id: sinks_from_config(config, first_batch,
+                                                                                     upload_id=upload_id)
+                    if config.cdc:
+                        from utils.cdc import SnapshotIndex, iter_changes
+
+                        snapshot = SnapshotIndex(config.snapshot_path)
+                        tracker = snapshot.tracker(track_deletes=not config.incremental)
+                        batches = iter_changes(batches, tracker)
+                        sinks_factory = lambda first_batch, upload_id: sinks_from_config(
+                            config, first_batch, delta=True, upload_id=upload_id)
+                    summary = store_batches(batches, config.db_url, sinks_factory=sinks_factory, journal=journal,
+                                            run_id=run_id)
+                metrics.record_transform(report)
+            else:
+                from utils.transform import TransformEngine, transform_data, transform_to_DataFrame
+
+                with metrics.stage('extract'):
+                    all_fashions_data = FashionColumns()
+                    for _, records in pages:
+                        all_fashions_data.extend(records)
+                with metrics.stage('transform'):
+                    report = {}
+                    dataframe = transform_to_DataFrame(all_fashions_data)
+                    if config.transform_engine:
+                        dataframe, report = TransformEngine(exchange_rate, quarantine=quarantine).transform(dataframe)
+                    elif dataframe is not None:
+                        dataframe = transform_data(dataframe, exchange_rate, report, quarantine)
+                metrics.record_transform(report)
+                if dataframe is None and config.incremental and not len(all_fashions_data):
+                    print("Tidak ada halaman yang berubah sejak run sebelumnya.")
+                    summary = {"status": "success", "rows": 0, "seconds": 0.0, "sinks": {}}
+                elif dataframe is None:
+                    print("Tidak ada data yang dapat disimpan.")
+                    summary = {"status": "failed", "rows": 0, "seconds": 0.0, "sinks": {}}
+                else:
+                    sinks = sinks_from_config(config, upload_id=f"{run_id}/0")
+                    if config.cdc:
+                        from utils.cdc import SnapshotIndex
+
+                        snapshot = SnapshotIndex(config.snapshot_path)
+                        with metrics.stage('cdc'):
+                            changes, tracker = snapshot.diff(dataframe, track_deletes=not config.incremental)
+                        metrics.record_rows('cdc', len(dataframe), len(changes))
+                        print(f"{len(changes)} perubahan dibanding snapshot sebelumnya")
+                        dataframe, sinks = changes, sinks_from_config(config, delta=True, upload_id=f"{run_id}/0")
+
+                    #Menyimpan data ke seluruh sink secara paralel, kecuali sink yang sudah commit
+                    with metrics.stage('load'):
+                        if dataframe.empty:
+                            summary = {"status": "success", "rows": 0, "seconds": 0.0, "sinks": {}}
+                        else:
+                            sinks = journal.pending_sinks(run_id, 0, dataframe, sinks)
+                            summary = run_sinks(dataframe, sinks)
+
+            metrics.record_sinks(summary)
+            failed = {name: result["error"] for name, result in summary["sinks"].items()
+                      if result["status"] != "success"}
+            if summary["status"] == "success":
+                # Snapshot baru disimpan hanya jika seluruh sink sudah menerapkan perubahannya
+                if tracker is not None:
+                    tracker.commit()
+                # Hash halaman baru menjadi acuan run incremental berikutnya setelah datanya tersimpan
+                if cache is not None:
+                    cache.commit()
+                journal.finish_run(run_id, 'completed')
+                if 'spreadsheet' in config.sinks:
+                    spreadsheet_writer(config).forget(run_id)
+            else:
+                journal.finish_run(run_id, 'failed', json.dumps(failed) if failed else "Tidak ada data")
+            return summary
+    except Exception as e:
+        journal.finish_run(run_id, 'failed', f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        fetcher.close()
+        if parse_pool is not None:
+            parse_pool.close()
+        if cache is not None:
+            cache.close()
+        journal.close()
+        if snapshot is not None:
+            snapshot.close()
+        if seen is not None:
+            seen.close()
+        metrics.write_json(config.report_path)
+        metrics.write_prometheus(config.prometheus_path)
  
  
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    print(json.dumps(main(config=parse_args()), indent=2))
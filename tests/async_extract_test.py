@@ -0,0 +1,127 @@
+import asyncio
+import contextlib
+import time
+import pytest
+from unittest.mock import patch
+from benchmarks.server import CatalogServer
+from benchmarks.synthetic import render_page
+from utils.async_extract import AsyncFetcher, async_iter_fashion_pages, async_scrape_fashion
+from utils.extract import FashionColumns, ParsePool, parse_page, scrape_fashion
+
+BASE_URL = "http://toko.test/page{}"
+INITIAL = "http://toko.test/"
+
+class FakeFetcher:
+    """Fetcher async tanpa jaringan yang mencatat halaman yang diminta."""
+
+    def __init__(self, pages, fail=()):
+        self.pages = {number: render_page(number, pages, products_per_page=4).encode() for number in range(1, pages + 1)}
+        self.fail = fail
+        self.requested = []
+
+    async def get(self, url):
+        number = 1 if url == INITIAL else int(url.rsplit("page", 1)[1])
+        self.requested.append(number)
+        await asyncio.sleep(0)
+        if number in self.fail:
+            raise ConnectionError(f"halaman {number} gagal")
+        return self.pages.get(number)
+
+def _without_timestamp(records):
+    return [{key: value for key, value in record.items() if key != "Timestamp"} for record in records]
+
+@pytest.mark.parametrize("use_aiohttp", [True, False])
+def test_async_scrape_matches_sync_scrape(use_aiohttp):
+    """Test hasil async_scrape_fashion (aiohttp atau fallback thread) sama dengan scrape_fashion"""
+    with CatalogServer(pages=5, products_per_page=4) as server:
+        expected = scrape_fashion(server.base_url, delay=0, initial_url=server.initial_url)
+        fallback = contextlib.nullcontext() if use_aiohttp else patch("utils.async_extract._aiohttp", return_value=None)
+        with fallback:
+            result = asyncio.run(async_scrape_fashion(server.base_url, initial_url=server.initial_url, max_workers=3))
+
+    assert _without_timestamp(result) == _without_timestamp(expected)
+
+def test_pages_are_yielded_in_order_and_overshoot_is_bounded():
+    """Test halaman dihasilkan berurutan dan halaman di luar katalog yang diambil dibatasi jendela"""
+    fetcher = FakeFetcher(pages=12)
+
+    async def collect():
+        return [number async for number, _ in async_iter_fashion_pages(
+            BASE_URL, max_workers=4, fetcher=fetcher, initial_url=INITIAL)]
+
+    assert asyncio.run(collect()) == list(range(1, 13))
+    assert max(fetcher.requested) <= 12 + 4 + 1
+
+def test_slow_parser_applies_backpressure():
+    """Test pengambil halaman menunggu jika parsing tertinggal (antrean dan jendela terbatas)"""
+    fetcher = FakeFetcher(pages=20)
+    outstanding = []
+    yielded = []
+
+    def slow_parser(content):
+        time.sleep(0.01)
+        return parse_page(content)
+
+    async def run():
+        original = fetcher.get
+
+        async def get(url):
+            outstanding.append(len(fetcher.requested) - len(yielded))
+            return await original(url)
+
+        fetcher.get = get
+        async for number, _ in async_iter_fashion_pages(BASE_URL, max_workers=4, max_pending_pages=1,
+                                                        fetcher=fetcher, parser=slow_parser, initial_url=INITIAL):
+            yielded.append(number)
+
+    asyncio.run(run())
+    assert len(yielded) == 20
+    assert max(outstanding) < 4 + 1
+
+def test_event_loop_keeps_running_while_parsing():
+    """Test parsing berjalan di worker sehingga coroutine lain di event loop tetap berjalan"""
+    def slow_parser(content):
+        time.sleep(0.02)
+        return parse_page(content)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        data = await async_scrape_fashion(BASE_URL, fetcher=FakeFetcher(pages=10), parser=slow_parser,
+                                          initial_url=INITIAL)
+        task.cancel()
+        return data, ticks
+
+    data, ticks = asyncio.run(run())
+    assert len(data) > 0
+    assert ticks >= 10
+
+def test_failed_page_raises_and_parse_pool_returns_columns():
+    """Test kegagalan halaman di dalam katalog dilempar, dan parse_pool menghasilkan FashionColumns"""
+    with pytest.raises(ConnectionError):
+        asyncio.run(async_scrape_fashion(BASE_URL, fetcher=FakeFetcher(pages=6, fail=(3,)), initial_url=INITIAL))
+
+    fetcher = FakeFetcher(pages=3)
+    with ParsePool(workers=1) as pool:
+        result = asyncio.run(async_scrape_fashion(BASE_URL, fetcher=fetcher, initial_url=INITIAL,
+                                                  parse_pool=pool, columnar=True))
+    assert isinstance(result, FashionColumns)
+    assert len(result) == sum(len(parse_page(content)[0]) for content in fetcher.pages.values())
+
+def test_async_fetcher_returns_none_for_missing_page():
+    """Test AsyncFetcher mengembalikan None untuk 404 tanpa raise_errors dan melemparnya dengan raise_errors"""
+    async def run(raise_errors):
+        async with AsyncFetcher(max_retries=0, raise_errors=raise_errors) as fetcher:
+            return await fetcher.get(server.base_url.format(99))
+
+    with CatalogServer(pages=1, products_per_page=1) as server:
+        assert asyncio.run(run(False)) is None
+        with pytest.raises(Exception):
+            asyncio.run(run(True))
@@ -0,0 +1,133 @@
+import pytest
+from unittest.mock import patch, Mock
+import main
+from benchmarks.server import CatalogServer
+from utils.cache import PageCache
+from utils.config import PipelineConfig
+from utils.extract import Fetcher, INITIAL_URL, parse_page, scrape_fashion
+
+
+def _page_html(title, has_next):
+    next_button = '<li class="page-item next"></li>' if has_next else ''
+    return f"""
+        <div class="product-details">
+            <h3>{title}</h3>
+            <p class="price">$10.00</p>
+            <p>Rating: 4.5/5</p>
+            <p>2 Colors</p>
+            <p>Size: L</p>
+            <p>Gender: Men</p>
+        </div>
+        {next_button}
+    """.encode()
+
+def _response(status_code, content=b"", headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+@pytest.fixture
+def cache(tmp_path):
+    page_cache = PageCache(str(tmp_path / "cache.sqlite"))
+    yield page_cache
+    page_cache.close()
+
+def test_page_cache_roundtrip(cache):
+    """Test penyimpanan entri cache dan status next"""
+    assert cache.get("http://test.com/") is None
+
+    cache.put("http://test.com/", b"<html></html>", "abc", etag='"v1"')
+    cache.set_has_next("http://test.com/", True)
+    entry = cache.get("http://test.com/")
+
+    assert entry["content"] == b"<html></html>"
+    assert entry["etag"] == '"v1"'
+    assert entry["has_next"] is True
+
+    # Konten berubah: status next lama tidak lagi berlaku
+    cache.put("http://test.com/", b"<html>baru</html>", "def")
+    assert cache.get("http://test.com/")["has_next"] is None
+
+def test_fetcher_sends_conditional_get_and_uses_cache_on_304(cache):
+    """Test conditional GET memakai ETag/Last-Modified dan konten cache saat 304"""
+    fetcher = Fetcher(cache=cache)
+    fetcher.session = Mock()
+    fetcher.session.get.side_effect = [
+        _response(200, b"isi", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+        _response(304),
+    ]
+
+    assert fetcher.fetch("http://test.com/") == (b"isi", True)
+    assert fetcher.fetch("http://test.com/") == (b"isi", False)
+
+    headers = fetcher.session.get.call_args.kwargs["headers"]
+    assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+def test_fetcher_detects_unchanged_content_by_hash(cache):
+    """Test konten dengan hash sama dianggap tidak berubah meskipun server mengirim 200"""
+    fetcher = Fetcher(cache=cache)
+    fetcher.session = Mock()
+    fetcher.session.get.side_effect = [_response(200, b"isi"), _response(200, b"isi"), _response(200, b"beda")]
+
+    assert fetcher.fetch("http://test.com/")[1] is True
+    assert fetcher.fetch("http://test.com/")[1] is False
+    assert fetcher.fetch("http://test.com/")[1] is True
+
+@patch('utils.extract.time.sleep')
+def test_incremental_scrape_only_returns_changed_pages(mock_sleep, cache):
+    """Test scraping incremental hanya meneruskan produk dari halaman yang berubah"""
+    pages = {
+        INITIAL_URL: _page_html("Product 1", True),
+        "http://test.com/page-2": _page_html("Product 2", True),
+        "http://test.com/page-3": _page_html("Product 3", False),
+    }
+    fetcher = Fetcher(cache=cache)
+    fetcher.session = Mock()
+    fetcher.session.get.side_effect = lambda url, **kwargs: _response(200, pages[url])
+
+    first_run = scrape_fashion("http://test.com/page-{}", fetcher=fetcher, incremental=True)
+    assert [item["Title"] for item in first_run] == ["Product 1", "Product 2", "Product 3"]
+
+    pages["http://test.com/page-3"] = _page_html("Product 3 Baru", False)
+    with patch('utils.extract.parse_page', wraps=parse_page) as mock_parse:
+        second_run = scrape_fashion("http://test.com/page-{}", fetcher=fetcher, incremental=True)
+
+    assert [item["Title"] for item in second_run] == ["Product 3 Baru"]
+    assert mock_parse.call_count == 1
+    assert fetcher.session.get.call_count == 6
+
+def test_uncommitted_fetches_are_discarded(tmp_path):
+    """Test hash halaman baru menjadi acuan hanya setelah commit; discard membuang hasil run yang gagal"""
+    path = str(tmp_path / "cache.sqlite")
+    cache = PageCache(path)
+    cache.put("http://test.com/", b"lama", "v1")
+    cache.commit()
+    cache.put("http://test.com/", b"baru", "v2")
+    assert cache.get("http://test.com/")["content_hash"] == "v2"
+    cache.close()
+
+    cache = PageCache(path)
+    cache.discard()
+    assert cache.get("http://test.com/")["content_hash"] == "v1"
+    cache.close()
+
+def test_incremental_runs_after_failed_load_and_without_changes(tmp_path, monkeypatch):
+    """Test run incremental: load gagal tidak membuat halaman dianggap tidak berubah, run tanpa perubahan sukses"""
+    monkeypatch.chdir(tmp_path)
+
+    def run(csv_path):
+        config = PipelineConfig(mode="batch", incremental=True, sinks="csv", csv_path=csv_path,
+                                changes_csv=csv_path, base_url=server.base_url, initial_url=server.initial_url,
+                                max_requests_per_second=100)
+        return main.main(config=config)
+
+    with CatalogServer(pages=2, products_per_page=3) as server:
+        assert run(str(tmp_path / "tidak-ada" / "fashion.csv"))["status"] == "failed"
+        first = run(str(tmp_path / "fashion.csv"))
+        second = run(str(tmp_path / "fashion.csv"))
+
+    assert first["status"] == "success" and first["rows"] > 0
+    assert second == {"status": "success", "rows": 0, "seconds": 0.0, "sinks": {}}
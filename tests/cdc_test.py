@@ -0,0 +1,145 @@
+import tracemalloc
+import pytest
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+from utils.cdc import SnapshotIndex, hash_rows, iter_changes
+from utils.load import apply_changes_to_mysql
+
+
+def _catalog(prices=(160000.0, 320000.0, 480000.0), timestamp='2024-01-01 10:00:00'):
+    titles = ['Kemeja', 'Celana', 'Jaket'][:len(prices)]
+    return pd.DataFrame({
+        'Title': titles,
+        'Price': list(prices),
+        'Rating': [4.5] * len(titles),
+        'Colors': [3] * len(titles),
+        'Size': ['M'] * len(titles),
+        'Gender': ['Men'] * len(titles),
+        'Timestamp': [timestamp] * len(titles),
+    })
+
+def _snapshot_rows(snapshot):
+    return snapshot._conn.execute("SELECT COUNT(*) FROM snapshot").fetchone()[0]
+
+@pytest.fixture
+def snapshot(tmp_path):
+    index = SnapshotIndex(str(tmp_path / "snapshot.sqlite"))
+    yield index
+    index.close()
+
+def test_first_run_inserts_everything(snapshot):
+    """Test run pertama tanpa snapshot menghasilkan insert untuk seluruh produk"""
+    changes, tracker = snapshot.diff(_catalog())
+
+    assert changes['Op'].tolist() == ['insert'] * 3
+    assert list(changes.columns) == ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp', 'Op']
+
+def test_unchanged_catalog_with_new_timestamp_is_empty(snapshot):
+    """Test produk yang sama dengan Timestamp baru tidak dianggap berubah"""
+    _, tracker = snapshot.diff(_catalog())
+    tracker.commit()
+
+    changes, _ = snapshot.diff(_catalog(timestamp='2024-01-02 08:00:00'))
+
+    assert changes.empty
+
+def test_insert_update_delete(snapshot):
+    """Test perubahan harga, produk baru, dan produk hilang menghasilkan update, insert, dan delete"""
+    _, tracker = snapshot.diff(_catalog(prices=(160000.0, 320000.0)))
+    tracker.commit()
+
+    current = _catalog().iloc[[0, 2]].copy()
+    current.loc[0, 'Price'] = 170000.0
+    changes, _ = snapshot.diff(current)
+
+    assert dict(zip(changes['Title'], changes['Op'])) == {'Kemeja': 'update', 'Jaket': 'insert', 'Celana': 'delete'}
+    deletes = changes[changes['Op'] == 'delete']
+    assert deletes[['Title', 'Size', 'Gender']].to_dict('records') == [{'Title': 'Celana', 'Size': 'M', 'Gender': 'Men'}]
+    assert deletes['Price'].isna().all()
+
+def test_incremental_run_does_not_delete_products_on_skipped_pages(snapshot):
+    """Test tanpa track_deletes (run incremental), produk yang tidak terlihat tidak dikirim sebagai delete"""
+    titles = [f'T{i}' for i in range(6)]
+    full = pd.concat([_catalog(prices=(1.0,)).assign(Title=title) for title in titles], ignore_index=True)
+    _, tracker = snapshot.diff(full)
+    tracker.commit()
+
+    partial = full.iloc[:3].copy()
+    partial.loc[0, 'Price'] = 2.0
+    changes, tracker = snapshot.diff(partial, track_deletes=False)
+    tracker.commit()
+
+    assert changes['Op'].tolist() == ['update']
+    assert _snapshot_rows(snapshot) == 6
+    tracker = snapshot.tracker(track_deletes=False)
+    tracker.diff(partial)
+    assert tracker.deletes().empty
+
+def test_hash_ignores_column_dtype():
+    """Test hash sama untuk float32/category (TransformEngine) dan float64/object (transform_data)"""
+    catalog = _catalog()
+    compact = catalog.astype({'Price': 'float32', 'Rating': 'float32', 'Colors': 'int8',
+                              'Size': 'category', 'Gender': 'category'})
+    columns = ['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender']
+
+    assert (hash_rows(catalog, columns) == hash_rows(compact, columns)).all()
+
+def test_iter_changes_emits_deletes_after_last_batch(snapshot):
+    """Test mode streaming: perubahan per batch lalu delete di akhir, snapshot baru setelah commit"""
+    _, tracker = snapshot.diff(_catalog())
+    tracker.commit()
+
+    tracker = snapshot.tracker()
+    batches = [_catalog().iloc[[0]], _catalog(prices=(160000.0, 999.0)).iloc[[1]]]
+    changes = list(iter_changes(batches, tracker))
+
+    assert [batch['Op'].tolist() for batch in changes] == [['update'], ['delete']]
+    # Batch delete memakai kolom yang sama dengan batch perubahan agar log CSV/Sheets tetap sejajar
+    assert list(changes[1].columns) == list(changes[0].columns)
+    assert changes[1][['Title', 'Size', 'Gender']].values.tolist() == [['Jaket', 'M', 'Men']]
+    assert changes[1]['Price'].isna().all()
+    tracker.commit()
+    assert _snapshot_rows(snapshot) == 2
+
+def test_stream_tracker_memory_does_not_grow_with_catalog(snapshot):
+    """Test tracker mode streaming tidak memuat snapshot ke memori dan memorinya sebanding ukuran batch"""
+    rows = 60_000
+    catalog = pd.DataFrame({
+        'Title': [f'Produk {i}' for i in range(rows)], 'Price': np.arange(rows, dtype='float64'),
+        'Rating': 4.5, 'Colors': 3, 'Size': 'M', 'Gender': 'Men', 'Timestamp': '2024-01-01 10:00:00',
+    })
+    _, tracker = snapshot.diff(catalog)
+    tracker.commit()
+
+    catalog.loc[::100, 'Price'] += 1
+    batches = [catalog.iloc[start:start + 3000] for start in range(0, rows - 3000, 3000)]
+    tracemalloc.start()
+    try:
+        tracker = snapshot.tracker()
+        changes = list(iter_changes(iter(batches), tracker))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert sum(len(batch) for batch in changes[:-1]) == len(range(0, rows - 3000, 100))
+    assert len(changes[-1]) == 3000 and set(changes[-1]['Op']) == {'delete'}
+    assert peak < 4 * 1024 * 1024
+    tracker.commit()
+    assert _snapshot_rows(snapshot) == rows - 3000
+
+def test_apply_changes_to_mysql():
+    """Test delta diterapkan ke database: upsert untuk insert/update dan delete per NATURAL_KEY"""
+    engine = create_engine("sqlite://")
+    inserts = _catalog().assign(Op='insert')
+    assert apply_changes_to_mysql(inserts, engine) == {"upserted": 3, "deleted": 0}
+
+    changes = pd.concat([
+        _catalog(prices=(170000.0,)).assign(Op='update'),
+        pd.DataFrame({'Title': ['Celana'], 'Size': ['M'], 'Gender': ['Men'], 'Op': ['delete']}),
+    ], ignore_index=True)
+    assert apply_changes_to_mysql(changes, engine) == {"upserted": 1, "deleted": 1}
+
+    with engine.connect() as con:
+        rows = con.execute(text('SELECT "Title", "Price" FROM bfpd ORDER BY "Title"')).fetchall()
+    assert rows == [('Jaket', 480000.0), ('Kemeja', 170000.0)]
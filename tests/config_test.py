@@ -0,0 +1,121 @@
+import json
+import subprocess
+import sys
+import pytest
+from unittest.mock import Mock, patch
+import main
+from utils.config import PipelineConfig, build_arg_parser, load_config, parse_args
+from utils.load import sinks_from_config
+
+
+def test_precedence_file_env_flags(tmp_path):
+    """Test urutan prioritas: nilai bawaan < file < environment < flag CLI"""
+    path = tmp_path / "etl.json"
+    path.write_text(json.dumps({"db_url": "sqlite:///file.db", "max_workers": 2, "exchange_rate": 15000}))
+    environ = {"ETL_MAX_WORKERS": "8", "ETL_SINKS": "csv, parquet"}
+
+    config = parse_args(["--config", str(path), "--exchange-rate", "16500", "--no-cdc"], environ=environ)
+
+    assert config.db_url == "sqlite:///file.db"
+    assert config.max_workers == 8
+    assert config.sinks == ("csv", "parquet")
+    assert config.exchange_rate == 16500.0
+    assert config.cdc is False
+    assert config.mode == "batch"
+
+def test_help_lists_opt_out_flags():
+    """Test --help menampilkan --no-cdc (bawaan aktif), tetapi bukan --no-<flag> untuk bawaan nonaktif"""
+    help_text = " ".join(build_arg_parser().format_help().split())
+
+    assert "--no-cdc menonaktifkan --cdc" in help_text
+    assert "changes_csv" in help_text
+    assert "--no-resume" not in help_text
+
+def test_parse_workers_defaults_to_cpu_count(tmp_path, monkeypatch):
+    """Test parse_workers bawaan None (satu proses per core CPU), 0 menonaktifkan ParsePool"""
+    assert PipelineConfig().parse_workers is None
+    assert PipelineConfig(parse_workers="auto").parse_workers is None
+    assert parse_args(["--parse-workers", "0"], environ={}).parse_workers == 0
+    assert load_config(environ={"ETL_PARSE_WORKERS": "3"}).parse_workers == 3
+    with pytest.raises(ValueError):
+        PipelineConfig(parse_workers=-1)
+
+    monkeypatch.chdir(tmp_path)
+    for workers, expected in ((None, 1), (0, 0)):
+        with patch('main.ParsePool') as pool, patch('main.iter_fashion_pages', Mock(return_value=iter([]))):
+            main.main(config=PipelineConfig(mode="extract", parse_workers=workers))
+        assert pool.call_count == expected
+        if expected:
+            assert pool.call_args.args == (None,)
+
+def test_default_config_file_in_working_directory(tmp_path, monkeypatch):
+    """Test etl_config.json di direktori kerja dipakai tanpa --config"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "etl_config.json").write_text(json.dumps({"mode": "stream", "incremental": True}))
+
+    config = load_config(environ={})
+
+    assert config.mode == "stream"
+    assert config.incremental is True
+
+@pytest.mark.parametrize("settings", [
+    {"mode": "harian"},
+    {"sinks": "csv,bigquery"},
+    {"max_workers": "banyak"},
+    {"cdc": "mungkin"},
+    {"kurs": 16000},
+])
+def test_invalid_settings(settings):
+    """Test pengaturan yang tidak valid langsung ditolak saat konfigurasi dimuat"""
+    with pytest.raises(ValueError):
+        PipelineConfig(**settings)
+
+def test_sinks_from_config_only_enabled():
+    """Test hanya sink yang diaktifkan yang dibuat, dengan path dari konfigurasi"""
+    config = PipelineConfig(sinks="csv", csv_path="katalog.csv")
+
+    with patch('utils.load.store_to_csv') as mock_csv:
+        sinks = sinks_from_config(config)
+        sinks["csv"]("data")
+
+    assert list(sinks) == ["csv"]
+    assert mock_csv.call_args.args[1] == "katalog.csv"
+
+def test_csv_only_run_does_not_import_sql_or_google():
+    """Test memuat main dan sink CSV tidak mengimpor SQLAlchemy, Google API client, maupun PyArrow"""
+    code = (
+        "import sys, main\n"
+        "from utils.config import PipelineConfig\n"
+        "main.sinks_from_config(PipelineConfig(sinks='csv'))\n"
+        "heavy = ('sqlalchemy', 'googleapiclient', 'google.oauth2', 'pyarrow')\n"
+        "print(sorted(name for name in heavy if name in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
+
+def test_lazy_sqlalchemy_names_resolve():
+    """Test nama SQLAlchemy yang diimpor lazy tetap dapat diakses (dan di-patch) lewat utils.load"""
+    import sqlalchemy
+    import utils.load
+
+    assert utils.load.create_engine is sqlalchemy.create_engine
+    with pytest.raises(AttributeError):
+        utils.load.tidak_ada
+
+def test_main_extract_mode_writes_raw_records(tmp_path, monkeypatch):
+    """Test mode extract hanya scraping dan menyimpan data mentah sebagai JSON Lines"""
+    monkeypatch.chdir(tmp_path)
+    fashion = {"Title": "Kemeja", "Price": "$10.00", "Rating": "Rating: 4.5 / 5", "Colors": "3 Colors",
+               "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2024-01-01 10:00:00"}
+    fetch_pages = Mock(return_value=iter([(1, [fashion]), (2, [fashion])]))
+    sinks = Mock()
+
+    with patch('main.iter_fashion_pages', fetch_pages), patch('main.sinks_from_config', sinks):
+        summary = main.main(config=PipelineConfig(mode="extract", raw_path="raw/fashion.jsonl"))
+
+    assert summary["status"] == "success"
+    assert summary["rows"] == 2
+    lines = (tmp_path / "raw" / "fashion.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [fashion, fashion]
+    sinks.assert_not_called()
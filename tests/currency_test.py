@@ -0,0 +1,150 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import Mock, patch
+from utils.config import PipelineConfig
+from utils.currency import (
+    CurrencyConverter, FileRateSource, RateProvider, StaticRateSource, exchange_rate_from_config,
+)
+from utils.transform import TransformEngine, transform_data
+
+RATES_CSV = """date,currency,rate
+2024-01-01,IDR,15000
+2024-01-03,IDR,16000
+2024-01-01,EUR,0.9
+2024-01-02,EUR,0.95
+"""
+
+def _raw(timestamps):
+    return pd.DataFrame({
+        "Title": [f"Produk {i}" for i in range(len(timestamps))],
+        "Price": ["$10.00"] * len(timestamps),
+        "Rating": ["⭐ 4.5 / 5"] * len(timestamps),
+        "Colors": ["3"] * len(timestamps),
+        "Size": ["M"] * len(timestamps),
+        "Gender": ["Men"] * len(timestamps),
+        "Timestamp": timestamps,
+    })
+
+@pytest.fixture
+def converter(tmp_path):
+    path = tmp_path / "rates.csv"
+    path.write_text(RATES_CSV)
+    provider = RateProvider(FileRateSource(str(path)), str(tmp_path / "cache.sqlite"))
+    return CurrencyConverter(provider, ("IDR", "EUR"))
+
+def test_rates_at_uses_last_rate_on_or_before_each_row(converter):
+    """Test kurs per baris diambil dari tanggal terakhir pada atau sebelum Timestamp, urutan baris dipertahankan"""
+    rates = converter.rates_at(["2024-01-03 09:00:00", "2024-01-02 23:59:59", "2023-12-31 10:00:00", "bukan waktu"])
+
+    assert rates["IDR"][:3].tolist() == [16000.0, 15000.0, 15000.0]
+    assert rates["EUR"][:3].tolist() == [0.95, 0.95, 0.9]
+    assert np.isnan(rates["IDR"][3])
+
+def test_transform_data_emits_several_currency_columns(converter):
+    """Test transform_data dengan CurrencyConverter: Price dalam IDR per tanggal dan kolom Price_EUR"""
+    result = transform_data(_raw(["2024-01-01 08:00:00", "2024-01-05 08:00:00"]), converter)
+
+    assert list(result.columns[:3]) == ["Title", "Price", "Price_EUR"]
+    assert result["Price"].tolist() == [150000.0, 160000.0]
+    assert result["Price_EUR"].tolist() == pytest.approx([9.0, 9.5])
+
+def test_transform_engine_with_converter_matches_transform_data(converter):
+    """Test TransformEngine menghasilkan kolom mata uang yang sama dengan transform_data"""
+    data = _raw(["2024-01-01 08:00:00", "2024-01-02 08:00:00", "2024-01-04 08:00:00"])
+
+    expected = transform_data(data, converter)
+    result, _ = TransformEngine(converter).transform(data)
+
+    assert list(result.columns[:3]) == ["Title", "Price", "Price_EUR"]
+    assert result["Price"].tolist() == pytest.approx(expected["Price"].tolist(), rel=1e-6)
+    assert result["Price_EUR"].tolist() == pytest.approx(expected["Price_EUR"].tolist(), rel=1e-6)
+
+def test_provider_caches_on_disk_until_ttl(tmp_path):
+    """Test kurs dibaca dari sumber sekali, dipakai dari cache disk, lalu dibaca ulang setelah TTL"""
+    source = Mock()
+    source.load.return_value = StaticRateSource({"IDR": 16000}).load("IDR")
+    cache_path = str(tmp_path / "cache.sqlite")
+
+    with patch('utils.currency.time.time', return_value=1000.0):
+        RateProvider(source, cache_path, ttl=60).rates("idr")
+        # Provider baru (misalnya run berikutnya) memakai cache disk
+        assert RateProvider(source, cache_path, ttl=60).rates("IDR")["rate"].tolist() == [16000.0]
+    assert source.load.call_count == 1
+
+    with patch('utils.currency.time.time', return_value=1100.0):
+        RateProvider(source, cache_path, ttl=60).rates("IDR")
+    assert source.load.call_count == 2
+
+def test_provider_falls_back_to_stale_cache(tmp_path):
+    """Test kurs lama di cache tetap dipakai jika sumber gagal setelah TTL lewat"""
+    cache_path = str(tmp_path / "cache.sqlite")
+    with patch('utils.currency.time.time', return_value=1000.0):
+        RateProvider(StaticRateSource({"IDR": 16000}), cache_path, ttl=60).rates("IDR")
+
+    broken = Mock()
+    broken.load.side_effect = OSError("file kurs hilang")
+    with patch('utils.currency.time.time', return_value=5000.0):
+        assert RateProvider(broken, cache_path, ttl=60).rates("IDR")["rate"].tolist() == [16000.0]
+
+    with pytest.raises(OSError):
+        RateProvider(broken, cache_path, ttl=60).rates("EUR")
+
+def test_provider_evicts_oldest_dates(tmp_path):
+    """Test cache dibatasi max_rows dengan membuang tanggal paling lama"""
+    source = Mock()
+    source.load.return_value = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=5), "rate": [1.0] * 5})
+    provider = RateProvider(source, str(tmp_path / "cache.sqlite"), max_rows=3)
+
+    provider.rates("IDR")
+
+    fetched_at, cached = provider._cached("IDR")
+    assert cached["date"].dt.strftime("%Y-%m-%d").tolist() == ["2024-01-03", "2024-01-04", "2024-01-05"]
+    # Riwayat yang terpotong tidak dipakai dari cache; run berikutnya membaca ulang sumbernya
+    assert fetched_at == 0
+    RateProvider(source, str(tmp_path / "cache.sqlite"), max_rows=3).rates("IDR")
+    assert source.load.call_count == 2
+
+def test_provider_evicts_per_currency(tmp_path):
+    """Test pemotongan cache satu mata uang tidak menyentuh riwayat mata uang lain"""
+    source = Mock()
+    source.load.side_effect = lambda currency: pd.DataFrame({
+        "date": pd.date_range("2024-01-01" if currency == "IDR" else "2023-01-01", periods=2 if currency == "IDR" else 5),
+        "rate": [1.0] * (2 if currency == "IDR" else 5),
+    })
+    provider = RateProvider(source, str(tmp_path / "cache.sqlite"), max_rows=3)
+
+    provider.rates("IDR")
+    provider.rates("EUR")
+
+    idr_fetched_at, idr = provider._cached("IDR")
+    eur_fetched_at, eur = provider._cached("EUR")
+    assert len(idr) == 2 and idr_fetched_at > 0
+    assert len(eur) == 3 and eur_fetched_at == 0
+
+def test_exchange_rate_from_config(tmp_path):
+    """Test tanpa rates_path dipakai kurs tetap; mata uang lain tanpa rates_path ditolak"""
+    assert exchange_rate_from_config(PipelineConfig()) == 16000.0
+    with pytest.raises(ValueError):
+        PipelineConfig(currencies="IDR,EUR")
+
+    path = tmp_path / "rates.json"
+    path.write_text('{"IDR": {"2024-01-01": 15500}}')
+    converter = exchange_rate_from_config(PipelineConfig(rates_path=str(path),
+                                                         rates_cache_path=str(tmp_path / "cache.sqlite")))
+    assert converter.rates_at(["2024-02-01 00:00:00"])["IDR"].tolist() == [15500.0]
+
+def test_cdc_passes_currency_columns_through(converter, tmp_path):
+    """Test kolom Price_EUR ikut dikirim oleh CDC, sedangkan perubahan ditentukan kolom Price"""
+    from utils.cdc import SnapshotIndex
+
+    index = SnapshotIndex(str(tmp_path / "snapshot.sqlite"))
+    changes, tracker = index.diff(transform_data(_raw(["2024-01-01 08:00:00"]), converter))
+    tracker.commit()
+    assert changes["Price_EUR"].tolist() == pytest.approx([9.0])
+
+    changes, _ = index.diff(transform_data(_raw(["2024-01-03 08:00:00"]), converter))
+    index.close()
+
+    assert changes["Op"].tolist() == ["update"]
+    assert changes["Price_EUR"].tolist() == pytest.approx([9.5])
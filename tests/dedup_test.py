@@ -0,0 +1,64 @@
+import os
+import tracemalloc
+import numpy as np
+import pytest
+from utils.dedup import RowHashSet
+
+def _hashes(count, seed=0):
+    return np.random.default_rng(seed).integers(0, 2 ** 64, size=count, dtype=np.uint64)
+
+def test_add_marks_only_first_occurrence_as_fresh():
+    """Test hash yang sudah terlihat, termasuk duplikat dalam satu batch, tidak dianggap baru"""
+    with RowHashSet() as seen:
+        assert seen.add(np.array([3, 1, 3, 2], dtype=np.uint64)).tolist() == [True, True, False, True]
+        assert seen.add(np.array([2, 4, 4], dtype=np.uint64)).tolist() == [False, True, False]
+        assert len(seen) == 4
+
+def test_spilled_hashes_are_still_recognised(tmp_path):
+    """Test hash yang sudah ditumpahkan ke SQLite tetap dikenali, termasuk hash di atas 2**63"""
+    hashes = np.concatenate([_hashes(5000), np.array([2 ** 64 - 1], dtype=np.uint64)])
+    with RowHashSet(max_memory=8 * 1000, path=str(tmp_path / "dedup.sqlite")) as seen:
+        for chunk in np.array_split(hashes, 10):
+            assert seen.add(chunk).all()
+
+        assert seen.spilled > 0
+        assert seen.memory_bytes <= 8 * 1000
+        assert not seen.add(hashes).any()
+        assert seen.add(_hashes(100, seed=1)).all()
+        assert len(seen) == len(hashes) + 100
+
+def test_temporary_spill_file_is_removed_on_close():
+    """Test file tumpahan sementara dihapus saat close"""
+    seen = RowHashSet(max_memory=64)
+    seen.add(_hashes(100))
+    path = seen.path
+    assert os.path.exists(path)
+
+    seen.close()
+    assert not os.path.exists(path)
+
+def test_memory_ceiling_is_respected():
+    """Test memori deduplikasi 200 ribu hash tetap di bawah batas, jauh di bawah set Python"""
+    ceiling = 256 * 1024
+    chunks = [_hashes(20_000, seed=seed) for seed in range(10)]
+
+    tracemalloc.start()
+    try:
+        with RowHashSet(max_memory=ceiling) as seen:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            for chunk in chunks:
+                seen.add(chunk)
+                assert seen.memory_bytes <= ceiling
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    assert len(seen) == 200_000
+    # Array hash (maksimal `ceiling`, sesaat dua kali saat digabung) ditambah array sementara per chunk
+    assert peak < 2 * ceiling + 3 * 1024 * 1024
+
+def test_invalid_ceiling():
+    """Test batas memori yang lebih kecil dari satu hash ditolak"""
+    with pytest.raises(ValueError):
+        RowHashSet(max_memory=4)
@@ -3,7 +3,13 @@ import requests
 from unittest.mock import patch, Mock
 from bs4 import BeautifulSoup
 from datetime import datetime
-from utils.extract import fetching_content, extract_fashion_data, clean_data, scrape_fashion, HEADERS
+import pickle
+import time
+from utils.extract import (
+    fetching_content, extract_fashion_data, scrape_fashion, HEADERS,
+    INITIAL_URL, Fetcher, RateLimiter, iter_fashion_pages, parse_page, available_parsers, FashionColumns,
+    ParsePool, AdaptiveLimiter,
+)
 
 
 SAMPLE_ARTICLE_HTML = """
@@ -71,58 +77,6 @@ def test_extract_fashion_data_missing_element():
     result = extract_fashion_data(article)
     assert result is None
 
-def test_clean_data_valid():
-    valid_data = {
-        "Title": "Valid Product",
-        "Price": "$19.99",
-        "Rating": "4/5",
-        "Colors": "3",
-        "Size": "S",
-        "Gender": "Female",
-        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    result = clean_data(valid_data)
-    assert result == valid_data
-
-def test_clean_data_invalid_title():
-    invalid_data = {
-        "Title": "Unknown Product",
-        "Price": "$19.99",
-        "Rating": "4/5",
-        "Colors": "3",
-        "Size": "S",
-        "Gender": "Female",
-        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    result = clean_data(invalid_data)
-    assert result is None
-
-def test_clean_data_invalid_price():
-    invalid_data = {
-        "Title": "Valid Product",
-        "Price": "Price Unavailable",
-        "Rating": "4/5",
-        "Colors": "3",
-        "Size": "S",
-        "Gender": "Female",
-        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    result = clean_data(invalid_data)
-    assert result is None
-
-def test_clean_data_invalid_rating():
-    invalid_data = {
-        "Title": "Valid Product",
-        "Price": "$19.99",
-        "Rating": "Not Rated",
-        "Colors": "3",
-        "Size": "S",
-        "Gender": "Female",
-        "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    result = clean_data(invalid_data)
-    assert result is None
-
 @patch('utils.extract.fetching_content')
 @patch('utils.extract.time.sleep')
 def test_scrape_fashion(mock_sleep, mock_fetch):
@@ -185,4 +139,248 @@ def test_scrape_fashion(mock_sleep, mock_fetch):
 def test_scrape_fashion_failure(mock_fetch):
     mock_fetch.return_value = None
     result = scrape_fashion("http://test.com/page-{}")
-    assert result == []
\ No newline at end of file
+    assert result == []
+
+def _page_html(title, has_next):
+    next_button = '<li class="page-item next"></li>' if has_next else ''
+    return f"""
+        <html>
+            <div class="product-details">
+                <h3>{title}</h3>
+                <p class="price">$10.00</p>
+                <p>Rating: 4.5/5</p>
+                <p>2 Colors</p>
+                <p>Size: L</p>
+                <p>Gender: Men</p>
+            </div>
+            {next_button}
+        </html>
+    """.encode()
+
+@patch('utils.extract.fetching_content')
+def test_scrape_fashion_concurrent_keeps_page_order(mock_fetch):
+    pages = {
+        INITIAL_URL: _page_html("Product 1", True),
+        "http://test.com/page-2": _page_html("Product 2", True),
+        "http://test.com/page-3": _page_html("Product 3", True),
+        "http://test.com/page-4": _page_html("Product 4", False),
+    }
+
+    def fake_fetch(url, *args, **kwargs):
+        # Halaman awal dibuat paling lambat agar urutan selesai berbeda dengan urutan halaman
+        time.sleep(0.05 if url == INITIAL_URL else 0.0)
+        return pages.get(url)
+
+    mock_fetch.side_effect = fake_fetch
+
+    result = scrape_fashion("http://test.com/page-{}", max_workers=3)
+
+    assert [item["Title"] for item in result] == ["Product 1", "Product 2", "Product 3", "Product 4"]
+
+@patch('utils.extract.fetching_content')
+def test_scrape_fashion_concurrent_stops_near_last_page(mock_fetch):
+    pages = {
+        INITIAL_URL: _page_html("Product 1", True),
+        "http://test.com/page-2": _page_html("Product 2", False),
+    }
+    mock_fetch.side_effect = lambda url, *args, **kwargs: pages.get(url, _page_html("Extra", True))
+
+    result = scrape_fashion("http://test.com/page-{}", max_workers=3)
+
+    assert [item["Title"] for item in result] == ["Product 1", "Product 2"]
+    # Paling banyak max_workers halaman terambil setelah halaman terakhir
+    assert mock_fetch.call_count <= 2 + 3
+
+@patch('utils.extract.time.sleep')
+@patch('utils.extract.time.monotonic')
+def test_rate_limiter_spaces_requests(mock_monotonic, mock_sleep):
+    mock_monotonic.return_value = 100.0
+    limiter = RateLimiter(requests_per_second=4)
+
+    limiter.wait()
+    limiter.wait()
+    limiter.wait()
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == pytest.approx([0.25, 0.5])
+
+@patch('utils.extract.requests.Session')
+def test_fetcher_reuses_one_session(mock_session):
+    mock_response = Mock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.content = b"<html>content</html>"
+    mock_session.return_value.get.return_value = mock_response
+
+    with Fetcher(timeout=5) as fetcher:
+        assert fetching_content("http://test.com/1", fetcher) == b"<html>content</html>"
+        assert fetching_content("http://test.com/2", fetcher) == b"<html>content</html>"
+
+    mock_session.assert_called_once()
+    mock_session.return_value.get.assert_called_with("http://test.com/2", timeout=5)
+    mock_session.return_value.close.assert_called_once()
+
+def test_fetcher_mounts_pooled_adapter_with_retry():
+    fetcher = Fetcher(pool_size=16, max_retries=4, backoff_factor=1)
+    adapter = fetcher.session.get_adapter("https://fashion-studio.dicoding.dev/")
+
+    assert adapter._pool_maxsize == 16
+    assert adapter.max_retries.total == 4
+    assert 429 in adapter.max_retries.status_forcelist
+    assert fetcher.session.headers["User-Agent"] == HEADERS["User-Agent"]
+    fetcher.close()
+
+@patch('utils.extract.fetching_content')
+def test_scrape_fashion_uses_shared_fetcher(mock_fetch):
+    mock_fetch.return_value = None
+    fetcher = Mock()
+
+    scrape_fashion("http://test.com/page-{}", fetcher=fetcher)
+
+    assert all(c.args[1] is fetcher for c in mock_fetch.call_args_list)
+    fetcher.close.assert_not_called()
+
+@patch('utils.extract.fetching_content')
+@patch('utils.extract.time.sleep')
+def test_iter_fashion_pages_is_lazy(mock_sleep, mock_fetch):
+    pages = {
+        INITIAL_URL: _page_html("Product 1", True),
+        "http://test.com/page-2": _page_html("Product 2", True),
+        "http://test.com/page-3": _page_html("Product 3", False),
+    }
+    mock_fetch.side_effect = lambda url, *args, **kwargs: pages.get(url)
+
+    generator = iter_fashion_pages("http://test.com/page-{}", fetcher=Mock())
+    page_number, records = next(generator)
+
+    assert page_number == 1
+    assert [item["Title"] for item in records] == ["Product 1"]
+    assert mock_fetch.call_count == 1
+
+    assert [number for number, _ in generator] == [2, 3]
+
+@pytest.mark.parametrize("parser", ["lxml", "selectolax"])
+def test_parse_page_fast_backend_matches_html_parser(parser):
+    pytest.importorskip(parser)
+    content = (SAMPLE_ARTICLE_HTML + INVALID_ARTICLE_HTML + '<li class="page-item next"></li>').encode()
+
+    expected, expected_next = parse_page(content, 'html.parser')
+    result, has_next = parse_page(content, parser)
+
+    assert [dict(r, Timestamp=None) for r in result] == [dict(r, Timestamp=None) for r in expected]
+    assert result[0]["Title"] == "Thsirt 123"
+    assert has_next == expected_next is True
+
+def test_parse_page_auto_and_unknown_backend():
+    content = SAMPLE_ARTICLE_HTML.encode()
+
+    records, has_next = parse_page(content, 'auto')
+    assert records[0]["Rating"] == "4.7/5"
+    assert has_next is False
+    assert available_parsers()[-1] == 'html.parser'
+
+    with pytest.raises(ValueError):
+        parse_page(content, 'tidak-ada')
+
+def test_fashion_columns_dictionary_encodes_size_and_gender():
+    soup = BeautifulSoup(SAMPLE_ARTICLE_HTML, 'html.parser')
+    fashion = extract_fashion_data(soup.find('div', class_='product-details'))
+    columns = FashionColumns()
+
+    columns.extend([fashion, dict(fashion, Size="L"), fashion])
+
+    assert len(columns) == 3
+    assert columns.values["Title"] == ["Thsirt 123"] * 3
+    assert columns.categories["Size"] == ["M", "L"]
+    assert list(columns.codes["Size"]) == [0, 1, 0]
+    assert columns.values["Rating"][0] is columns.values["Rating"][2]
+
+    restored = pickle.loads(pickle.dumps(columns))
+    restored.append(dict(fashion, Size="L"))
+    assert list(restored.codes["Size"]) == [0, 1, 0, 1]
+
+@patch('utils.extract.fetching_content')
+def test_scrape_fashion_columnar(mock_fetch):
+    mock_fetch.side_effect = [_page_html("Product 1", True), _page_html("Product 2", False)]
+
+    result = scrape_fashion("http://test.com/page-{}", columnar=True, fetcher=Mock())
+
+    assert isinstance(result, FashionColumns)
+    assert result.values["Title"] == ["Product 1", "Product 2"]
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_scrape_fashion_from_local_server(max_workers):
+    """Test scraping katalog sintetis dari server HTTP lokal lewat initial_url"""
+    from benchmarks.server import CatalogServer
+
+    with CatalogServer(pages=5, products_per_page=4) as server:
+        result = scrape_fashion(server.base_url, delay=0, max_workers=max_workers, initial_url=server.initial_url)
+
+    indexes = [int(fashion["Title"].split()[-1]) for fashion in result]
+    assert len(indexes) == len(set(indexes))
+    # Produk dari halaman terakhir (indeks 17-20) ikut terambil
+    assert max(indexes) > 16
+
+def test_fashion_columns_extend_with_columns_remaps_codes():
+    """Test penggabungan FashionColumns memetakan ulang kode kategori dan dapat diiterasi sebagai dict"""
+    soup = BeautifulSoup(SAMPLE_ARTICLE_HTML, 'html.parser')
+    fashion = extract_fashion_data(soup.find('div', class_='product-details'))
+    first, second = FashionColumns(), FashionColumns()
+    first.extend([fashion])
+    second.extend([dict(fashion, Size="XL"), fashion])
+
+    first.extend(pickle.loads(pickle.dumps(second)))
+
+    assert first.categories["Size"] == ["M", "XL"]
+    assert list(first.codes["Size"]) == [0, 1, 0]
+    assert list(first) == [fashion, dict(fashion, Size="XL"), fashion]
+
+def test_scrape_fashion_with_parse_pool_keeps_page_order():
+    """Test parsing di pool proses menghasilkan data yang sama dan berurutan seperti parsing biasa"""
+    from benchmarks.server import CatalogServer
+
+    with CatalogServer(pages=6, products_per_page=5) as server, ParsePool(workers=2) as pool:
+        expected = scrape_fashion(server.base_url, delay=0, initial_url=server.initial_url)
+        result = scrape_fashion(server.base_url, delay=0, max_workers=3, initial_url=server.initial_url,
+                                parse_pool=pool, columnar=True)
+
+    assert isinstance(result, FashionColumns)
+    # Timestamp dibuat saat parsing sehingga diabaikan
+    assert [dict(row, Timestamp=None) for row in result] == [dict(row, Timestamp=None) for row in expected]
+
+def test_adaptive_limiter_aimd():
+    """Test laju naik saat sukses, turun sekali per jendela saat 429, dan dibatasi maksimum per host"""
+    limiter = AdaptiveLimiter(initial_rate=2.0, max_rate=5.0, host_limits={"slow.test": (3.0, 1)})
+    for _ in range(10):
+        limiter.release(limiter.acquire("http://fast.test/page1"), 200, 0.01)
+        limiter.release(limiter.acquire("http://slow.test/page1"), 200, 0.01)
+
+    stats = limiter.stats()
+    assert stats["fast.test"]["rate"] == 5.0
+    assert stats["slow.test"]["rate"] == 3.0
+    assert stats["slow.test"]["concurrency"] == 1
+
+    limiter.release(limiter.acquire("http://fast.test/page2"), 429, 0.01)
+    limiter.release(limiter.acquire("http://fast.test/page3"), 429, 0.01)
+    assert limiter.stats("fast.test")["fast.test"]["rate"] == 2.5
+
+def test_adaptive_limiter_honours_retry_after():
+    """Test Retry-After menahan request berikutnya ke host yang sama, bukan host lain"""
+    limiter = AdaptiveLimiter(initial_rate=100.0)
+    limiter.release(limiter.acquire("http://busy.test/"), 429, 0.01, retry_after="0.3")
+
+    start = time.monotonic()
+    limiter.release(limiter.acquire("http://other.test/"), 200, 0.01)
+    assert time.monotonic() - start < 0.1
+
+    limiter.release(limiter.acquire("http://busy.test/"), 200, 0.01)
+    assert time.monotonic() - start >= 0.25
+
+def test_fetcher_with_limiter_retries_throttled_response():
+    """Test Fetcher dengan limiter mencoba ulang respons 429 dan melaporkannya ke limiter"""
+    throttled, ok = Mock(status_code=429, headers={"Retry-After": "0"}), Mock(status_code=200, content=b"ok", headers={})
+    limiter = AdaptiveLimiter(initial_rate=100.0)
+    fetcher = Fetcher(limiter=limiter)
+    fetcher.session.get = Mock(side_effect=[throttled, ok])
+
+    assert fetcher.get("http://test.com/") == b"ok"
+    assert fetcher.session.get.call_count == 2
+    assert limiter.stats("test.com")["test.com"]["rate"] < 100.0
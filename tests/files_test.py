@@ -0,0 +1,88 @@
+import sys
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from utils.files import store_to_parquet, store_to_feather, append_to_csv, read_history
+
+pytest.importorskip("pyarrow")
+
+SAMPLE_DATA = pd.DataFrame({
+    'Title': ['Kemeja', 'Celana Jeans'],
+    'Price': [150000.0, 450000.0],
+    'Rating': [4.2, 4.5],
+    'Colors': [5, 3],
+    'Size': pd.Categorical(['M', 'L']),
+    'Gender': ['Unisex', 'Male'],
+    'Timestamp': pd.to_datetime(['2023-05-01 12:00:00', '2023-05-01 12:05:00']),
+})
+
+def test_store_to_parquet_partitions_by_run_date(tmp_path):
+    """Test Parquet ditulis per partisi tanggal tanpa menimpa run sebelumnya"""
+    base_dir = str(tmp_path / "parquet")
+
+    first = store_to_parquet(SAMPLE_DATA, base_dir, run_date="2025-05-27")
+    second = store_to_parquet(SAMPLE_DATA, base_dir, run_date="2025-05-28")
+    store_to_parquet(SAMPLE_DATA.iloc[:1], base_dir, run_date="2025-05-28")
+
+    assert "run_date=2025-05-27" in first
+    assert "run_date=2025-05-28" in second
+
+    history = read_history(base_dir)
+    assert len(history) == 5
+    assert sorted(history['run_date'].unique()) == ["2025-05-27", "2025-05-28"]
+
+    latest = read_history(base_dir, columns=['Title', 'Price'], run_dates=["2025-05-28"])
+    assert list(latest.columns) == ['Title', 'Price', 'run_date']
+    assert len(latest) == 3
+
+def test_store_to_feather_memory_mapped_read(tmp_path):
+    """Test Arrow IPC dapat dibaca kembali lewat memory-map"""
+    base_dir = str(tmp_path / "arrow")
+
+    store_to_feather(SAMPLE_DATA, base_dir, run_date="2025-05-28", compression='uncompressed')
+    store_to_feather(SAMPLE_DATA, base_dir, run_date="2025-05-29")
+
+    history = read_history(base_dir, fmt='feather', columns=['Title', 'Timestamp'])
+    assert history['Title'].tolist() == ['Kemeja', 'Celana Jeans'] * 2
+    assert pd.api.types.is_datetime64_any_dtype(history['Timestamp'])
+
+@pytest.mark.parametrize("extension", [".csv.gz", ".csv.zst"])
+def test_append_to_csv_compressed(tmp_path, extension):
+    """Test CSV terkompresi ditambahkan tanpa menulis ulang header"""
+    if extension == ".csv.zst":
+        pytest.importorskip("zstandard")
+    filename = str(tmp_path / f"fashion{extension}")
+
+    append_to_csv(SAMPLE_DATA, filename)
+    append_to_csv(SAMPLE_DATA, filename)
+
+    result = pd.read_csv(filename)
+    assert len(result) == 4
+    assert result['Title'].tolist() == ['Kemeja', 'Celana Jeans'] * 2
+
+def test_append_to_csv_zstd_without_zstandard(tmp_path):
+    """Test CSV .zst tanpa paket zstandard gagal dengan pesan yang jelas"""
+    filename = str(tmp_path / "fashion.csv.zst")
+
+    with patch.dict(sys.modules, {"zstandard": None}):
+        assert append_to_csv(SAMPLE_DATA, filename) is None
+        with pytest.raises(ImportError, match="pip install zstandard"):
+            append_to_csv(SAMPLE_DATA, filename, raise_errors=True)
+
+def test_read_history_empty_folder(tmp_path):
+    """Test membaca riwayat dari folder kosong"""
+    assert read_history(str(tmp_path / "kosong")).empty
+
+def test_store_to_parquet_failure(tmp_path):
+    """Test kegagalan menyimpan Parquet mengembalikan None"""
+    assert store_to_parquet("bukan_dataframe", str(tmp_path)) is None
+
+def test_default_sinks_adds_parquet_sink(tmp_path):
+    """Test sink Parquet ikut dijalankan orkestrator jika folder diberikan"""
+    from utils.load import default_sinks, run_sinks
+
+    sinks = default_sinks("sqlite://", parquet_dir=str(tmp_path / "parquet"))
+    summary = run_sinks(SAMPLE_DATA, {"parquet": sinks["parquet"]})
+
+    assert summary["sinks"]["parquet"]["status"] == "success"
+    assert len(read_history(str(tmp_path / "parquet"))) == 2
@@ -0,0 +1,133 @@
+import sqlite3
+import pytest
+import pandas as pd
+import main
+from benchmarks.server import CatalogServer
+from utils.config import PipelineConfig
+from utils.history import ProductHistory, store_to_history
+from utils.load import sinks_from_config
+
+def _catalog(prices, timestamp, titles=("Kemeja", "Celana", "Jaket")):
+    titles = list(titles)[:len(prices)]
+    return pd.DataFrame({
+        "Title": titles,
+        "Price": list(prices),
+        "Rating": [4.5] * len(titles),
+        "Colors": [3] * len(titles),
+        "Size": ["M"] * len(titles),
+        "Gender": ["Men"] * len(titles),
+        "Timestamp": [timestamp] * len(titles),
+    })
+
+@pytest.fixture
+def history(tmp_path):
+    store = ProductHistory(str(tmp_path / "history.sqlite"))
+    store.record(_catalog((100.0, 200.0, 300.0), "2024-01-01 08:00:00"))
+    store.record(_catalog((120.0, 200.0, 300.0), "2024-01-01T20:00:00"))
+    store.record(_catalog((150.0, 180.0, 330.0), "2024-01-02 08:00:00"))
+    yield store
+    store.close()
+
+def test_history_and_daily_aggregates(history):
+    """Test riwayat per produk urut waktu dan agregat harian harga/rating"""
+    rows = history.history("Kemeja", size="M", gender="Men")
+
+    assert rows["Price"].tolist() == [100.0, 120.0, 150.0]
+    assert rows["Timestamp"].tolist() == ["2024-01-01 08:00:00", "2024-01-01 20:00:00", "2024-01-02 08:00:00"]
+    assert history.history("Kemeja", start="2024-01-02")["Price"].tolist() == [150.0]
+
+    daily = history.daily("Kemeja")
+    assert daily["day"].tolist() == ["2024-01-01", "2024-01-02"]
+    assert daily.iloc[0][["observations", "price_min", "price_max", "price_avg", "price_last"]].tolist() == \
+        [2, 100.0, 120.0, 110.0, 120.0]
+
+def test_latest_and_top_changes(history):
+    """Test snapshot terbaru dan perubahan harga terbesar dibanding hari sebelumnya"""
+    latest = history.latest()
+    assert latest["Title"].tolist() == ["Celana", "Jaket", "Kemeja"]
+    assert latest["Price"].tolist() == [180.0, 330.0, 150.0]
+
+    changes = history.top_changes(n=2)
+    assert changes["Title"].tolist() == ["Jaket", "Kemeja"]
+    assert changes["change"].tolist() == [30.0, 30.0]
+    assert changes["previous_day"].tolist() == ["2024-01-01", "2024-01-01"]
+    assert history.top_changes(day="2024-01-01").empty
+
+def test_cdc_changes_and_deletes(history):
+    """Test perubahan dari CDC dicatat dan produk yang dihapus tidak lagi muncul di snapshot"""
+    changes = _catalog((160.0,), "2024-01-03 08:00:00").assign(Op="update")
+    deleted = pd.DataFrame({"Title": ["Jaket"], "Size": ["M"], "Gender": ["Men"], "Op": ["delete"]})
+
+    assert history.record(pd.concat([changes, deleted], ignore_index=True)) == 1
+
+    assert history.latest()["Title"].tolist() == ["Celana", "Kemeja"]
+    assert history.latest(active_only=False)["Title"].tolist() == ["Celana", "Jaket", "Kemeja"]
+    assert history.history("Kemeja")["Price"].tolist()[-1] == 160.0
+
+def test_history_migrates_products_without_site(tmp_path):
+    """Test riwayat lama tanpa kolom Site dimigrasi dan produk yang sama di dua situs dicatat terpisah"""
+    path = str(tmp_path / "history.sqlite")
+    store = ProductHistory(path)
+    store.record(_catalog((100.0,), "2024-01-01 08:00:00"))
+    store.close()
+    # Skema lama: UNIQUE (Title, Size, Gender) tanpa Site
+    connection = sqlite3.connect(path)
+    connection.executescript(
+        """
+        CREATE TABLE legacy AS SELECT product_id, Title, Size, Gender, first_seen, last_seen, active FROM products;
+        DROP TABLE products;
+        CREATE TABLE products (product_id INTEGER PRIMARY KEY, Title TEXT NOT NULL, Size TEXT NOT NULL,
+            Gender TEXT NOT NULL, first_seen TEXT NOT NULL, last_seen TEXT NOT NULL,
+            active INTEGER NOT NULL DEFAULT 1, UNIQUE (Title, Size, Gender));
+        INSERT INTO products SELECT * FROM legacy;
+        DROP TABLE legacy;
+        """
+    )
+    connection.close()
+
+    store = ProductHistory(path)
+    sites = pd.concat([_catalog((110.0,), "2024-01-02 08:00:00").assign(Site=site) for site in ("a", "b")])
+    assert store.record(sites) == 2
+
+    assert store.latest()[["Site", "Price"]].values.tolist() == [["", 100.0], ["a", 110.0], ["b", 110.0]]
+    assert store.history("Kemeja", site="")["Price"].tolist() == [100.0]
+    store.close()
+
+def test_history_sink_from_config(tmp_path):
+    """Test sink history aktif lewat config dan dapat dijalankan ulang tanpa duplikat observasi"""
+    path = tmp_path / "history.sqlite"
+    config = PipelineConfig(sinks="history", history_path=str(path))
+    data = _catalog((100.0, 200.0), "2024-01-01 08:00:00")
+
+    sinks = sinks_from_config(config)
+    sinks["history"](data)
+    sinks["history"](data)
+
+    store = ProductHistory(str(path))
+    assert len(store.history("Kemeja")) == 1
+    store.close()
+    assert store_to_history(None, str(path)) == 0
+
+def test_stream_run_marks_disappearing_products_inactive(tmp_path, monkeypatch):
+    """Test mode stream dengan CDC: batch delete (hanya kolom kunci) dicatat tanpa menggagalkan sink history"""
+    monkeypatch.chdir(tmp_path)
+
+    def run(pages):
+        with CatalogServer(pages=pages, products_per_page=3) as server:
+            config = PipelineConfig(mode="stream", sinks="history", base_url=server.base_url,
+                                    initial_url=server.initial_url, max_requests_per_second=100)
+            return main.main(config=config)
+
+    assert run(4)["status"] == "success"
+    store = ProductHistory("product_history.sqlite")
+    before = len(store.latest())
+    store.close()
+
+    assert run(3)["status"] == "success"
+    store = ProductHistory("product_history.sqlite")
+    assert len(store.latest()) == before - 3
+    assert len(store.latest(active_only=False)) == before
+    store.close()
+
+    # Snapshot sudah diperbarui sehingga delete tidak dikirim ulang pada run berikutnya
+    assert run(3)["rows"] == 0
@@ -0,0 +1,170 @@
+import pytest
+import requests
+from unittest.mock import Mock, patch
+import pandas as pd
+import main
+from utils.extract import Fetcher, FashionColumns, iter_fashion_pages
+from utils.journal import RunJournal
+from utils.load import store_batches
+
+
+def _fashion(title):
+    return {
+        "Title": title,
+        "Price": "$10.00",
+        "Rating": "Rating: 4.5 / 5",
+        "Colors": "3 Colors",
+        "Size": "Size: M",
+        "Gender": "Gender: Men",
+        "Timestamp": "2024-01-01 10:00:00",
+    }
+
+def _batch(*titles):
+    return pd.DataFrame({"Title": list(titles), "Price": [160000.0] * len(titles)})
+
+@pytest.fixture
+def journal(tmp_path):
+    run_journal = RunJournal(str(tmp_path / "journal.sqlite"))
+    yield run_journal
+    run_journal.close()
+
+def test_pages_resume_without_refetch(journal):
+    """Test halaman yang sudah tercatat diputar ulang dan scraping dilanjutkan dari halaman berikutnya"""
+    run_id = journal.start_run("batch")
+    calls = []
+
+    def flaky_pages(last_page):
+        calls.append(last_page)
+        yield 1, [_fashion("Product 1")]
+        yield 2, [_fashion("Product 2")]
+        raise requests.exceptions.ConnectionError("putus")
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        list(journal.pages(run_id, flaky_pages))
+
+    def remaining_pages(last_page):
+        calls.append(last_page)
+        yield 3, [_fashion("Product 3")]
+
+    pages = list(journal.pages(run_id, remaining_pages))
+
+    assert calls == [None, 2]
+    assert [number for number, _ in pages] == [1, 2, 3]
+    assert isinstance(pages[0][1], FashionColumns)
+    assert [fashion["Title"] for _, records in pages for fashion in records] == ["Product 1", "Product 2", "Product 3"]
+    assert journal.run(run_id)["extracted"] is True
+
+    # Setelah seluruh halaman tercatat, fetch tidak dipanggil lagi
+    assert len(list(journal.pages(run_id, Mock(side_effect=AssertionError)))) == 3
+
+def test_pending_sinks_skip_committed(journal):
+    """Test sink yang sudah commit dilewati dan sink yang gagal tetap tertunda"""
+    run_id = journal.start_run("batch")
+    batch = _batch("Kemeja")
+    csv_sink = Mock()
+    mysql_sink = Mock(side_effect=Exception("MySQL mati"))
+
+    sinks = journal.pending_sinks(run_id, 0, batch, {"csv": csv_sink, "mysql": mysql_sink})
+    sinks["csv"](batch)
+    with pytest.raises(Exception):
+        sinks["mysql"](batch)
+
+    pending = journal.pending_sinks(run_id, 0, batch, {"csv": csv_sink, "mysql": mysql_sink})
+    assert list(pending) == ["mysql"]
+
+def test_changed_batch_resets_commits(journal):
+    """Test batch dengan isi berbeda dari catatan jurnal ditulis ulang ke seluruh sink"""
+    run_id = journal.start_run("stream")
+    sinks = journal.pending_sinks(run_id, 0, _batch("Kemeja"), {"csv": Mock()})
+    sinks["csv"](_batch("Kemeja"))
+
+    pending = journal.pending_sinks(run_id, 0, _batch("Celana"), {"csv": Mock()})
+
+    assert list(pending) == ["csv"]
+
+def test_resumable_run_and_finish(journal):
+    """Test hanya run yang belum selesai yang dapat dilanjutkan"""
+    completed = journal.start_run("batch")
+    journal.record_page(completed, 1, [_fashion("Product 1")])
+    journal.finish_run(completed, "completed")
+    failed = journal.start_run("batch")
+    journal.finish_run(failed, "failed", "ConnectionError: putus")
+
+    assert journal.resumable_run("batch") == failed
+    assert journal.resumable_run("stream") is None
+    assert journal.run(failed)["error"] == "ConnectionError: putus"
+    # Data halaman run yang selesai dihapus dari jurnal
+    assert list(journal.pages(completed, lambda last_page: iter([]))) == []
+
+def test_newer_run_supersedes_failed_run(journal):
+    """Test run gagal tidak dilanjutkan setelah ada run yang lebih baru, dan datanya dihapus"""
+    failed = journal.start_run("batch")
+    journal.record_page(failed, 1, [_fashion("Harga lama")])
+    journal.record_page(failed, 1, [_fashion("Harga lama")], source="toko-a")
+    journal.record_batch(failed, 0, _batch("Harga lama"))
+    journal.finish_run(failed, "failed", "ConnectionError: putus")
+
+    completed = journal.start_run("batch")
+    assert journal.run(failed)["status"] == "superseded"
+    assert journal._fetch("SELECT COUNT(*) FROM pages")[0][0] == 0
+    assert journal._fetch("SELECT COUNT(*) FROM batches")[0][0] == 0
+    journal.finish_run(completed, "completed")
+    assert journal.resumable_run("batch") is None
+
+    # Run gagal yang sudah tercatat sebelum perbaikan ini juga tidak dilanjutkan setelah run yang selesai
+    journal._execute("UPDATE runs SET status = 'failed' WHERE run_id = ?", (failed,))
+    assert journal.resumable_run("batch") is None
+
+def test_store_batches_with_journal_skips_committed(journal):
+    """Test store_batches melewati batch yang sudah commit pada run sebelumnya"""
+    run_id = journal.start_run("stream")
+    batches = [_batch("Kemeja"), _batch("Celana")]
+    flaky = Mock(side_effect=[None, Exception("gagal")])
+    store_batches(iter(batches), "db", sinks_factory=lambda first, upload_id: {"csv": flaky}, journal=journal, run_id=run_id)
+
+    sink = Mock()
+    summary = store_batches(iter(batches), "db", sinks_factory=lambda first, upload_id: {"csv": sink}, journal=journal,
+                            run_id=run_id)
+
+    assert summary["skipped"] == 1
+    assert summary["status"] == "success"
+    sink.assert_called_once()
+    assert sink.call_args[0][0]["Title"].tolist() == ["Celana"]
+
+@patch('utils.extract.fetching_content')
+def test_iter_fashion_pages_without_initial_url(mock_fetch):
+    """Test initial_url=None melewati halaman awal dan mulai dari start_page"""
+    mock_fetch.return_value = b"<html></html>"
+
+    pages = list(iter_fashion_pages("http://test.com/page{}", start_page=5, delay=0, fetcher=Mock(),
+                                    initial_url=None))
+
+    assert pages == [(5, [])]
+    assert [call[0][0] for call in mock_fetch.call_args_list] == ["http://test.com/page5"]
+
+def test_fetcher_raise_errors():
+    """Test Fetcher dengan raise_errors=True melempar kegagalan request"""
+    fetcher = Fetcher(raise_errors=True)
+    fetcher.session.get = Mock(side_effect=requests.exceptions.ConnectionError("putus"))
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        fetcher.get("http://test.com/")
+
+def test_main_resume_reruns_only_failed_sink(tmp_path, monkeypatch):
+    """Test main(resume=True) tidak fetch ulang dan hanya menjalankan sink yang belum commit"""
+    monkeypatch.chdir(tmp_path)
+    fetch_pages = Mock(return_value=iter([(1, [_fashion("Product 1")]), (2, [_fashion("Product 2")])]))
+    csv_sink = Mock()
+    mysql_sink = Mock(side_effect=[Exception("MySQL mati"), None])
+    sinks = lambda config, first_batch=True, delta=False, upload_id=None: {"csv": csv_sink, "mysql": mysql_sink}
+
+    with patch('main.iter_fashion_pages', fetch_pages), patch('main.sinks_from_config', sinks):
+        first = main.main()
+        second = main.main(resume=True)
+
+    assert first["status"] == "partial"
+    assert second["status"] == "success"
+    assert list(second["sinks"]) == ["mysql"]
+    fetch_pages.assert_called_once()
+    csv_sink.assert_called_once()
+    assert mysql_sink.call_count == 2
@@ -1,7 +1,12 @@
 import pytest
+import time
 from unittest.mock import patch, MagicMock
 import pandas as pd
-from utils.load import store_to_mysql, store_to_csv, store_to_spreedsheet
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.dialects import mysql
+from utils.load import store_to_mysql, store_to_csv, store_to_spreedsheet, store_batches
+from utils.load import get_engine, upsert_to_mysql, fashion_table, _to_rows, _upsert_statement
+from utils.load import run_sinks, default_sinks
 
 # Sample data untuk testing
 SAMPLE_DATA = pd.DataFrame({
@@ -112,4 +117,154 @@ def test_store_to_spreedsheet_failure(mock_cred):
     mock_cred.assert_called_once_with(
         './google-sheets-api.json',
         scopes=['https://www.googleapis.com/auth/spreadsheets']
-    )
\ No newline at end of file
+    )
+
+@patch('pandas.DataFrame.to_csv')
+def test_store_to_csv_append(mock_to_csv):
+    """Test penambahan data ke CSV yang sudah ada tanpa header"""
+    store_to_csv(SAMPLE_DATA, filename='out.csv', append=True)
+
+    mock_to_csv.assert_called_once_with('out.csv', mode='a', header=False, index=False)
+
+@patch('utils.load.store_to_sheets')
+@patch('utils.load.store_to_csv')
+@patch('utils.load.upsert_to_mysql')
+def test_store_batches(mock_mysql, mock_csv, mock_sheet):
+    """Test setiap batch langsung dikirim ke semua sink, CSV menulis header hanya pada batch pertama"""
+    batches = iter([SAMPLE_DATA.iloc[:1], SAMPLE_DATA.iloc[1:]])
+
+    summary = store_batches(batches, "sqlite://")
+
+    assert summary["status"] == "success"
+    assert summary["rows"] == 2
+    assert summary["batches"] == 2
+    assert mock_mysql.call_count == 2
+    assert mock_mysql.call_args.args[1] == "sqlite://"
+    assert [c.kwargs['append'] for c in mock_csv.call_args_list] == [False, True]
+    assert mock_sheet.call_count == 2
+
+
+# Test untuk upsert_to_mysql (memakai SQLite sebagai pengganti MySQL)
+def _fetch_rows(engine, table_name='bfpd'):
+    with engine.connect() as con:
+        return con.execute(text(f'SELECT "Title", "Price", "Size" FROM {table_name} ORDER BY "Title"')).fetchall()
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = get_engine(f"sqlite:///{tmp_path / 'fashion.db'}")
+    yield engine
+    engine.dispose()
+
+def test_get_engine_reuses_engine(tmp_path):
+    """Test engine dipakai ulang untuk URL yang sama"""
+    db_url = f"sqlite:///{tmp_path / 'reuse.db'}"
+    assert get_engine(db_url) is get_engine(db_url)
+
+def test_upsert_to_mysql_is_idempotent(sqlite_engine):
+    """Test menjalankan ulang upsert tidak menumpuk baris duplikat"""
+    assert upsert_to_mysql(SAMPLE_DATA, sqlite_engine, chunksize=1) == 2
+    updated = SAMPLE_DATA.assign(Price=[160000, 460000])
+    assert upsert_to_mysql(updated, sqlite_engine) == 2
+
+    assert _fetch_rows(sqlite_engine) == [('Celana Jeans', 460000.0, 'L'), ('Kemeja', 160000.0, 'M')]
+
+def test_upsert_to_mysql_full_refresh_swaps_staging_table(sqlite_engine):
+    """Test full refresh mengganti seluruh isi tabel lewat tabel staging"""
+    upsert_to_mysql(SAMPLE_DATA, sqlite_engine)
+
+    assert upsert_to_mysql(SAMPLE_DATA.iloc[:1], sqlite_engine, full_refresh=True) == 1
+
+    assert _fetch_rows(sqlite_engine) == [('Kemeja', 150000.0, 'M')]
+    assert set(inspect(sqlite_engine).get_table_names()) == {'bfpd'}
+
+def test_upsert_to_mysql_migrates_legacy_table_with_duplicates(sqlite_engine, capsys):
+    """Test tabel lama hasil to_sql yang berisi duplikat dimigrasi sekali sebelum upsert"""
+    legacy = pd.concat([
+        SAMPLE_DATA.assign(Price=[100000, 400000], Timestamp=['2023-04-01T12:00:00'] * 2),
+        SAMPLE_DATA,
+        SAMPLE_DATA,
+    ], ignore_index=True)
+    # Skema seperti hasil to_sql lama: tanpa unique key dan Timestamp berupa teks
+    with sqlite_engine.begin() as con:
+        con.execute(text('CREATE TABLE bfpd ("Title" TEXT, "Price" BIGINT, "Rating" FLOAT, "Colors" BIGINT, '
+                         '"Size" TEXT, "Gender" TEXT, "Timestamp" TEXT)'))
+        con.execute(text('INSERT INTO bfpd VALUES (:Title, :Price, :Rating, :Colors, :Size, :Gender, :Timestamp)'),
+                    legacy.to_dict('records'))
+
+    assert upsert_to_mysql(SAMPLE_DATA.iloc[:1].assign(Price=[170000]), sqlite_engine) == 1
+    assert "4 baris duplikat dihapus" in capsys.readouterr().out
+
+    assert _fetch_rows(sqlite_engine) == [('Celana Jeans', 450000.0, 'L'), ('Kemeja', 170000.0, 'M')]
+    assert upsert_to_mysql(SAMPLE_DATA, sqlite_engine) == 2
+    assert "Migrasi" not in capsys.readouterr().out
+
+def test_upsert_to_mysql_adds_site_column_for_multi_site_data(sqlite_engine):
+    """Test data beberapa situs memigrasi tabel ke unique key Site + Title/Size/Gender"""
+    upsert_to_mysql(SAMPLE_DATA, sqlite_engine)
+
+    sites = pd.concat([SAMPLE_DATA.iloc[:1].assign(Site=site) for site in ("toko-a", "toko-b")], ignore_index=True)
+    assert upsert_to_mysql(sites, sqlite_engine) == 2
+    assert upsert_to_mysql(SAMPLE_DATA.assign(Price=[170000, 470000]), sqlite_engine) == 2
+
+    with sqlite_engine.connect() as con:
+        rows = con.execute(text('SELECT "Site", "Title", "Price" FROM bfpd ORDER BY "Site", "Title"')).fetchall()
+    assert rows == [('', 'Celana Jeans', 470000.0), ('', 'Kemeja', 170000.0),
+                    ('toko-a', 'Kemeja', 150000.0), ('toko-b', 'Kemeja', 150000.0)]
+
+def test_upsert_to_mysql_failure():
+    """Test upsert gagal mengembalikan None"""
+    assert upsert_to_mysql(SAMPLE_DATA, "tidak-valid://") is None
+
+def test_upsert_statement_uses_on_duplicate_key_update_for_mysql():
+    """Test statement upsert untuk MySQL berupa INSERT multi-baris dengan ON DUPLICATE KEY UPDATE"""
+    con = MagicMock()
+    con.dialect = mysql.dialect()
+    table = fashion_table(MetaData())
+    rows = _to_rows(SAMPLE_DATA)
+
+    sql = str(_upsert_statement(con, table, rows).compile(dialect=mysql.dialect()))
+
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert sql.count("(%s, %s, %s, %s, %s, %s, %s)") == 2
+
+
+# Test untuk run_sinks
+def test_run_sinks_runs_sinks_concurrently():
+    """Test sink dijalankan paralel sehingga durasi total mendekati sink terlama"""
+    sinks = {"a": lambda data: time.sleep(0.2), "b": lambda data: time.sleep(0.2)}
+
+    summary = run_sinks(SAMPLE_DATA, sinks)
+
+    assert summary["status"] == "success"
+    assert summary["rows"] == 2
+    assert summary["seconds"] < 0.35
+    assert summary["sinks"]["a"]["seconds"] >= 0.2
+
+def test_run_sinks_surfaces_failures():
+    """Test kegagalan sink dilaporkan, bukan hanya dicetak"""
+    def broken(data):
+        raise RuntimeError("koneksi terputus")
+
+    summary = run_sinks(SAMPLE_DATA, {"ok": lambda data: None, "broken": broken})
+
+    assert summary["status"] == "partial"
+    assert summary["sinks"]["ok"]["status"] == "success"
+    assert summary["sinks"]["broken"]["status"] == "failed"
+    assert "koneksi terputus" in summary["sinks"]["broken"]["error"]
+
+def test_run_sinks_timeout():
+    """Test sink yang terlalu lama dicatat sebagai timeout"""
+    summary = run_sinks(SAMPLE_DATA, {"slow": lambda data: time.sleep(0.5)}, timeout=0.05)
+
+    assert summary["status"] == "failed"
+    assert summary["sinks"]["slow"]["status"] == "timeout"
+
+@patch('pandas.DataFrame.to_csv')
+def test_default_sinks_raise_errors(mock_to_csv):
+    """Test sink bawaan meneruskan kesalahan ke orkestrator"""
+    mock_to_csv.side_effect = Exception("Write failed")
+
+    summary = run_sinks(SAMPLE_DATA, {"csv": default_sinks("sqlite://")["csv"]})
+
+    assert summary["sinks"]["csv"]["status"] == "failed"
+    assert "Write failed" in summary["sinks"]["csv"]["error"]
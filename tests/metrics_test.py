@@ -0,0 +1,143 @@
+import json
+import pytest
+import requests
+from unittest.mock import Mock
+import pandas as pd
+from utils.extract import Fetcher
+from utils.metrics import RunMetrics
+from utils.transform import transform_batches, transform_data
+
+
+def _response(status_code, content=b""):
+    response = Mock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = {}
+    response.raise_for_status.return_value = None
+    return response
+
+def _raw_data():
+    return pd.DataFrame({
+        'Title': ['Kemeja', 'Kemeja', 'Celana'],
+        'Price': ['$10.00', '$10.00', 'Price Unavailable'],
+        'Rating': ['Rating: 4.5 / 5', 'Rating: 4.5 / 5', 'Rating: 3.9 / 5'],
+        'Colors': ['3 Colors', '3 Colors', '2 Colors'],
+        'Size': ['Size: M', 'Size: M', 'Size: L'],
+        'Gender': ['Gender: Men', 'Gender: Men', 'Gender: Women'],
+        'Timestamp': ['2024-01-01 10:00:00'] * 3,
+    })
+
+def test_stage_accumulates_time():
+    """Test durasi tahap diakumulasi per nama tahap"""
+    metrics = RunMetrics(run_id="run-1")
+    with metrics.stage("extract"):
+        pass
+    with metrics.stage("extract"):
+        pass
+
+    stage = metrics.to_dict()["stages"]["extract"]
+    assert stage["calls"] == 2
+    assert stage["seconds"] >= 0
+
+def test_stage_records_time_on_error():
+    """Test durasi tetap tercatat jika tahap melempar exception"""
+    metrics = RunMetrics()
+    with pytest.raises(ValueError):
+        with metrics.stage("load"):
+            raise ValueError("gagal")
+
+    assert metrics.to_dict()["stages"]["load"]["calls"] == 1
+
+def test_fetcher_records_http_metrics():
+    """Test Fetcher mencatat histogram status, byte, dan halaman ke metrics"""
+    metrics = RunMetrics()
+    fetcher = Fetcher(metrics=metrics)
+    failed = _response(404)
+    failed.raise_for_status.side_effect = requests.exceptions.HTTPError("404", response=failed)
+    fetcher.session.get = Mock(side_effect=[
+        _response(200, b"12345"),
+        failed,
+        requests.exceptions.ConnectionError("down"),
+    ])
+
+    assert fetcher.get("http://test.com/1") == b"12345"
+    assert fetcher.get("http://test.com/2") is None
+    assert fetcher.get("http://test.com/3") is None
+
+    http = metrics.to_dict()["http"]
+    assert http["status"] == {"200": 1, "404": 1, "error": 1}
+    assert http["bytes_downloaded"] == 5
+    assert http["pages_fetched"] == 1
+
+def test_transform_data_report():
+    """Test transform_data mengisi laporan baris masuk/keluar dan alasan penolakan"""
+    report = {}
+    result = transform_data(_raw_data(), 16000, report)
+
+    assert len(result) == 1
+    assert (report["rows_in"], report["rows_out"]) == (3, 1)
+    assert {reason: count for reason, count in report["rejected"].items() if count} == {"price_invalid": 1, "duplicate": 1}
+
+def test_transform_batches_report_counts_cross_batch_duplicates():
+    """Test laporan transform_batches menghitung duplikat antar batch"""
+    row = _raw_data().iloc[:1].to_dict('records')
+    report = {}
+    batches = list(transform_batches([row, row], 16000, report=report))
+
+    assert len(batches) == 1
+    assert (report["rows_in"], report["rows_out"]) == (2, 1)
+    assert {reason: count for reason, count in report["rejected"].items() if count} == {"duplicate": 1}
+
+def test_record_transform_and_sinks():
+    """Test laporan transformasi dan ringkasan sink masuk ke laporan run"""
+    metrics = RunMetrics()
+    metrics.record_transform({"rows_in": 3, "rows_out": 1, "rejected": {"invalid": 1, "duplicate": 1}})
+    metrics.record_sinks({
+        "status": "partial",
+        "rows": 1,
+        "sinks": {
+            "csv": {"status": "success", "seconds": 0.5, "error": None},
+            "mysql": {"status": "failed", "seconds": 1.0, "error": "OperationalError: down"},
+        },
+    })
+
+    report = metrics.to_dict()
+    assert report["status"] == "partial"
+    assert report["rows"]["transform"] == {"in": 3, "out": 1}
+    assert report["rejected"] == {"invalid": 1, "duplicate": 1}
+    assert report["sinks"]["mysql"]["error"] == "OperationalError: down"
+
+def test_write_json_and_prometheus(tmp_path):
+    """Test laporan JSON dan file Prometheus ditulis dengan isi yang sesuai"""
+    metrics = RunMetrics(run_id="abc")
+    with metrics.stage("extract"):
+        metrics.record_response(200, 100)
+    metrics.record_transform({"rows_in": 2, "rows_out": 1, "rejected": {"invalid": 1}})
+    metrics.record_sinks({"status": "success", "rows": 1,
+                          "sinks": {"csv": {"status": "success", "seconds": 0.1, "error": None}}})
+
+    json_path = metrics.write_json(str(tmp_path / "out" / "report.json"))
+    prom_path = metrics.write_prometheus(str(tmp_path / "out" / "metrics.prom"))
+
+    with open(json_path, encoding="utf-8") as file:
+        assert json.load(file)["run_id"] == "abc"
+    with open(prom_path, encoding="utf-8") as file:
+        text = file.read()
+    assert "# TYPE etl_http_responses_total counter" in text
+    assert 'etl_run_info{run_id="abc"} 1' in text
+    assert 'etl_http_responses_total{status="200"} 1' in text
+    assert 'etl_rows_rejected_total{reason="invalid"} 1' in text
+    assert 'etl_sink_success{sink="csv"} 1' in text
+    assert 'etl_run_success 1' in text
+
+def test_profile_records_peak_memory_and_stats(tmp_path):
+    """Test hook profiling menulis file cProfile dan mencatat puncak memori"""
+    metrics = RunMetrics()
+    prof_path = str(tmp_path / "run.prof")
+    with metrics.profile(prof_path, trace_memory=True):
+        data = [bytes(1000) for _ in range(100)]
+    del data
+
+    profile = metrics.to_dict()["profile"]
+    assert profile["cprofile"] == prof_path
+    assert profile["peak_memory_bytes"] >= 100 * 1000
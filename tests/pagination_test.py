@@ -0,0 +1,91 @@
+import threading
+from benchmarks.synthetic import render_page
+from utils.extract import scrape_fashion
+from utils.pagination import PaginationPlanner, last_page_hint
+
+BASE_URL = "http://toko.test/page{}"
+INITIAL = "http://toko.test/"
+
+class FakeFetcher:
+    """Fetcher tanpa jaringan; widget pagination halaman awal dapat berbeda dari panjang katalog sebenarnya."""
+
+    def __init__(self, pages, advertised=None, blocked=None):
+        self.pages = {number: render_page(number, pages, products_per_page=2).encode() for number in range(1, pages + 1)}
+        if advertised is not None:
+            self.pages[1] = render_page(1, advertised, products_per_page=2).encode()
+        self.blocked = blocked or {}
+        self.requested = []
+        self.timed_out = False
+        self.lock = threading.Lock()
+
+    def get(self, url):
+        number = 1 if url == INITIAL else int(url.rsplit("page", 1)[1])
+        with self.lock:
+            self.requested.append(number)
+        if number in self.blocked and not self.blocked[number].wait(timeout=5):
+            self.timed_out = True
+        return self.pages.get(number)
+
+def test_last_page_hint_reads_pagination_widget():
+    """Test nomor halaman terbesar dibaca dari widget pagination, bukan dari tombol Previous/Next"""
+    with open("benchmarks/pages/page1.html", encoding="utf-8") as file:
+        assert last_page_hint(file.read()) == 3
+    assert last_page_hint(render_page(1, 7).encode()) == 7
+    assert last_page_hint("<html><body>Tanpa pagination</body></html>") is None
+    assert last_page_hint(None) is None
+
+def test_planner_schedules_known_pages_up_front_and_stops_at_end():
+    """Test seluruh halaman hingga perkiraan dijadwalkan sekaligus dan penjadwalan berhenti di akhir katalog"""
+    planner = PaginationPlanner(start_page=2, window=2)
+    assert planner.schedule() == [2, 3]
+    planner.observe(1, True, render_page(1, 9))
+    assert planner.schedule() == list(range(4, 10))
+
+    planner.observe(2, True)
+    planner.observe(3, False)
+    assert planner.finished(3) and planner.finished(4)
+    assert planner.schedule() == []
+
+def test_planner_probes_beyond_stale_hint_in_windows():
+    """Test halaman di luar perkiraan diperiksa dalam jendela seiring halaman diproses"""
+    planner = PaginationPlanner(start_page=2, window=2, last_page=3, max_ahead=4)
+    assert planner.schedule() == [2, 3]
+    planner.observe(2, True)
+    assert planner.schedule() == [4]
+    planner.observe(3, True)
+    assert planner.schedule() == [5]
+    assert not planner.finished(5)
+
+def test_all_advertised_pages_are_requested_without_waiting_for_next_button():
+    """Test halaman yang tercantum di widget diminta walaupun halaman sebelumnya belum selesai"""
+    release = threading.Event()
+    fetcher = FakeFetcher(pages=10, blocked={2: release})
+    original = fetcher.get
+
+    def get(url):
+        content = original(url)
+        if url == BASE_URL.format(10):
+            release.set()
+        return content
+
+    fetcher.get = get
+    scrape_fashion(BASE_URL, max_workers=2, fetcher=fetcher, initial_url=INITIAL)
+
+    # Dengan jendela geser dua halaman, halaman 10 baru diminta setelah halaman 2 selesai (timeout)
+    assert not fetcher.timed_out
+    assert set(fetcher.requested) >= set(range(1, 11))
+
+def test_catalogue_shorter_than_widget_stops_at_last_page():
+    """Test katalog yang memendek: halaman setelah halaman tanpa tombol next tidak dihasilkan"""
+    fetcher = FakeFetcher(pages=6, advertised=12)
+    data = scrape_fashion(BASE_URL, max_workers=3, fetcher=fetcher, initial_url=INITIAL)
+
+    assert len(data) == 6 * 2
+
+def test_catalogue_longer_than_widget_is_followed_to_the_end():
+    """Test katalog yang bertambah: halaman di luar widget tetap diambil hingga halaman terakhir"""
+    fetcher = FakeFetcher(pages=9, advertised=3)
+    data = scrape_fashion(BASE_URL, max_workers=2, fetcher=fetcher, initial_url=INITIAL)
+
+    assert len(data) == 9 * 2
+    assert max(fetcher.requested) <= 9 + 2
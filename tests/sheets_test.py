@@ -0,0 +1,158 @@
+import json
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from utils.load import default_sinks, store_batches
+from utils.sheets import SpreadsheetWriter, store_to_sheets, get_sheets_service
+
+SAMPLE_DATA = pd.DataFrame({
+    'Title': ['Kemeja', 'Celana Jeans', 'Jaket', 'Topi', 'Kaos'],
+    'Price': [150000.0, 450000.0, 250000.0, 50000.0, 80000.0],
+    'Rating': [4.2, 4.5, 3.9, 4.0, 4.8],
+    'Colors': [5, 3, 2, 1, 4],
+    'Size': ['M', 'L', 'XL', 'S', 'M'],
+    'Gender': ['Unisex', 'Male', 'Female', 'Male', 'Female'],
+    'Timestamp': pd.to_datetime(['2023-05-01 12:00:00'] * 5),
+})
+
+
+class FakeHttpError(Exception):
+    """Tiruan HttpError googleapiclient yang membawa status HTTP."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = type("Response", (), {"status": status})()
+
+
+class FakeRequest:
+    def __init__(self, action):
+        self.action = action
+
+    def execute(self):
+        return self.action()
+
+
+class FakeSheetsService:
+    """Tiruan lokal Sheets API: spreadsheets().values().append/get(...).execute()."""
+
+    def __init__(self):
+        self.rows = []
+        self.append_calls = 0
+        self.failures = []  # daftar exception yang dilempar berurutan oleh append
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def append(self, spreadsheetId, range, valueInputOption, body):
+        def action():
+            self.append_calls += 1
+            if self.failures:
+                raise self.failures.pop(0)
+            self.rows.extend(body['values'])
+            return {"updates": {"updatedRows": len(body['values'])}}
+        return FakeRequest(action)
+
+    def get(self, spreadsheetId, range):
+        return FakeRequest(lambda: {"values": self.rows[:1]} if self.rows else {})
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return str(tmp_path / "checkpoint.json")
+
+def test_writer_sends_batches_with_single_header(checkpoint):
+    """Test data dikirim per batch dengan header hanya sekali"""
+    service = FakeSheetsService()
+    writer = SpreadsheetWriter(service=service, batch_size=2, checkpoint_path=checkpoint)
+
+    assert writer.write(SAMPLE_DATA) == 5
+
+    assert service.rows[0] == SAMPLE_DATA.columns.tolist()
+    assert service.rows[1] == ['Kemeja', 150000.0, 4.2, 5, 'M', 'Unisex', '2023-05-01 12:00:00']
+    assert len(service.rows) == 6
+    assert service.append_calls == 4
+
+    # Run berikutnya dengan data lain tidak menambah header lagi
+    writer.write(SAMPLE_DATA.iloc[:1].assign(Title="Baru"))
+    assert service.rows.count(SAMPLE_DATA.columns.tolist()) == 1
+
+@patch('utils.sheets.time.sleep')
+def test_writer_backs_off_on_quota_errors(mock_sleep, checkpoint):
+    """Test error kuota dicoba ulang dengan backoff eksponensial"""
+    service = FakeSheetsService()
+    service.failures = [FakeHttpError(429), FakeHttpError(503)]
+    writer = SpreadsheetWriter(service=service, batch_size=10, backoff_factor=0.5, checkpoint_path=checkpoint)
+
+    writer.write(SAMPLE_DATA)
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [0.5, 1.0]
+    assert len(service.rows) == 6
+
+def test_writer_resumes_interrupted_upload_without_duplicates(checkpoint):
+    """Test upload yang terputus dilanjutkan dari checkpoint tanpa menduplikasi baris"""
+    service = FakeSheetsService()
+    writer = SpreadsheetWriter(service=service, batch_size=2, checkpoint_path=checkpoint)
+    original_append = service.append
+
+    def flaky_append(**kwargs):
+        # Header dan batch pertama berhasil, batch kedua gagal permanen
+        if service.append_calls == 2:
+            service.failures.append(FakeHttpError(400))
+        return original_append(**kwargs)
+
+    service.append = flaky_append
+    with pytest.raises(FakeHttpError):
+        writer.write(SAMPLE_DATA)
+    assert len(service.rows) == 3
+
+    service.append = original_append
+    assert writer.write(SAMPLE_DATA) == 3
+    assert [row[0] for row in service.rows] == ['Title', 'Kemeja', 'Celana Jeans', 'Jaket', 'Topi', 'Kaos']
+
+    # Data yang sudah selesai dikirim tidak dikirim ulang
+    assert writer.write(SAMPLE_DATA) == 0
+    assert len(service.rows) == 6
+
+def test_store_to_sheets_failure_returns_none(checkpoint):
+    """Test kegagalan dicetak dan mengembalikan None, atau diteruskan jika raise_errors=True"""
+    service = FakeSheetsService()
+    service.failures = [FakeHttpError(403)]
+    writer = SpreadsheetWriter(service=service, checkpoint_path=checkpoint)
+
+    assert store_to_sheets(SAMPLE_DATA, writer=writer) is None
+
+    service.failures = [FakeHttpError(403)]
+    with pytest.raises(FakeHttpError):
+        store_to_sheets(SAMPLE_DATA, writer=writer, raise_errors=True)
+
+def test_pipeline_batches_use_run_checkpoints_and_forget(checkpoint):
+    """Test batch pipeline dikunci per run_id/nomor_batch: batch sama pada run lain tetap dikirim, lalu checkpoint dihapus"""
+    service = FakeSheetsService()
+    writer = SpreadsheetWriter(service=service, checkpoint_path=checkpoint)
+    factory = lambda first_batch, upload_id: {
+        "spreadsheet": default_sinks("sqlite://", first_batch, writer=writer, upload_id=upload_id)["spreadsheet"]}
+    batches = [SAMPLE_DATA.iloc[:2], SAMPLE_DATA.iloc[2:]]
+
+    store_batches(iter(batches), "sqlite://", sinks_factory=factory, run_id="run-a")
+    store_batches(iter(batches), "sqlite://", sinks_factory=factory, run_id="run-b")
+
+    assert len(service.rows) == 1 + 2 * len(SAMPLE_DATA)
+    with open(checkpoint, encoding="utf-8") as file:
+        assert sorted(key.rsplit("|", 1)[1] for key in json.load(file)) == ["run-a/0", "run-a/1", "run-b/0", "run-b/1"]
+
+    writer.forget("run-a")
+    with open(checkpoint, encoding="utf-8") as file:
+        assert sorted(key.rsplit("|", 1)[1] for key in json.load(file)) == ["run-b/0", "run-b/1"]
+
+@patch('googleapiclient.discovery.build')
+@patch('google.oauth2.service_account.Credentials.from_service_account_file')
+def test_get_sheets_service_is_reused(mock_cred, mock_build):
+    """Test service Sheets hanya dibangun sekali per file kredensial"""
+    first = get_sheets_service('./kredensial-test.json')
+    second = get_sheets_service('./kredensial-test.json')
+
+    assert first is second
+    mock_build.assert_called_once()
@@ -0,0 +1,227 @@
+import json
+import pickle
+import time
+import pytest
+from sqlalchemy import text
+from unittest.mock import Mock
+import main
+from benchmarks.server import CatalogServer
+from benchmarks.synthetic import render_page
+from utils.config import PipelineConfig
+from utils.extract import AdaptiveLimiter, Fetcher, ParsePool, parse_page
+from utils.history import ProductHistory
+from utils.journal import RunJournal
+from utils.load import get_engine
+from utils.sites import FASHION_STUDIO, SiteExtractor, compile_sites, iter_sites, site_limits, site_pages
+
+BOOKSHOP_HTML = """
+<ul>
+    <li class="book"><a class="name" href="/b/1">Laskar Pelangi</a><b>Rp 95.000</b><i data-stars="4.5"></i><s>2 edisi</s></li>
+    <li class="book"><a class="name" href="/b/2">Bumi Manusia</a><b>Rp 120.000</b><s>1 edisi</s></li>
+    <li class="book"><a class="name" href="/b/3">Habis</a><b>Stok habis</b><s>1 edisi</s></li>
+</ul>
+<a rel="next" href="/page3">Berikutnya</a>
+"""
+
+BOOKSHOP = {
+    "name": "bookshop",
+    "page_url": "http://bookshop.test/page{}",
+    "item": "li.book",
+    "fields": {
+        "Title": {"selector": "a.name"},
+        "Price": {"selector": "b", "pattern": r"Rp ([\d.]+)"},
+        "Rating": {"selector": "i", "attribute": "data-stars", "optional": True},
+        "Colors": {"selector": "s", "contains": "edisi", "pattern": r"(\d+)"},
+        "Size": {"selector": "a.name", "attribute": "href"},
+        "Gender": {"selector": "em", "optional": True},
+    },
+    "reject": {"Title": ["Habis"]},
+    "pagination": {"next": "a[rel=next]"},
+}
+
+def _parsed_fields(records):
+    return [{key: value for key, value in record.items() if key not in ("Timestamp", "Site")} for record in records]
+
+def _site(server, name, concurrency=2):
+    return dict(FASHION_STUDIO, name=name, initial_url=server.initial_url, page_url=server.base_url,
+                concurrency=concurrency, requests_per_second=None)
+
+@pytest.mark.parametrize("backend", ["selectolax", "html.parser"])
+def test_fashion_spec_matches_legacy_parser(backend):
+    """Test spesifikasi FASHION_STUDIO menghasilkan data yang sama dengan parser bawaan"""
+    extractor = SiteExtractor(FASHION_STUDIO, backend)
+
+    for page_number in (1, 3):
+        content = render_page(page_number, 3, products_per_page=12, seed=7).encode()
+        records, has_next = extractor(content)
+        expected, expected_next = parse_page(content, 'html.parser')
+
+        assert _parsed_fields(records) == _parsed_fields(expected)
+        assert has_next == expected_next
+        assert {record["Site"] for record in records} == {"fashion-studio"}
+
+def test_custom_spec_attribute_pattern_optional_and_reject():
+    """Test spesifikasi situs lain: atribut, regex, field opsional, penolakan, dan tombol next"""
+    records, has_next = SiteExtractor(BOOKSHOP)(BOOKSHOP_HTML)
+
+    assert _parsed_fields(records) == [
+        {"Title": "Laskar Pelangi", "Price": "95.000", "Rating": "4.5", "Colors": "2", "Size": "/b/1", "Gender": None},
+        {"Title": "Bumi Manusia", "Price": "120.000", "Rating": None, "Colors": "1", "Size": "/b/2", "Gender": None},
+    ]
+    assert [record["Site"] for record in records] == ["bookshop", "bookshop"]
+    assert has_next is True
+
+@pytest.mark.parametrize("spec", [
+    {"name": "x", "page_url": "http://x.test/", "item": "div", "fields": {"Title": {"selector": "h3"}}},
+    {"name": "x", "page_url": "http://x.test/{}", "item": "div", "fields": {"Title": {"css": "h3"}}},
+    {"name": "x", "page_url": "http://x.test/{}", "fields": {}},
+    {key: value for key, value in FASHION_STUDIO.items() if key != "fields"} | {
+        "fields": {name: field for name, field in FASHION_STUDIO["fields"].items() if name != "Colors"}},
+    {key: value for key, value in FASHION_STUDIO.items() if key != "fields"} | {
+        "fields": {**FASHION_STUDIO["fields"], "Link": {"selector": "a", "attribute": "href"}}},
+])
+def test_invalid_spec_rejected(spec):
+    """Test spesifikasi yang tidak valid ditolak saat dikompilasi"""
+    with pytest.raises(ValueError):
+        SiteExtractor(spec)
+
+def test_extractor_pickles_for_parse_pool():
+    """Test extractor dapat dikirim ke proses worker ParsePool"""
+    extractor = pickle.loads(pickle.dumps(SiteExtractor(FASHION_STUDIO)))
+    content = render_page(2, 3, products_per_page=4).encode()
+
+    with ParsePool(workers=1) as pool:
+        columns, has_next = pool.parse(content, extractor)
+
+    assert _parsed_fields(columns) == _parsed_fields(parse_page(content)[0])
+    assert set(columns.categories["Site"]) == {"fashion-studio"}
+    assert has_next is True
+
+def test_compile_sites_rejects_duplicate_names():
+    """Test nama situs harus unik dalam satu run"""
+    with pytest.raises(ValueError):
+        compile_sites(["fashion-studio", "fashion-studio"])
+
+def test_iter_sites_finishes_other_sites_before_raising():
+    """Test kegagalan satu situs tidak menghentikan situs lain, lalu kesalahannya dilempar"""
+    def broken():
+        yield 1, ["a1"]
+        raise ConnectionError("putus")
+
+    seen = []
+    with pytest.raises(ConnectionError):
+        for name, page_number, records in iter_sites({"a": broken(), "b": iter([(1, ["b1"]), (2, ["b2"])])}):
+            seen.append((name, page_number))
+
+    assert seen == [("a", 1), ("b", 1), ("b", 2)]
+
+def test_iter_sites_order_is_deterministic(tmp_path):
+    """Test urutan halaman bergiliran per situs tidak bergantung thread mana yang selesai lebih dulu"""
+    def slow(name, pages):
+        for page_number in pages:
+            time.sleep(0.02)
+            yield page_number, [f"{name}{page_number}"]
+
+    def fast(name, pages):
+        return iter([(page_number, [f"{name}{page_number}"]) for page_number in pages])
+
+    expected = [("a", 1), ("b", 1), ("a", 2), ("b", 2), ("b", 3)]
+    for sources in ({"a": slow("a", [1, 2]), "b": fast("b", [1, 2, 3])},
+                    {"a": fast("a", [1, 2]), "b": slow("b", [1, 2, 3])}):
+        assert [(name, number) for name, number, _ in iter_sites(sources)] == expected
+
+    # Run yang dilanjutkan dari jurnal menghasilkan urutan yang sama dengan run utuh
+    journal = RunJournal(str(tmp_path / "journal.sqlite"))
+    run_id = journal.start_run("batch")
+    fashion = {"Title": "Kemeja", "Price": "$1", "Rating": "4", "Colors": "1", "Size": "M", "Gender": "Men",
+               "Timestamp": "2024-01-01 10:00:00"}
+
+    def fetch(pages, delay=0.0):
+        def remaining(last):
+            for number in pages:
+                if number > (last or 0):
+                    time.sleep(delay)
+                    yield number, [fashion]
+        return remaining
+
+    # Run terputus setelah halaman 1 situs a dan halaman 1-2 situs b tercatat
+    journal.record_page(run_id, 1, [fashion], source="a")
+    for number in (1, 2):
+        journal.record_page(run_id, number, [fashion], source="b")
+    sources = {"a": journal.pages(run_id, fetch([1, 2]), source="a"),
+               "b": journal.pages(run_id, fetch([1, 2, 3], delay=0.02), source="b")}
+    assert [(name, number) for name, number, _ in iter_sites(sources)] == expected
+    journal.close()
+
+def test_scrape_two_sites_concurrently():
+    """Test dua katalog di-scrape bersamaan dengan anggaran per host dari spesifikasi"""
+    with CatalogServer(pages=4, products_per_page=3) as first, CatalogServer(pages=3, products_per_page=2) as second:
+        extractors = [SiteExtractor(_site(first, "toko-a", 3)), SiteExtractor(_site(second, "toko-b", 1))]
+        limiter = AdaptiveLimiter(initial_rate=50, max_rate=100, host_limits=site_limits(extractors))
+        with Fetcher(limiter=limiter) as fetcher:
+            sources = {extractor.name: site_pages(extractor, fetcher) for extractor in extractors}
+            pages = list(iter_sites(sources))
+
+    assert limiter.host_limits[extractors[1].host] == (5.0, 1)
+    assert sorted((name, number) for name, number, _ in pages) == [
+        ("toko-a", 1), ("toko-a", 2), ("toko-a", 3), ("toko-a", 4), ("toko-b", 1), ("toko-b", 2), ("toko-b", 3),
+    ]
+    assert sum(len(records) for _, _, records in pages) == 4 * 3 + 3 * 2
+
+def test_journal_pages_per_source(tmp_path):
+    """Test halaman beberapa situs dalam satu run dicatat dan dilanjutkan terpisah"""
+    journal = RunJournal(str(tmp_path / "journal.sqlite"))
+    run_id = journal.start_run("batch")
+    fashion = {"Title": "Kemeja", "Price": "$1", "Rating": "4", "Colors": "1", "Size": "M", "Gender": "Men",
+               "Timestamp": "2024-01-01 10:00:00"}
+
+    assert list(journal.pages(run_id, lambda last: iter([(1, [fashion])]), source="a"))[0][0] == 1
+    remaining = Mock(return_value=iter([(2, [fashion])]))
+    assert [number for number, _ in journal.pages(run_id, remaining, source="b")] == [2]
+    assert [number for number, _ in journal.pages(run_id, Mock(side_effect=AssertionError), source="a")] == [1]
+    remaining.assert_called_once_with(None)
+
+    journal.finish_run(run_id, "completed")
+    assert journal._fetch("SELECT COUNT(*) FROM pages")[0][0] == 0
+    journal.close()
+
+def test_main_scrapes_configured_sites(tmp_path, monkeypatch):
+    """Test main dengan config.sites mengambil seluruh situs dalam satu run"""
+    monkeypatch.chdir(tmp_path)
+    with CatalogServer(pages=2, products_per_page=3) as first, CatalogServer(pages=2, products_per_page=2) as second:
+        for index, server in enumerate((first, second)):
+            (tmp_path / f"site{index}.json").write_text(
+                json.dumps(_site(server, f"toko-{index}")), encoding="utf-8")
+        config = PipelineConfig(mode="extract", sites="site0.json,site1.json", max_requests_per_second=100)
+        summary = main.main(config=config)
+
+    assert summary["rows"] == 2 * 3 + 2 * 2
+    lines = (tmp_path / "hasil" / "raw_fashion.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == summary["rows"]
+
+def test_same_products_on_two_sites_stay_separate(tmp_path, monkeypatch):
+    """Test produk yang sama di dua situs dibedakan lewat kolom Site di CDC, MySQL, dan riwayat produk"""
+    monkeypatch.chdir(tmp_path)
+    with CatalogServer(pages=2, products_per_page=3) as first, CatalogServer(pages=2, products_per_page=3) as second:
+        for index, server in enumerate((first, second)):
+            (tmp_path / f"site{index}.json").write_text(
+                json.dumps(_site(server, f"toko-{index}")), encoding="utf-8")
+        config = PipelineConfig(mode="batch", sites="site0.json,site1.json", sinks="mysql,history",
+                                db_url=f"sqlite:///{tmp_path / 'fashion.db'}", max_requests_per_second=100)
+        first_run = main.main(config=config)
+        second_run = main.main(config=config)
+
+    assert first_run["rows"] == 2 * 2 * 3
+    # Tanpa Site, produk kedua situs saling menimpa dan tercatat sebagai update pada setiap run
+    assert second_run["rows"] == 0
+
+    engine = get_engine(config.db_url)
+    with engine.connect() as con:
+        rows = con.execute(text('SELECT "Site", COUNT(*) FROM bfpd GROUP BY "Site" ORDER BY "Site"')).fetchall()
+    engine.dispose()
+    assert rows == [("toko-0", 6), ("toko-1", 6)]
+
+    history = ProductHistory("product_history.sqlite")
+    latest = history.latest()
+    history.close()
+    assert latest.groupby("Site").size().to_dict() == {"toko-0": 6, "toko-1": 6}
@@ -1,7 +1,11 @@
 import pytest
 import pandas as pd
 import numpy as np
-from utils.transform import transform_to_DataFrame, transform_data
+import main
+from benchmarks.server import CatalogServer
+from utils.config import PipelineConfig
+from utils.extract import FashionColumns
+from utils.transform import transform_to_DataFrame, transform_data, transform_batches, TransformEngine
 
 SAMPLE_DATA = [
     {
@@ -134,4 +138,131 @@ def test_transform_data_invalid_input_type():
     exchange_rate = 16000
     
     result = transform_data("bukan_dataframe", exchange_rate)
-    assert result is None
\ No newline at end of file
+    assert result is None
+def test_transform_batches_streams_and_drops_cross_batch_duplicates():
+    """Test transformasi per micro-batch beserta penghapusan duplikat antar batch"""
+    kemeja = {**SAMPLE_DATA[1], "Title": "Kemeja"}
+    jeans = {**SAMPLE_DATA[1], "Title": "jeans"}
+    pages = [[kemeja], [kemeja, jeans], []]
+
+    batches = list(transform_batches(iter(pages), 16000))
+
+    assert len(batches) == 2
+    assert batches[0]['Title'].tolist() == ["Kemeja"]
+    assert batches[1]['Title'].tolist() == ["jeans"]
+
+def test_transform_batches_groups_pages_by_batch_size():
+    """Test penggabungan beberapa halaman menjadi satu micro-batch"""
+    pages = [[{**SAMPLE_DATA[1], "Title": "Kemeja"}], [dict(SAMPLE_DATA[1])]]
+
+    batches = list(transform_batches(pages, 16000, batch_size=2))
+
+    assert len(batches) == 1
+    assert len(batches[0]) == 2
+
+# Test untuk TransformEngine
+ENGINE_DATA = [
+    {"Title": "Kemeja", "Price": "$10.99", "Rating": "⭐ 4.2 / 5", "Colors": "5",
+     "Size": "M", "Gender": "Unisex", "Timestamp": "2023-05-01 12:00:00"},
+    {"Title": "Jeans", "Price": "$29.99", "Rating": "4.5/5", "Colors": "3",
+     "Size": "Size: L", "Gender": "Gender: Men", "Timestamp": "2023-05-01T12:05:00"},
+    {"Title": "Jaket", "Price": "Price Unavailable", "Rating": "3.8/5", "Colors": "2",
+     "Size": "XL", "Gender": "Women", "Timestamp": "2023-05-01 12:10:00"},
+    {"Title": "Topi", "Price": "$5.00", "Rating": "Not Rated", "Colors": "abc",
+     "Size": "S", "Gender": "Men", "Timestamp": "bukan waktu"},
+]
+
+def test_transform_engine_dtypes():
+    """Test TransformEngine menghasilkan tipe data akhir"""
+    result, report = TransformEngine(16000).transform(pd.DataFrame(ENGINE_DATA))
+
+    assert result['Price'].dtype == np.float32
+    assert result['Rating'].dtype == np.float32
+    assert result['Colors'].dtype == np.int8
+    assert isinstance(result['Size'].dtype, pd.CategoricalDtype)
+    assert isinstance(result['Gender'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(result['Timestamp'])
+    assert result['Size'].tolist() == ["M", "L"]
+    assert result['Gender'].tolist() == ["Unisex", "Men"]
+    assert result['Price'].tolist() == pytest.approx([10.99 * 16000, 29.99 * 16000], rel=1e-6)
+
+def test_transform_engine_reports_rejections_per_rule():
+    """Test jumlah baris yang ditolak dilaporkan per aturan"""
+    data = pd.DataFrame(ENGINE_DATA + [ENGINE_DATA[0]])
+
+    result, report = TransformEngine(16000).transform(data)
+
+    assert len(result) == 2
+    assert report["rows_in"] == 5
+    assert report["rows_out"] == 2
+    assert report["rejected"]["price_invalid"] == 1
+    assert report["rejected"]["rating_invalid"] == 1
+    assert report["rejected"]["colors_invalid"] == 1
+    assert report["rejected"]["timestamp_invalid"] == 1
+    assert report["rejected"]["duplicate"] == 1
+
+def test_transform_engine_matches_transform_data():
+    """Test hasil TransformEngine sama dengan transform_data"""
+    data = pd.DataFrame([ENGINE_DATA[0], {**ENGINE_DATA[1], "Size": "L", "Gender": "Men"}, ENGINE_DATA[2]])
+
+    expected = transform_data(data, 16000)
+    result, _ = TransformEngine(16000).transform(data)
+
+    assert result['Title'].tolist() == expected['Title'].tolist()
+    assert result['Price'].tolist() == pytest.approx(expected['Price'].tolist(), rel=1e-6)
+    assert result['Rating'].tolist() == pytest.approx(expected['Rating'].tolist(), rel=1e-6)
+    assert result['Colors'].tolist() == expected['Colors'].astype(int).tolist()
+
+def test_transform_engine_empty_input():
+    """Test TransformEngine dengan DataFrame kosong"""
+    result, report = TransformEngine(16000).transform(pd.DataFrame([]))
+
+    assert result is None
+    assert report["rows_in"] == 0
+
+def test_transform_batches_with_engine():
+    """Test transform_batches memakai TransformEngine per batch, tetap membuang duplikat antar batch"""
+    pages = [[ENGINE_DATA[0], ENGINE_DATA[2]], [ENGINE_DATA[0], ENGINE_DATA[1]]]
+    report = {}
+
+    batches = list(transform_batches(iter(pages), None, report=report, engine=TransformEngine(16000)))
+
+    assert [batch['Title'].tolist() for batch in batches] == [["Kemeja"], ["Jeans"]]
+    assert batches[1]['Price'].dtype == np.float32
+    assert batches[1]['Size'].tolist() == ["L"]
+    assert report["rows_in"] == 4
+    assert report["rows_out"] == 2
+    assert report["rejected"]["price_invalid"] == 1
+    assert report["rejected"]["duplicate"] == 1
+
+@pytest.mark.parametrize("mode", ["batch", "stream"])
+def test_main_with_transform_engine(tmp_path, monkeypatch, mode):
+    """Test config.transform_engine memakai TransformEngine sebagai pengganti transform_data di main"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("utils.transform.transform_data", lambda *args, **kwargs: pytest.fail("transform_data dipakai"))
+    with CatalogServer(pages=3, products_per_page=4) as server:
+        config = PipelineConfig(mode=mode, sinks="csv", cdc=False, transform_engine=True, base_url=server.base_url,
+                                initial_url=server.initial_url, max_requests_per_second=100)
+        summary = main.main(config=config)
+
+    assert summary["status"] == "success"
+    saved = pd.read_csv(tmp_path / "fashion_data.csv")
+    assert len(saved) == summary["rows"] > 0
+    assert not saved['Size'].str.startswith("Size:").any()
+
+def test_transform_to_DataFrame_from_columns():
+    """Test membangun DataFrame langsung dari FashionColumns"""
+    columns = FashionColumns()
+    columns.extend([SAMPLE_DATA[1], {**SAMPLE_DATA[1], "Title": "Kaos", "Size": "S"}])
+
+    result = transform_to_DataFrame(columns)
+
+    assert list(result.columns) == ["Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"]
+    assert result['Title'].tolist() == ["jeans", "Kaos"]
+    assert isinstance(result['Size'].dtype, pd.CategoricalDtype)
+    assert result['Size'].tolist() == ["L", "S"]
+    assert len(transform_data(result, 16000)) == 2
+
+def test_transform_to_DataFrame_empty_columns():
+    """Test FashionColumns kosong"""
+    assert transform_to_DataFrame(FashionColumns()) is None
@@ -0,0 +1,75 @@
+import pytest
+import pandas as pd
+from benchmarks.synthetic import render_page
+from utils.extract import parse_page
+from utils.transform import TransformEngine, transform_data, transform_to_DataFrame
+from utils.validate import REASON_COLUMN, QuarantineWriter, Validator
+
+ROWS = [
+    {"Title": "Kemeja", "Price": "$10.99", "Rating": "⭐ 4.2 / 5", "Colors": "5 Colors",
+     "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2024-01-01 10:00:00"},
+    {"Title": "Celana", "Price": "$20.00", "Rating": "4/5", "Colors": "3",
+     "Size": "L", "Gender": "Women", "Timestamp": "2024-01-01 10:00:00"},
+    {"Title": "Unknown Product", "Price": "Price Unavailable", "Rating": "⭐ Invalid Rating / 5", "Colors": "2",
+     "Size": "S", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+    {"Title": None, "Price": "$5.00", "Rating": "Not Rated", "Colors": "200",
+     "Size": "Size: ", "Gender": "Men", "Timestamp": "bukan waktu"},
+]
+
+def test_validate_splits_rows_with_reasons_and_counts():
+    """Test baris dipisahkan per aturan beserta seluruh alasan penolakannya"""
+    valid, rejected, counts = Validator().validate(pd.DataFrame(ROWS))
+
+    assert valid["Title"].tolist() == ["Kemeja", "Celana"]
+    assert rejected[REASON_COLUMN].tolist() == [
+        "title_unknown;price_invalid;rating_invalid",
+        "title_missing;rating_invalid;colors_invalid;size_missing;timestamp_invalid",
+    ]
+    assert counts == {"title_missing": 1, "title_unknown": 1, "price_invalid": 1, "rating_invalid": 2,
+                      "colors_invalid": 1, "size_missing": 1, "gender_missing": 0, "timestamp_invalid": 1}
+
+def test_integer_rating_is_kept():
+    """Test rating bulat seperti 4/5 tidak lagi dibuang"""
+    result = transform_data(pd.DataFrame(ROWS[:2]), 16000)
+
+    assert result["Rating"].tolist() == [4.2, 4.0]
+    assert TransformEngine(16000).transform(pd.DataFrame(ROWS[:2]))[0]["Rating"].tolist() == pytest.approx([4.2, 4.0])
+
+def test_custom_rules_and_invalid_rule():
+    """Test aturan deklaratif lain dan aturan dengan kunci tidak dikenal"""
+    validator = Validator([{"name": "price_too_high", "column": "Price", "pattern": r"(\d+)", "between": (0, 15)}])
+
+    valid, _, counts = validator.validate(pd.DataFrame(ROWS[:2]))
+
+    assert valid["Title"].tolist() == ["Kemeja"]
+    assert counts == {"price_too_high": 1}
+    with pytest.raises(ValueError):
+        Validator([{"name": "x", "column": "Price", "regex": "."}])
+
+def test_quarantine_writer_collects_rejected_batches(tmp_path):
+    """Test baris yang ditolak beberapa batch ditulis ke satu CSV quarantine dengan alasannya"""
+    path = tmp_path / "hasil" / "quarantine.csv"
+    quarantine = QuarantineWriter(str(path))
+    report = {}
+
+    for rows in (ROWS[:3], ROWS[3:]):
+        transform_data(pd.DataFrame(rows), 16000, report, quarantine)
+
+    saved = pd.read_csv(path)
+    assert saved["Reason"].str.split(";").str[0].tolist() == ["title_unknown", "title_missing"]
+    assert quarantine.rows == 2
+    assert report["rows_in"] == 4 and report["rows_out"] == 2
+    assert report["rejected"]["rating_invalid"] == 2
+
+def test_parser_keeps_dirty_products_for_quarantine():
+    """Test parser tidak lagi membuang produk kotor; semuanya ditolak di tahap validasi"""
+    content = render_page(2, 5, products_per_page=200, seed=3).encode()
+    records, _ = parse_page(content, "selectolax")
+    rejected = []
+
+    result, report = TransformEngine(16000, quarantine=rejected.append).transform(transform_to_DataFrame(records))
+
+    assert len(records) == 200
+    assert len(result) + len(rejected[0]) == 200
+    assert not rejected[0]["Title"].isin(result["Title"]).all()
+    assert report["rejected"]["title_unknown"] == (rejected[0]["Title"] == "Unknown Product").sum()
@@ -0,0 +1,267 @@
+import asyncio
+import importlib.util
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.extract import (
+    HEADERS, INITIAL_URL, RETRY_STATUS, FashionColumns, Fetcher, _retry_after_seconds, available_parsers, parse_page,
+)
+
+
+def _aiohttp():
+    """Modul aiohttp jika terpasang, selain itu None (AsyncFetcher memakai Fetcher di thread)."""
+    if importlib.util.find_spec('aiohttp') is None:
+        return None
+    import aiohttp
+    return aiohttp
+
+
+class AsyncRateLimiter:
+    """Versi asyncio dari RateLimiter: jarak minimum antar request tanpa memblokir event loop."""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0
+        self._next_time = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_time > now:
+                await asyncio.sleep(self._next_time - now)
+            self._next_time = max(now, self._next_time) + self.interval
+
+
+class AsyncFetcher:
+    """Pengambil konten HTML untuk asyncio dengan satu session keep-alive (aiohttp).
+
+    Perilakunya sama seperti Fetcher: respons 429/5xx dan kesalahan koneksi dicoba ulang
+    hingga `max_retries` kali dengan backoff eksponensial (menghormati Retry-After), status
+    dan ukuran respons dicatat ke `metrics`, dan dengan raise_errors=True kegagalan dilempar
+    alih-alih dikembalikan sebagai None. Jika aiohttp tidak terpasang, request dikirim lewat
+    Fetcher (requests) di thread terpisah sehingga event loop tetap tidak terblokir.
+    """
+
+    def __init__(self, pool_size=10, max_retries=3, backoff_factor=0.5, timeout=10, metrics=None,
+                 raise_errors=False, requests_per_second=None):
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.metrics = metrics
+        self.raise_errors = raise_errors
+        self.limiter = AsyncRateLimiter(requests_per_second)
+        self._aiohttp = _aiohttp()
+        self._session = None
+        self._fetcher = None
+        if self._aiohttp is None:
+            self._fetcher = Fetcher(pool_size=pool_size, max_retries=max_retries, backoff_factor=backoff_factor,
+                                    timeout=timeout, metrics=metrics, raise_errors=raise_errors)
+
+    def _client(self):
+        # ClientSession harus dibuat di dalam event loop yang memakainya
+        if self._session is None:
+            aiohttp = self._aiohttp
+            self._session = aiohttp.ClientSession(
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+            )
+        return self._session
+
+    def _record(self, status, size=0):
+        if self.metrics is not None:
+            self.metrics.record_response(status, size)
+
+    async def _send(self, url):
+        """GET dengan retry; mengembalikan konten respons atau melempar ClientResponseError untuk 4xx/5xx."""
+        aiohttp = self._aiohttp
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.wait()
+            retry_after = None
+            try:
+                async with self._client().get(url) as response:
+                    content = await response.read()
+                    self._record(response.status, len(content))
+                    if response.status not in RETRY_STATUS or attempt == self.max_retries:
+                        response.raise_for_status()
+                        return content
+                    retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+                    print(f"Server membalas {response.status} untuk {url}, mencoba ulang")
+            except aiohttp.ClientResponseError:
+                raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self._record(None)
+                if attempt == self.max_retries:
+                    raise
+            delay = self.backoff_factor * (2 ** attempt)
+            await asyncio.sleep(max(delay, retry_after or 0))
+
+    async def get(self, url):
+        """Mengambil konten HTML dari URL, mengembalikan None jika gagal."""
+        if self._fetcher is not None:
+            return await asyncio.to_thread(self._fetcher.get, url)
+
+        try:
+            return await self._send(url)
+        except (self._aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
+            if self.raise_errors:
+                raise
+            return None
+
+    async def close(self):
+        """Menutup session beserta connection pool-nya."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self._fetcher is not None:
+            self._fetcher.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+async def async_iter_fashion_pages(base_url, start_page=2, max_workers=4, parse_workers=None, max_pending_pages=4,
+                                   requests_per_second=None, fetcher=None, parser='html.parser',
+                                   initial_url=INITIAL_URL, parse_pool=None):
+    """Async generator yang menghasilkan (nomor_halaman, list data fashion) sesuai urutan halaman.
+
+    `max_workers` coroutine pengambil halaman mengisi antrean berukuran `max_pending_pages`
+    yang dikonsumsi `parse_workers` worker parsing (thread, atau proses jika `parse_pool`
+    diberikan; hasilnya kemudian berupa FashionColumns). Jika parsing tertinggal, antrean penuh
+    dan pengambil halaman menunggu (backpressure). Halaman yang sudah diklaim tetapi belum
+    dihasilkan dibatasi max_workers + parse_workers, sehingga memori tetap terbatas dan halaman
+    yang diambil melewati akhir katalog sedikit, seperti pada iter_fashion_pages paralel.
+
+    Seperti iter_fashion_pages, halaman awal (`initial_url`) bernomor 1 dan halaman berikutnya
+    diambil secara spekulatif hingga ditemukan halaman tanpa tombol next; halaman yang gagal
+    diambil dianggap akhir katalog kecuali fetcher dibuat dengan raise_errors=True.
+    """
+    if fetcher is None:
+        async with AsyncFetcher(pool_size=max(max_workers, 10), requests_per_second=requests_per_second) as own:
+            async for page in async_iter_fashion_pages(base_url, start_page, max_workers, parse_workers,
+                                                       max_pending_pages, requests_per_second, own, parser,
+                                                       initial_url, parse_pool):
+                yield page
+        return
+
+    if parser == 'auto':
+        parser = available_parsers()[0]
+    if parse_workers is None:
+        parse_workers = parse_pool.workers if parse_pool is not None else 1
+    loop = asyncio.get_running_loop()
+    executor = None if parse_pool is not None else ThreadPoolExecutor(max_workers=parse_workers)
+
+    pages = [(1, initial_url)] if initial_url is not None else []
+    next_page = start_page
+    last_page = None  # Nomor halaman terakhir katalog begitu diketahui
+    results = {}
+    changed = asyncio.Condition()
+    # Slot jendela: halaman yang sudah diklaim tetapi belum dihasilkan generator (sedang diambil atau
+    # diparsing), sehingga paling banyak sebanyak ini halaman terambil melewati halaman terakhir
+    window = asyncio.Semaphore(max_workers + parse_workers)
+    queue = asyncio.Queue(maxsize=max_pending_pages)
+
+    def claim():
+        nonlocal next_page
+        if pages:
+            return pages.pop(0)
+        if last_page is not None and next_page > last_page:
+            return None
+        page = (next_page, base_url.format(next_page))
+        next_page += 1
+        return page
+
+    async def publish(page_number, result):
+        nonlocal last_page
+        async with changed:
+            results[page_number] = result
+            records, has_next, error = result
+            # Tombol next pada halaman awal tidak menentukan akhir pagination; halaman yang gagal
+            # tanpa exception (konten None) dianggap akhir katalog seperti iter_fashion_pages
+            if page_number != 1 and error is None and not has_next:
+                end = page_number if records is not None else page_number - 1
+                last_page = end if last_page is None else min(last_page, end)
+            changed.notify_all()
+
+    async def fetch_worker():
+        while True:
+            await window.acquire()
+            page = claim()
+            if page is None:
+                window.release()
+                return
+            page_number, url = page
+            print(f"Scraping halaman: {url}")
+            try:
+                content = await fetcher.get(url)
+            except Exception as e:
+                await publish(page_number, (None, False, e))
+                continue
+            if not content:
+                await publish(page_number, (None, False, None))
+                continue
+            await queue.put((page_number, content))
+
+    async def parse_worker():
+        while True:
+            page_number, content = await queue.get()
+            try:
+                if parse_pool is not None:
+                    records, has_next = await asyncio.wrap_future(parse_pool.submit(content, parser))
+                else:
+                    records, has_next = await loop.run_in_executor(executor, parse_page, content, parser)
+                await publish(page_number, (records, has_next, None))
+            except Exception as e:
+                await publish(page_number, (None, False, e))
+
+    fetchers = [asyncio.create_task(fetch_worker()) for _ in range(max_workers)]
+    parsers = [asyncio.create_task(parse_worker()) for _ in range(parse_workers)]
+    try:
+        page_number = 1 if initial_url is not None else start_page
+        while True:
+            async with changed:
+                await changed.wait_for(lambda: page_number in results
+                                       or (last_page is not None and page_number > last_page))
+                if page_number not in results:
+                    break
+                records, _, error = results.pop(page_number)
+            window.release()
+            if error is not None:
+                raise error
+            if records is not None:
+                yield page_number, records
+            if last_page is not None and page_number >= last_page:
+                break
+            page_number = start_page if page_number == 1 and initial_url is not None else page_number + 1
+    finally:
+        for task in fetchers:
+            task.cancel()
+        await asyncio.gather(*fetchers, return_exceptions=True)
+        for task in parsers:
+            task.cancel()
+        await asyncio.gather(*parsers, return_exceptions=True)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def async_scrape_fashion(base_url, start_page=2, max_workers=4, parse_workers=None, max_pending_pages=4,
+                               requests_per_second=None, fetcher=None, parser='html.parser', columnar=False,
+                               initial_url=INITIAL_URL, parse_pool=None):
+    """Versi asyncio dari scrape_fashion untuk dipanggil di dalam event loop tanpa memblokirnya.
+
+    Lihat async_iter_fashion_pages untuk antrean fetch -> parse dan backpressure-nya. Dengan
+    columnar=True hasilnya berupa FashionColumns.
+    """
+    data = FashionColumns() if columnar else []
+    async for _, records in async_iter_fashion_pages(base_url, start_page, max_workers, parse_workers,
+                                                     max_pending_pages, requests_per_second, fetcher, parser,
+                                                     initial_url, parse_pool):
+        data.extend(records)
+    return data
@@ -0,0 +1,104 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+
+class PageCache:
+    """Cache halaman HTTP di disk (SQLite) per URL untuk conditional GET dan scraping incremental.
+
+    Untuk setiap URL disimpan header ETag/Last-Modified, hash konten, konten terakhir, dan
+    status tombol next hasil parsing sebelumnya.
+
+    Hasil fetch sebuah run lebih dulu disimpan di tabel `staged` (get() sudah melihatnya) dan
+    baru menjadi acuan run berikutnya setelah commit(), yang dipanggil pipeline ketika seluruh
+    sink berhasil. Jika run gagal, discard() di awal run baru membuang hasil yang belum di-commit
+    sehingga halaman yang berubah tetap dianggap berubah dan produknya tidak terlewat.
+    """
+
+    def __init__(self, path='page_cache.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        for table in ('pages', 'staged'):
+            self._conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT NOT NULL,
+                    content BLOB NOT NULL,
+                    has_next INTEGER,
+                    fetched_at TEXT NOT NULL
+                )
+                """
+            )
+        self._conn.commit()
+
+    def _row(self, url):
+        """Baris terbaru untuk URL: hasil run ini (staged) jika ada, selain itu hasil yang sudah di-commit."""
+        for table in ('staged', 'pages'):
+            row = self._conn.execute(
+                f"SELECT etag, last_modified, content_hash, content, has_next FROM {table} WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is not None:
+                return row
+        return None
+
+    def get(self, url):
+        """Mengambil entri cache untuk URL dalam bentuk dict, atau None jika belum ada."""
+        with self._lock:
+            row = self._row(url)
+
+        if row is None:
+            return None
+
+        etag, last_modified, content_hash, content, has_next = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_hash": content_hash,
+            "content": content,
+            "has_next": None if has_next is None else bool(has_next),
+        }
+
+    def put(self, url, content, content_hash, etag=None, last_modified=None):
+        """Menyimpan hasil fetch terbaru (staged hingga commit). Status next dihapus jika hash konten berubah."""
+        fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            previous = self._row(url)
+            has_next = previous[4] if previous is not None and previous[2] == content_hash else None
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO staged (url, etag, last_modified, content_hash, content, has_next, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (url, etag, last_modified, content_hash, content, has_next, fetched_at),
+            )
+            self._conn.commit()
+
+    def set_has_next(self, url, has_next):
+        """Mencatat apakah halaman pada URL memiliki tombol next."""
+        with self._lock:
+            for table in ('staged', 'pages'):
+                cursor = self._conn.execute(f"UPDATE {table} SET has_next = ? WHERE url = ?", (int(has_next), url))
+                if cursor.rowcount:
+                    break
+            self._conn.commit()
+
+    def commit(self):
+        """Menjadikan hasil fetch run ini acuan run berikutnya (setelah seluruh sink berhasil)."""
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO pages SELECT * FROM staged")
+            self._conn.execute("DELETE FROM staged")
+
+    def discard(self):
+        """Membuang hasil fetch yang belum di-commit, misalnya dari run sebelumnya yang gagal."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM staged")
+
+    def close(self):
+        """Menutup koneksi SQLite."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,247 @@
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.load import FASHION_COLUMNS, NATURAL_KEY, SITE_COLUMN, product_key
+
+# Kolom yang tidak ikut menentukan apakah sebuah produk berubah (Timestamp selalu berbeda tiap run)
+VOLATILE_COLUMNS = ('Timestamp',)
+
+
+def _normalise(series):
+    """Menyamakan representasi kolom sebelum di-hash (float32/float64, category/object).
+
+    Angka dibandingkan pada presisi float32 agar output TransformEngine (float32) dan
+    transform_data (float64) menghasilkan hash yang sama.
+    """
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+        return series.astype('float32').astype('float64')
+    return series.astype(str)
+
+
+def hash_rows(data, columns):
+    """Hash uint64 per baris dari `columns`, stabil antar run dan antar tipe data kolom."""
+    frame = pd.DataFrame({column: _normalise(data[column]).to_numpy() for column in columns})
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy(dtype=np.uint64)
+
+
+class SnapshotIndex:
+    """Indeks hash snapshot terakhir di disk (SQLite): hash product_key -> hash isi baris.
+
+    Isi baris di-hash tanpa VOLATILE_COLUMNS sehingga produk yang sama dengan Timestamp baru
+    tidak dianggap berubah. Kolom product_key (NATURAL_KEY, ditambah Site pada run beberapa
+    situs) ikut disimpan agar baris yang hilang dapat dikirim sebagai operasi delete.
+    """
+
+    def __init__(self, path='snapshot_index.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshot (
+                key_hash INTEGER PRIMARY KEY,
+                row_hash INTEGER NOT NULL,
+                Title TEXT,
+                Size TEXT,
+                Gender TEXT,
+                Site TEXT
+            )
+            """
+        )
+        # Snapshot lama dibuat sebelum ada kolom Site
+        if 'Site' not in [row[1] for row in self._conn.execute("PRAGMA table_info(snapshot)")]:
+            self._conn.execute("ALTER TABLE snapshot ADD COLUMN Site TEXT")
+        self._conn.commit()
+
+    def start_tracking(self):
+        """Menyiapkan tabel sementara untuk satu ChangeTracker (satu tracker aktif per SnapshotIndex).
+
+        Key yang terlihat dan perubahan yang belum diterapkan disimpan di tabel TEMP SQLite, bukan
+        di memori, sehingga memori tracker tidak bertambah seiring ukuran katalog.
+        """
+        with self._lock:
+            self._conn.executescript(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS seen (key_hash INTEGER PRIMARY KEY);
+                CREATE TEMP TABLE IF NOT EXISTS pending (
+                    key_hash INTEGER PRIMARY KEY,
+                    row_hash INTEGER NOT NULL,
+                    Title TEXT,
+                    Size TEXT,
+                    Gender TEXT,
+                    Site TEXT
+                );
+                CREATE TEMP TABLE IF NOT EXISTS probe (position INTEGER PRIMARY KEY, key_hash INTEGER NOT NULL);
+                DELETE FROM temp.seen;
+                DELETE FROM temp.pending;
+                DELETE FROM temp.probe;
+                """
+            )
+
+    def observe(self, key_hash):
+        """Mencatat `key_hash` sebagai terlihat; mengembalikan (mask ada di snapshot, row_hash snapshot)."""
+        # SQLite menyimpan INTEGER bertanda; hash uint64 disimpan lewat view int64
+        keys = np.asarray(key_hash, dtype=np.uint64).view(np.int64).tolist()
+        with self._lock, self._conn:
+            conn = self._conn
+            conn.execute("DELETE FROM temp.probe")
+            conn.executemany("INSERT INTO temp.probe (position, key_hash) VALUES (?, ?)", enumerate(keys))
+            rows = conn.execute(
+                "SELECT p.position, s.row_hash FROM temp.probe p JOIN snapshot s ON s.key_hash = p.key_hash"
+            ).fetchall()
+            conn.execute("INSERT OR IGNORE INTO temp.seen (key_hash) SELECT key_hash FROM temp.probe")
+            conn.execute("DELETE FROM temp.probe")
+
+        found = np.zeros(len(keys), dtype=bool)
+        row_hash = np.zeros(len(keys), dtype=np.uint64)
+        if rows:
+            rows = np.array(rows, dtype=np.int64)
+            found[rows[:, 0]] = True
+            row_hash[rows[:, 0]] = rows[:, 1].view(np.uint64)
+        return found, row_hash
+
+    def stage(self, key_hash, row_hash, keys):
+        """Menyimpan baris yang berubah untuk diterapkan ke snapshot saat apply()."""
+        sites = keys[SITE_COLUMN].astype(object).where(keys[SITE_COLUMN].notna(), None).tolist() \
+            if SITE_COLUMN in keys.columns else [None] * len(keys)
+        rows = zip(
+            np.asarray(key_hash, dtype=np.uint64).view(np.int64).tolist(),
+            np.asarray(row_hash, dtype=np.uint64).view(np.int64).tolist(),
+            *(keys[column].astype(str).tolist() for column in NATURAL_KEY),
+            sites,
+        )
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO temp.pending (key_hash, row_hash, Title, Size, Gender, Site) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def missing(self):
+        """Kolom product_key produk pada snapshot yang belum terlihat sejak start_tracking(), sebagai DataFrame.
+
+        Kolom Site hanya disertakan jika ada produk dari situs tertentu (run dengan config.sites).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT Title, Size, Gender, Site FROM snapshot WHERE key_hash NOT IN (SELECT key_hash FROM temp.seen)"
+            ).fetchall()
+        missing = pd.DataFrame(rows, columns=list(NATURAL_KEY) + [SITE_COLUMN])
+        return missing if missing[SITE_COLUMN].notna().any() else missing.drop(columns=SITE_COLUMN)
+
+    def apply(self, delete_missing=True):
+        """Menerapkan baris yang di-stage dan (bawaan) menghapus produk yang tidak terlihat, dalam satu transaksi.
+
+        Biayanya sebanding dengan jumlah perubahan dan ukuran snapshot di disk, bukan memori.
+        """
+        with self._lock, self._conn:
+            conn = self._conn
+            if delete_missing:
+                conn.execute("DELETE FROM snapshot WHERE key_hash NOT IN (SELECT key_hash FROM temp.seen)")
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshot (key_hash, row_hash, Title, Size, Gender, Site) "
+                "SELECT key_hash, row_hash, Title, Size, Gender, Site FROM temp.pending"
+            )
+            conn.execute("DELETE FROM temp.pending")
+            conn.execute("DELETE FROM temp.seen")
+
+    def tracker(self, track_deletes=True):
+        """Membuat ChangeTracker terhadap snapshot terakhir (lihat ChangeTracker untuk track_deletes)."""
+        return ChangeTracker(self, track_deletes)
+
+    def diff(self, data, track_deletes=True):
+        """Perubahan seluruh `data` terhadap snapshot terakhir (insert, update, dan delete sekaligus).
+
+        Snapshot baru belum disimpan; panggil commit() pada tracker yang dikembalikan setelah
+        seluruh sink berhasil menerapkan perubahan. Mengembalikan (changes, tracker).
+        """
+        tracker = self.tracker(track_deletes)
+        upserts, deletes = tracker.diff(data), tracker.deletes()
+        if deletes.empty or upserts.empty:
+            # concat dengan DataFrame kosong memicu FutureWarning pandas soal dtype
+            return (upserts if deletes.empty else deletes), tracker
+        return pd.concat([upserts, deletes], ignore_index=True), tracker
+
+    def close(self):
+        """Menutup koneksi SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+class ChangeTracker:
+    """Menghitung perubahan per batch terhadap satu snapshot, lalu memperbarui snapshot di akhir.
+
+    Cocok untuk mode streaming: diff() dipanggil untuk setiap batch (insert/update), deletes()
+    sekali setelah batch terakhir, lalu commit() setelah sink berhasil. Hasil diff berupa DataFrame
+    dengan kolom data ditambah kolom Op ('insert', 'update', atau 'delete'); baris delete hanya
+    berisi nilai kolom product_key. Data dengan kolom Site (beberapa situs) dicocokkan per
+    (Site, Title, Size, Gender), sehingga produk yang sama di dua situs dilacak terpisah.
+
+    Setiap batch dicocokkan langsung ke indeks SQLite, dan key yang terlihat serta perubahan yang
+    menunggu commit disimpan di tabel sementara SQLite (lihat SnapshotIndex.start_tracking),
+    sehingga memori yang dipakai sebanding dengan ukuran batch, bukan ukuran katalog.
+
+    Dengan track_deletes=False tidak ada delete yang dihasilkan maupun diterapkan ke snapshot,
+    misalnya pada run incremental: halaman yang tidak berubah tidak menghasilkan data sehingga
+    produknya tidak dapat dibedakan dari produk yang benar-benar hilang. Produk yang hilang
+    baru terdeteksi pada run penuh berikutnya.
+    """
+
+    def __init__(self, index, track_deletes=True):
+        self.index = index
+        self.track_deletes = track_deletes
+        self._columns = list(FASHION_COLUMNS)
+        index.start_tracking()
+
+    def diff(self, data):
+        """Baris `data` yang baru atau berubah dibanding snapshot, dengan kolom Op."""
+        columns = [column for column in FASHION_COLUMNS if column in data.columns]
+        key = product_key(data.columns)
+        data = data.drop_duplicates(subset=list(key), keep='last')
+        key_hash = hash_rows(data, key)
+        row_hash = hash_rows(data, [column for column in columns if column not in VOLATILE_COLUMNS])
+        # Kolom tambahan (misalnya Price_EUR dari utils.currency) ikut dikirim tanpa ikut di-hash
+        columns += [column for column in data.columns if column not in FASHION_COLUMNS]
+        self._columns = columns
+
+        found, old_row_hash = self.index.observe(key_hash)
+        is_new = ~found
+        mask = is_new | (found & (old_row_hash != row_hash))
+        self.index.stage(key_hash[mask], row_hash[mask], data.loc[mask, list(key)])
+
+        op = np.where(is_new, 'insert', 'update')
+        changes = data[columns].assign(Op=op)[mask]
+        return changes.reset_index(drop=True)
+
+    def deletes(self):
+        """Produk pada snapshot yang tidak muncul di satu batch pun, sebagai baris Op='delete'.
+
+        Kolom disamakan dengan hasil diff (kolom selain product_key kosong) agar sink log
+        perubahan yang menambahkan baris tanpa header, seperti CSV dan Google Sheets, tetap sejajar.
+        """
+        missing = self.index.missing() if self.track_deletes else pd.DataFrame(columns=list(NATURAL_KEY))
+        columns = self._columns + [column for column in missing.columns if column not in self._columns]
+        return missing.reindex(columns=columns).assign(Op='delete')
+
+    def commit(self):
+        """Menerapkan perubahan yang terlihat (termasuk produk yang hilang jika track_deletes) ke snapshot."""
+        self.index.apply(delete_missing=self.track_deletes)
+
+
+def iter_changes(batches, tracker):
+    """Mengubah aliran batch DataFrame menjadi aliran DataFrame perubahan untuk mode streaming.
+
+    Batch tanpa perubahan dilewati; baris delete dihasilkan sebagai batch terakhir setelah seluruh
+    batch terlihat. Snapshot baru tetap harus disimpan dengan tracker.commit() oleh pemanggil.
+    """
+    for batch in batches:
+        changes = tracker.diff(batch)
+        if not changes.empty:
+            yield changes
+
+    deletes = tracker.deletes()
+    if not deletes.empty:
+        yield deletes
@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+
+# Pengaturan pipeline beserta nilai bawaan dan penjelasannya. Urutan prioritas saat dimuat:
+# nilai bawaan < file konfigurasi (JSON/TOML) < environment variable ETL_<NAMA> < flag CLI.
+OPTIONS = (
+    # Sumber data
+    ('base_url', 'https://fashion-studio.dicoding.dev/page{}', 'pola URL halaman katalog ({} = nomor halaman)'),
+    ('initial_url', 'https://fashion-studio.dicoding.dev/', 'URL halaman pertama katalog'),
+    ('sites', (), 'situs yang di-scrape bersamaan, dipisahkan koma: nama bawaan (fashion-studio) atau file '
+                  'JSON spesifikasi situs (utils.sites); kosong = base_url dan initial_url'),
+    ('parser', 'auto', "backend parser HTML: html.parser, lxml, selectolax, atau auto (tercepat yang terpasang)"),
+    ('parse_workers', None, 'jumlah proses parser HTML (kosong/auto = jumlah core CPU, 0 = parse di thread '
+                            'scraping)'),
+    ('max_workers', 4, 'jumlah request halaman yang berjalan bersamaan'),
+    ('max_requests_per_second', 5.0, 'batas sopan laju request per host untuk AdaptiveLimiter'),
+    ('incremental', False, 'hanya memproses halaman yang berubah sejak run sebelumnya'),
+    ('cache_path', 'page_cache.sqlite', 'cache halaman untuk mode incremental'),
+    # Transformasi
+    ('transform_engine', False, 'memakai TransformEngine (Price/Rating float32, Colors int8, Size/Gender category, '
+                                'Timestamp datetime64) sebagai pengganti transform_data'),
+    ('exchange_rate', 16000.0, 'kurs tetap USD ke Rupiah jika rates_path kosong'),
+    ('rates_path', '', 'file kurs historis CSV (date,currency,rate) atau JSON untuk konversi per tanggal'),
+    ('currencies', ('IDR',), 'mata uang tujuan, dipisahkan koma; yang pertama mengisi kolom Price, sisanya '
+                             'kolom Price_<KODE> (butuh rates_path)'),
+    ('rates_cache_path', 'rates_cache.sqlite', 'cache kurs di disk'),
+    ('rates_ttl', 86400.0, 'detik sebelum kurs di cache dibaca ulang dari rates_path'),
+    ('dedup_memory_mb', 64.0, 'batas memori (MB) hash deduplikasi mode stream; kelebihannya ditumpahkan ke disk'),
+    ('dedup_path', '', 'file SQLite tumpahan hash deduplikasi (kosong = file sementara)'),
+    ('quarantine_path', 'hasil/quarantine.csv', 'CSV baris yang ditolak validasi beserta alasannya (kosong = tidak disimpan)'),
+    # Mode run
+    ('mode', 'batch', 'batch (seluruh katalog sekaligus), stream (per halaman), atau extract (scraping saja)'),
+    ('resume', False, 'melanjutkan run terakhir yang belum selesai'),
+    ('cdc', True, 'hanya mengirim perubahan terhadap snapshot run sebelumnya ke sink: MySQL menerapkan '
+                  'upsert/delete, CSV ditulis ke changes_csv (bukan csv_path) dan Google Sheets menerima '
+                  'baris perubahan dengan kolom Op tambahan; --no-cdc menulis seluruh katalog seperti sebelumnya'),
+    ('snapshot_path', 'snapshot_index.sqlite', 'indeks snapshot untuk CDC'),
+    ('journal_path', 'run_journal.sqlite', 'jurnal run untuk --resume'),
+    # Sink
+    ('sinks', ('mysql', 'csv', 'spreadsheet', 'history'),
+     'sink yang diaktifkan, dipisahkan koma: mysql, csv, spreadsheet, parquet, history'),
+    ('db_url', 'mysql+mysqlconnector://root:@localhost/dicoding', 'URL database SQLAlchemy untuk sink mysql'),
+    ('csv_path', 'fashion_data.csv', 'file CSV untuk sink csv'),
+    ('changes_csv', 'fashion_changes.csv', 'file log perubahan CSV saat CDC aktif'),
+    ('parquet_dir', 'hasil/parquet', 'direktori dataset Parquet untuk sink parquet'),
+    ('history_path', 'product_history.sqlite', 'riwayat produk lokal berindeks (utils.history) untuk sink history'),
+    ('spreadsheet_id', '1mYb2HVAmiUnBmjNQF3U7GGItsfSEnJvdsDymKey2bpk', 'ID Google Spreadsheet'),
+    ('sheet_range', 'Sheet1!A1:G', 'range tujuan pada Google Spreadsheet (dengan sites, tambah kolom H '
+                                   'untuk kolom Site, misalnya Sheet1!A1:H)'),
+    ('credentials_path', './google-sheets-api.json', 'file kredensial service account Google'),
+    ('raw_path', 'hasil/raw_fashion.jsonl', 'file JSON Lines hasil scraping untuk mode extract'),
+    # Laporan
+    ('report_path', 'hasil/run_report.json', 'laporan metrik run (JSON)'),
+    ('prometheus_path', 'hasil/etl_metrics.prom', 'metrik run format Prometheus'),
+    ('profile', False, 'menambahkan cProfile dan puncak memori (tracemalloc) ke laporan'),
+    ('profile_path', 'hasil/run.prof', 'file hasil cProfile'),
+)
+DEFAULTS = {name: default for name, default, _ in OPTIONS}
+
+MODES = ('batch', 'stream', 'extract')
+SINKS = ('mysql', 'csv', 'spreadsheet', 'parquet', 'history')
+ENV_PREFIX = 'ETL_'
+DEFAULT_CONFIG_PATH = 'etl_config.json'
+
+_TRUE = ('1', 'true', 'yes', 'on', 'ya')
+_FALSE = ('0', 'false', 'no', 'off', 'tidak')
+_AUTO = ('', 'auto', 'none')
+
+
+def _coerce(name, value):
+    """Mengubah nilai (misalnya string dari environment atau flag) ke tipe nilai bawaan `name`."""
+    default = DEFAULTS[name]
+    # Bawaan None berarti angka bulat opsional yang ditentukan otomatis (misalnya jumlah core CPU)
+    if default is None:
+        if value is None or (isinstance(value, str) and value.strip().lower() in _AUTO):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Nilai {name} harus int atau auto, bukan {value!r}") from None
+    if isinstance(default, bool):
+        if isinstance(value, str):
+            if value.strip().lower() in _TRUE:
+                return True
+            if value.strip().lower() in _FALSE:
+                return False
+            raise ValueError(f"Nilai {name} harus boolean, bukan {value!r}")
+        return bool(value)
+    if isinstance(default, tuple):
+        if isinstance(value, str):
+            value = value.split(',')
+        return tuple(item.strip() for item in value if item.strip())
+    if isinstance(default, (int, float)):
+        try:
+            return type(default)(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Nilai {name} harus {type(default).__name__}, bukan {value!r}") from None
+    return str(value)
+
+
+class PipelineConfig:
+    """Konfigurasi satu run pipeline: sumber, sink, konkurensi, dan mode (lihat OPTIONS).
+
+    Setiap pengaturan tersedia sebagai atribut, misalnya config.db_url atau config.sinks.
+    """
+
+    def __init__(self, **settings):
+        unknown = set(settings) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f"Pengaturan tidak dikenal: {', '.join(sorted(unknown))}")
+        for name, default in DEFAULTS.items():
+            setattr(self, name, _coerce(name, settings[name]) if name in settings else default)
+        self._validate()
+
+    def _validate(self):
+        if self.mode not in MODES:
+            raise ValueError(f"mode harus salah satu dari {', '.join(MODES)}, bukan {self.mode!r}")
+        unknown = [sink for sink in self.sinks if sink not in SINKS]
+        if unknown:
+            raise ValueError(f"Sink tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(SINKS)})")
+        if not self.currencies or (not self.rates_path and self.currencies != ('IDR',)):
+            raise ValueError("currencies selain IDR membutuhkan rates_path")
+        if self.max_workers < 1:
+            raise ValueError("max_workers minimal 1")
+        if self.parse_workers is not None and self.parse_workers < 0:
+            raise ValueError("parse_workers minimal 0 (0 = tanpa proses parser)")
+        if self.dedup_memory_mb <= 0:
+            raise ValueError("dedup_memory_mb harus lebih dari 0")
+
+    def replace(self, **settings):
+        """Salinan konfigurasi dengan sebagian pengaturan diganti."""
+        return PipelineConfig(**{**self.to_dict(), **settings})
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in DEFAULTS}
+
+    def __repr__(self):
+        return f"PipelineConfig({self.to_dict()!r})"
+
+
+def read_config_file(path):
+    """Membaca pengaturan dari file JSON, atau TOML jika berakhiran .toml (Python 3.11+)."""
+    if path.endswith('.toml'):
+        import tomllib
+
+        with open(path, 'rb') as file:
+            settings = tomllib.load(file)
+    else:
+        with open(path, encoding='utf-8') as file:
+            settings = json.load(file)
+    if not isinstance(settings, dict):
+        raise ValueError(f"File konfigurasi {path} harus berisi objek nama -> nilai")
+    return settings
+
+
+def env_settings(environ=None):
+    """Pengaturan dari environment variable ETL_<NAMA>, misalnya ETL_DB_URL atau ETL_SINKS=csv."""
+    environ = os.environ if environ is None else environ
+    return {name: environ[ENV_PREFIX + name.upper()] for name in DEFAULTS if ENV_PREFIX + name.upper() in environ}
+
+
+def load_config(path=None, environ=None, overrides=None):
+    """Memuat PipelineConfig dari nilai bawaan, file, environment, lalu `overrides` (misalnya flag CLI).
+
+    Tanpa `path`, dipakai file dari ETL_CONFIG atau etl_config.json di direktori kerja jika ada.
+    """
+    environ = os.environ if environ is None else environ
+    if path is None:
+        path = environ.get(ENV_PREFIX + 'CONFIG')
+        if path is None and os.path.exists(DEFAULT_CONFIG_PATH):
+            path = DEFAULT_CONFIG_PATH
+
+    settings = {}
+    if path is not None:
+        settings.update(read_config_file(path))
+    settings.update(env_settings(environ))
+    settings.update(overrides or {})
+    return PipelineConfig(**settings)
+
+
+def build_arg_parser():
+    """ArgumentParser dengan satu flag per pengaturan; flag yang tidak diberikan tidak menimpa file/env."""
+    parser = argparse.ArgumentParser(description="Pipeline ETL katalog fashion-studio.dicoding.dev")
+    parser.add_argument('--config', help=f"file konfigurasi JSON/TOML (bawaan: ${ENV_PREFIX}CONFIG atau "
+                                         f"{DEFAULT_CONFIG_PATH} jika ada)")
+    for name, default, help_text in OPTIONS:
+        flag = '--' + name.replace('_', '-')
+        if isinstance(default, bool):
+            parser.add_argument(flag, dest=name, action='store_const', const=True, default=argparse.SUPPRESS,
+                                help=f"{help_text} (bawaan: {'ya' if default else 'tidak'})")
+            # Flag --no-<nama> hanya berguna (dan ditampilkan) untuk pengaturan yang bawaannya aktif
+            parser.add_argument('--no-' + name.replace('_', '-'), dest=name, action='store_const', const=False,
+                                default=argparse.SUPPRESS,
+                                help=f"menonaktifkan {flag}" if default else argparse.SUPPRESS)
+        else:
+            shown = ','.join(default) if isinstance(default, tuple) else 'auto' if default is None else default
+            parser.add_argument(flag, dest=name, default=argparse.SUPPRESS, metavar=name.upper(),
+                                help=f"{help_text} (bawaan: {shown})")
+    return parser
+
+
+def parse_args(argv=None, environ=None):
+    """Membaca flag CLI lalu memuat PipelineConfig lengkap (bawaan < file < environment < flag)."""
+    args = vars(build_arg_parser().parse_args(argv))
+    path = args.pop('config', None)
+    return load_config(path, environ=environ, overrides=args)
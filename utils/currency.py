@@ -0,0 +1,225 @@
+import json
+import sqlite3
+import time
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+BASE_CURRENCY = 'USD'
+
+
+def _rate_frame(dates, rates):
+    """DataFrame kurs standar: kolom date (datetime64, hari) dan rate (float64), urut per tanggal."""
+    frame = pd.DataFrame({
+        'date': pd.to_datetime(pd.Series(dates, dtype=object), format='ISO8601').dt.normalize(),
+        'rate': pd.to_numeric(pd.Series(rates, dtype=object), errors='coerce').astype('float64'),
+    })
+    frame = frame.dropna().drop_duplicates(subset='date', keep='last')
+    return frame.sort_values('date', ignore_index=True)
+
+
+class StaticRateSource:
+    """Sumber kurs tetap tanpa riwayat, misalnya {'IDR': 16000}; berlaku untuk seluruh tanggal."""
+
+    def __init__(self, rates, date='1970-01-01'):
+        self.rates = dict(rates)
+        self.date = date
+
+    def load(self, currency):
+        if currency not in self.rates:
+            raise ValueError(f"Kurs {currency} tidak tersedia")
+        return _rate_frame([self.date], [self.rates[currency]])
+
+
+class FileRateSource:
+    """Sumber kurs historis dari file lokal: kurs satu BASE_CURRENCY dalam mata uang lain per tanggal.
+
+    CSV berisi kolom date, currency, rate; JSON berisi {mata_uang: {tanggal: kurs}}. Kurs suatu
+    tanggal berlaku sejak tanggal tersebut hingga tanggal berikutnya yang tercatat.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _read(self):
+        if self.path.endswith('.json'):
+            with open(self.path, encoding='utf-8') as file:
+                rates = json.load(file)
+            rows = [(date, currency, rate) for currency, series in rates.items() for date, rate in series.items()]
+            return pd.DataFrame(rows, columns=['date', 'currency', 'rate'])
+        return pd.read_csv(self.path, dtype={'currency': str})
+
+    def load(self, currency):
+        table = self._read()
+        rows = table[table['currency'].str.upper() == currency]
+        if rows.empty:
+            raise ValueError(f"Kurs {currency} tidak tersedia di {self.path}")
+        return _rate_frame(rows['date'].tolist(), rows['rate'].tolist())
+
+
+class RateProvider:
+    """Penyedia kurs dengan cache di disk (SQLite) dan di memori.
+
+    Riwayat kurs setiap mata uang dibaca dari `source` sekali lalu disimpan di cache; selama
+    belum lebih tua dari `ttl` detik, kurs diambil dari cache tanpa membaca sumbernya. Jika
+    sumber gagal, kurs lama di cache tetap dipakai. Cache dibatasi `max_rows` baris per mata uang;
+    jika lebih, kurs dengan tanggal paling lama mata uang itu dibuang dan cache-nya dianggap
+    kedaluwarsa, sehingga riwayat yang terpotong hanya dipakai jika sumbernya gagal dibaca.
+    """
+
+    def __init__(self, source, cache_path='rates_cache.sqlite', ttl=24 * 3600, max_rows=100_000):
+        self.source = source
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._memory = {}
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS rates (
+                    currency TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    rate REAL NOT NULL,
+                    PRIMARY KEY (currency, date)
+                );
+                CREATE TABLE IF NOT EXISTS fetches (
+                    currency TEXT PRIMARY KEY,
+                    fetched_at REAL NOT NULL
+                );
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.cache_path)
+
+    def _cached(self, currency):
+        """(fetched_at, DataFrame kurs) dari cache disk, atau (None, None) jika belum ada."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT fetched_at FROM fetches WHERE currency = ?", (currency,)).fetchone()
+            if row is None:
+                return None, None
+            rows = conn.execute("SELECT date, rate FROM rates WHERE currency = ? ORDER BY date", (currency,)).fetchall()
+        return row[0], _rate_frame([date for date, _ in rows], [rate for _, rate in rows])
+
+    def _store(self, currency, frame, fetched_at):
+        rows = [(currency, date.strftime('%Y-%m-%d'), rate) for date, rate in zip(frame['date'], frame['rate'])]
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM rates WHERE currency = ?", (currency,))
+            conn.executemany("INSERT INTO rates (currency, date, rate) VALUES (?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO fetches (currency, fetched_at) VALUES (?, ?)", (currency, fetched_at))
+        self.evict(currency)
+
+    def evict(self, currency):
+        """Membuang kurs `currency` dengan tanggal paling lama hingga tersisa paling banyak max_rows baris.
+
+        Cache mata uang yang dipotong ditandai kedaluwarsa agar run berikutnya membaca ulang
+        sumbernya alih-alih memakai riwayat yang tidak lengkap.
+        """
+        with closing(self._connect()) as conn, conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM rates WHERE currency = ?", (currency,)).fetchone()
+            if count > self.max_rows:
+                conn.execute(
+                    "DELETE FROM rates WHERE currency = ? AND date IN "
+                    "(SELECT date FROM rates WHERE currency = ? ORDER BY date LIMIT ?)",
+                    (currency, currency, count - self.max_rows),
+                )
+                conn.execute("UPDATE fetches SET fetched_at = 0 WHERE currency = ?", (currency,))
+
+    def rates(self, currency):
+        """Riwayat kurs `currency` sebagai DataFrame (date, rate), dari memori, cache disk, atau sumbernya."""
+        currency = currency.upper()
+        now = time.time()
+        fetched_at, frame = self._memory.get(currency, (None, None))
+        if fetched_at is None or now - fetched_at > self.ttl:
+            fetched_at, frame = self._cached(currency)
+        if fetched_at is None or now - fetched_at > self.ttl:
+            try:
+                frame = self.source.load(currency)
+                fetched_at = now
+                self._store(currency, frame, fetched_at)
+            except Exception as e:
+                if frame is None or frame.empty:
+                    raise
+                print(f"Gagal memperbarui kurs {currency}, memakai cache lama: {e}")
+        self._memory[currency] = (fetched_at, frame)
+        return frame
+
+
+class CurrencyConverter:
+    """Mengonversi harga BASE_CURRENCY ke beberapa mata uang sekaligus sesuai tanggal setiap baris.
+
+    Mata uang pertama mengisi kolom `column` (bawaan Price), sisanya kolom `<column>_<KODE>`,
+    misalnya Price_EUR. Kurs per baris dicari dengan satu merge_asof pada Timestamp terhadap
+    tabel kurs gabungan seluruh mata uang (kurs terakhir pada atau sebelum tanggal baris; baris
+    yang lebih awal dari riwayat memakai kurs paling awal).
+    """
+
+    def __init__(self, provider, currencies=('IDR',), column='Price'):
+        if not currencies:
+            raise ValueError("Minimal satu mata uang tujuan")
+        self.provider = provider
+        self.currencies = tuple(currency.upper() for currency in currencies)
+        self.column = column
+        self.columns = {
+            currency: column if index == 0 else f"{column}_{currency}"
+            for index, currency in enumerate(self.currencies)
+        }
+        self._table_key = None
+        self._table = None
+        # Riwayat kurs dimuat sekali di awal sehingga mata uang yang tidak tersedia langsung ketahuan
+        self.table()
+
+    def table(self):
+        """Tabel kurs gabungan: indeks tanggal, satu kolom per mata uang (kurs terakhir diteruskan)."""
+        frames = [self.provider.rates(currency) for currency in self.currencies]
+        key = tuple(id(frame) for frame in frames)
+        if key != self._table_key:
+            series = [frame.set_index('date')['rate'].rename(currency) for currency, frame in zip(self.currencies, frames)]
+            self._table = pd.concat(series, axis=1).sort_index().ffill().bfill()
+            self._table_key = key
+        return self._table
+
+    def rates_at(self, timestamps):
+        """Kurs setiap mata uang untuk setiap timestamp, sebagai dict mata uang -> array float64 (NaN jika NaT)."""
+        timestamps = pd.to_datetime(pd.Series(timestamps), errors='coerce', format='ISO8601')
+        table = self.table()
+        valid = timestamps.notna().to_numpy()
+        rates = {currency: np.full(len(timestamps), np.nan) for currency in self.currencies}
+        if not valid.any():
+            return rates
+
+        positions = np.flatnonzero(valid)
+        values = timestamps.to_numpy(dtype='datetime64[ns]')[positions]
+        order = np.argsort(values, kind='stable')
+        left = pd.DataFrame({'Timestamp': values[order]})
+        merged = pd.merge_asof(left, table, left_on='Timestamp', right_index=True, direction='backward')
+        for currency in self.currencies:
+            column = merged[currency].to_numpy(dtype='float64')
+            # Timestamp sebelum kurs pertama memakai kurs paling awal
+            column[np.isnan(column)] = table[currency].iloc[0]
+            rates[currency][positions[order]] = column
+        return rates
+
+    def convert(self, amounts, timestamps):
+        """Mengonversi array harga dalam BASE_CURRENCY; mengembalikan dict nama kolom -> array."""
+        amounts = np.asarray(amounts, dtype='float64')
+        rates = self.rates_at(timestamps)
+        return {self.columns[currency]: amounts * rates[currency] for currency in self.currencies}
+
+    def apply(self, data):
+        """DataFrame dengan kolom harga dikonversi dan kolom mata uang tambahan di sebelahnya."""
+        converted = self.convert(data[self.column].to_numpy(dtype='float64'), data['Timestamp'])
+        result = data.assign(**{self.column: converted.pop(self.column)})
+        position = result.columns.get_loc(self.column) + 1
+        for offset, (name, values) in enumerate(converted.items()):
+            result.insert(position + offset, name, values)
+        return result
+
+
+def exchange_rate_from_config(config):
+    """Kurs untuk transform_data dari PipelineConfig: angka tetap, atau CurrencyConverter jika rates_path diisi."""
+    if not config.rates_path:
+        return config.exchange_rate
+    provider = RateProvider(FileRateSource(config.rates_path), config.rates_cache_path, ttl=config.rates_ttl)
+    return CurrencyConverter(provider, config.currencies)
@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+
+# Ukuran satu hash baris di memori (uint64)
+HASH_BYTES = np.dtype(np.uint64).itemsize
+
+
+class RowHashSet:
+    """Himpunan hash baris uint64 dengan batas memori untuk deduplikasi katalog yang besar.
+
+    Hash disimpan sebagai array NumPy terurut (8 byte per baris, dicari dengan searchsorted)
+    hingga `max_memory` byte. Jika batas itu akan terlampaui, isi array dipindahkan ke tabel
+    SQLite berindeks di `path` (bawaan: file sementara yang dihapus saat close) dan array
+    dikosongkan, sehingga memori yang dipakai himpunan ini tidak pernah melebihi `max_memory`.
+    Hash yang sudah dipindahkan ke disk dicek lewat join dengan tabel sementara per batch.
+    """
+
+    def __init__(self, max_memory=64 * 2 ** 20, path=None):
+        if max_memory < HASH_BYTES:
+            raise ValueError(f"max_memory minimal {HASH_BYTES} byte")
+        self.max_memory = max_memory
+        self.capacity = max_memory // HASH_BYTES
+        self.path = path
+        self.spilled = 0
+        self._hashes = np.empty(0, dtype=np.uint64)
+        self._conn = None
+        self._temporary = False
+
+    @property
+    def memory_bytes(self):
+        """Byte yang dipakai hash di memori."""
+        return self._hashes.nbytes
+
+    def __len__(self):
+        return len(self._hashes) + self.spilled
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path is None:
+                descriptor, self.path = tempfile.mkstemp(prefix='dedup_', suffix='.sqlite')
+                os.close(descriptor)
+                self._temporary = True
+            self._conn = sqlite3.connect(self.path)
+            self._conn.executescript(
+                """
+                PRAGMA journal_mode = OFF;
+                PRAGMA synchronous = OFF;
+                DROP TABLE IF EXISTS hashes;
+                CREATE TABLE hashes (hash INTEGER PRIMARY KEY);
+                CREATE TEMP TABLE probe (hash INTEGER);
+                """
+            )
+        return self._conn
+
+    def _spill(self, hashes):
+        """Memindahkan `hashes` (unik dan belum pernah terlihat) ke SQLite."""
+        if not len(hashes):
+            return
+        # SQLite menyimpan INTEGER bertanda; hash uint64 disimpan lewat view int64
+        values = ((value,) for value in hashes.view(np.int64).tolist())
+        with self._connect() as conn:
+            conn.executemany("INSERT INTO hashes (hash) VALUES (?)", values)
+        self.spilled += len(hashes)
+
+    def _on_disk(self, hashes):
+        """Mask `hashes` yang sudah dipindahkan ke SQLite."""
+        if not self.spilled or not len(hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM probe")
+            conn.executemany("INSERT INTO probe (hash) VALUES (?)",
+                             ((value,) for value in hashes.view(np.int64).tolist()))
+            found = conn.execute("SELECT hash FROM probe JOIN hashes USING (hash)").fetchall()
+            conn.execute("DELETE FROM probe")
+        found = np.array([value for value, in found], dtype=np.int64).view(np.uint64)
+        return np.isin(hashes, found)
+
+    def add(self, hashes):
+        """Menambahkan hash baris; mengembalikan mask boolean baris yang belum pernah terlihat.
+
+        Hash yang muncul beberapa kali dalam `hashes` hanya dianggap baru pada kemunculan pertama.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        unique, first = np.unique(hashes, return_index=True)
+
+        position = np.searchsorted(self._hashes, unique)
+        in_memory = np.zeros(len(unique), dtype=bool)
+        found = position < len(self._hashes)
+        in_memory[found] = self._hashes[position[found]] == unique[found]
+        new = ~in_memory
+        new[new] = ~self._on_disk(unique[new])
+        unique = unique[new]
+
+        if len(self._hashes) + len(unique) > self.capacity:
+            self._spill(self._hashes)
+            self._hashes = np.empty(0, dtype=np.uint64)
+        if len(unique) > self.capacity:
+            self._spill(unique)
+        else:
+            merged = np.concatenate([self._hashes, unique])
+            merged.sort()
+            self._hashes = merged
+
+        fresh = np.zeros(len(hashes), dtype=bool)
+        fresh[first[new]] = True
+        return fresh
+
+    def close(self):
+        """Menutup koneksi SQLite dan menghapus file sementara."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,26 +1,372 @@
+import hashlib
+import importlib.util
+import os
+import sys
 import time
-import pandas as pd
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+from array import array
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+from utils.pagination import PaginationPlanner
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
     )
 }
-    
-def fetching_content(url):
-    """Mengambil konten HTML dari URL yang diberikan."""
-    session = requests.Session()
+
+INITIAL_URL = 'https://fashion-studio.dicoding.dev/'
+
+# Batas halaman yang dijadwalkan di depan halaman yang sedang dihasilkan iter_fashion_pages paralel
+MAX_PAGES_AHEAD = 64
+
+# Status HTTP yang layak dicoba ulang (rate limit dan kesalahan sisi server)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class Fetcher:
+    """Pengambil konten HTML dengan satu session keep-alive yang dipakai bersama antar request.
+
+    Jika `metrics` (utils.metrics.RunMetrics) diberikan, status HTTP dan ukuran setiap respons dicatat.
+    Dengan raise_errors=True, kegagalan request dilempar kembali alih-alih dikembalikan sebagai None,
+    sehingga halaman yang gagal tidak disangka sebagai akhir katalog.
+
+    Jika `limiter` (AdaptiveLimiter) diberikan, setiap request menunggu izin dari limiter dan hasilnya
+    (status, latensi, Retry-After) dilaporkan kembali. Respons 429/5xx kemudian dicoba ulang oleh
+    Fetcher sendiri, bukan oleh urllib3, agar limiter dapat melihatnya dan menurunkan laju.
+    """
+
+    def __init__(self, pool_size=10, max_retries=3, backoff_factor=0.5, timeout=10, cache=None, metrics=None,
+                 raise_errors=False, limiter=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.metrics = metrics
+        self.raise_errors = raise_errors
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=() if limiter is not None else RETRY_STATUS,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _record(self, response):
+        """Mencatat status dan ukuran respons ke metrics (utils.metrics.RunMetrics) jika ada."""
+        if self.metrics is None:
+            return
+        if response is None:
+            self.metrics.record_response(None)
+        else:
+            self.metrics.record_response(response.status_code, len(response.content or b''))
+
+    def _send(self, url, headers=None):
+        """Mengirim GET (melalui limiter jika ada) dan mencatat setiap respons ke metrics."""
+        options = {'headers': headers} if headers else {}
+        if self.limiter is None:
+            response = self.session.get(url, **options, timeout=self.timeout)
+            self._record(response)
+            return response
+
+        for attempt in range(self.max_retries + 1):
+            with self.limiter.request(url) as feedback:
+                response = self.session.get(url, **options, timeout=self.timeout)
+                feedback.update(response.status_code, response.headers.get('Retry-After'))
+            self._record(response)
+            if response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                return response
+            print(f"Server membalas {response.status_code} untuk {url}, mencoba ulang sesuai limiter")
+        return response
+
+    def get(self, url):
+        """Mengambil konten HTML dari URL, mengembalikan None jika gagal."""
+        try:
+            response = self._send(url)
+            response.raise_for_status()
+            return response.content
+        except requests.exceptions.RequestException as e:
+            if e.response is None:
+                self._record(None)
+            print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
+            if self.raise_errors:
+                raise
+            return None
+
+    def fetch(self, url):
+        """Mengambil konten beserta status perubahannya dalam bentuk (content, changed).
+
+        Jika fetcher memiliki cache (utils.cache.PageCache), request dikirim sebagai conditional
+        GET dengan If-None-Match/If-Modified-Since. Respons 304 atau konten dengan hash yang
+        sama seperti run sebelumnya dianggap tidak berubah.
+        """
+        if self.cache is None:
+            content = self.get(url)
+            return content, content is not None
+
+        entry = self.cache.get(url)
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = self._send(url, headers)
+            if response.status_code == 304 and entry:
+                return entry["content"], False
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if e.response is None:
+                self._record(None)
+            print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
+            if self.raise_errors:
+                raise
+            return None, False
+
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        changed = entry is None or entry["content_hash"] != content_hash
+        self.cache.put(
+            url,
+            content,
+            content_hash,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return content, changed
+
+    def close(self):
+        """Menutup session beserta connection pool-nya."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class RateLimiter:
+    """Membatasi jumlah requests per detik secara global, aman dipakai oleh banyak thread."""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Menunggu hingga slot request berikutnya tersedia."""
+        if not self.interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+
+def _retry_after_seconds(value):
+    """Mengubah header Retry-After (detik atau tanggal HTTP) menjadi jumlah detik, atau None."""
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
     try:
-        response = session.get(url, headers=HEADERS)
-        response.raise_for_status()
-        return response.content
-    except requests.exceptions.RequestException as e:
-        print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
         return None
+
+
+class _HostState:
+    """Status limiter untuk satu host."""
+
+    def __init__(self, rate, concurrency):
+        self.rate = rate
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.next_slot = 0.0
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.latency = None
+        self.best_latency = None
+        self.slow_start = True
+
+
+class _Feedback:
+    """Hasil satu request yang dilaporkan ke AdaptiveLimiter oleh pemanggil."""
+
+    def __init__(self):
+        self.status = None
+        self.retry_after = None
+
+    def update(self, status, retry_after=None):
+        self.status = status
+        self.retry_after = retry_after
+
+
+class AdaptiveLimiter:
+    """Penjadwal request per host dengan kontrol laju dan konkurensi AIMD, aman dipakai banyak thread.
+
+    Setiap host dimulai dari `initial_rate` request per detik dalam fase slow start: setiap respons
+    sukses menambah laju 1 request/detik dan konkurensi 1 (kira-kira berlipat ganda tiap detik).
+    Setelah sinyal kongesti pertama, kenaikan menjadi aditif (sekitar `increase` request/detik per
+    detik trafik, konkurensi 1/konkurensi per respons), hingga batas per host `max_rate`/`max_concurrency` (dapat ditimpa per host lewat
+    `host_limits={host: (max_rate, max_concurrency)}`). Respons 429/503, kegagalan koneksi, atau
+    latensi rata-rata di atas target memotong laju dan konkurensi dengan faktor `decrease`, paling
+    banyak sekali per jendela latensi. Header Retry-After menahan seluruh request ke host tersebut
+    hingga waktunya lewat.
+
+    `latency_target` (detik) bawaan None berarti max(3 x latensi tercepat yang teramati, 0.25 detik).
+    """
+
+    CONGESTION_STATUS = (429, 503)
+
+    def __init__(self, initial_rate=2.0, min_rate=0.2, max_rate=20.0, max_concurrency=8, increase=1.0,
+                 decrease=0.5, latency_target=None, host_limits=None, max_retry_after=300.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.host_limits = host_limits or {}
+        self.max_retry_after = max_retry_after
+        self._condition = threading.Condition()
+        self._hosts = {}
+
+    def _limits(self, host):
+        return self.host_limits.get(host, (self.max_rate, self.max_concurrency))
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            max_rate, _ = self._limits(host)
+            state = self._hosts[host] = _HostState(min(self.initial_rate, max_rate), 1.0)
+        return state
+
+    def acquire(self, url):
+        """Menunggu hingga host dari `url` mengizinkan satu request lagi (slot konkurensi dan laju)."""
+        host = urlsplit(url).netloc
+        with self._condition:
+            while True:
+                state = self._state(host)
+                now = time.monotonic()
+                if state.in_flight < int(state.concurrency) and state.blocked_until <= now:
+                    slot = max(now, state.next_slot)
+                    state.next_slot = slot + 1.0 / state.rate
+                    state.in_flight += 1
+                    break
+                wait = state.blocked_until - now if state.blocked_until > now else None
+                self._condition.wait(wait)
+
+        if slot > now:
+            time.sleep(slot - now)
+        return host
+
+    def release(self, host, status=None, latency=None, retry_after=None):
+        """Melaporkan hasil request ke host: status HTTP (None jika gagal), latensi, dan Retry-After."""
+        with self._condition:
+            state = self._state(host)
+            state.in_flight -= 1
+            now = time.monotonic()
+
+            if latency is not None:
+                state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+                state.best_latency = latency if state.best_latency is None else min(state.best_latency, latency)
+
+            delay = _retry_after_seconds(retry_after)
+            if delay is not None:
+                state.blocked_until = max(state.blocked_until, now + min(delay, self.max_retry_after))
+
+            target = self.latency_target
+            if target is None and state.best_latency is not None:
+                target = max(3 * state.best_latency, 0.25)
+            congested = (
+                status is None
+                or status in self.CONGESTION_STATUS
+                or (target is not None and state.latency is not None and state.latency > target)
+            )
+
+            max_rate, max_concurrency = self._limits(host)
+            if congested:
+                # Penurunan hanya sekali per jendela agar satu ledakan error tidak memotong laju berkali-kali
+                window = max(state.latency or 0.0, 1.0 / state.rate)
+                if now - state.last_decrease >= window:
+                    state.rate = max(state.rate * self.decrease, self.min_rate)
+                    state.concurrency = max(state.concurrency * self.decrease, 1.0)
+                    state.last_decrease = now
+                state.slow_start = False
+            elif status is not None and status < 400:
+                if state.slow_start:
+                    state.rate = min(state.rate + 1.0, max_rate)
+                    state.concurrency = min(state.concurrency + 1.0, max_concurrency)
+                else:
+                    state.rate = min(state.rate + self.increase / state.rate, max_rate)
+                    state.concurrency = min(state.concurrency + 1.0 / state.concurrency, max_concurrency)
+
+            self._condition.notify_all()
+
+    @contextmanager
+    def request(self, url):
+        """Context manager acquire/release; isi status dan Retry-After lewat objek yang dihasilkan."""
+        host = self.acquire(url)
+        feedback = _Feedback()
+        started = time.monotonic()
+        try:
+            yield feedback
+        finally:
+            latency = time.monotonic() - started if feedback.status is not None else None
+            self.release(host, feedback.status, latency, feedback.retry_after)
+
+    def stats(self, host=None):
+        """Laju, konkurensi, dan latensi terkini per host (atau satu host) dalam bentuk dict."""
+        with self._condition:
+            hosts = {name: state for name, state in self._hosts.items() if host is None or name == host}
+            return {
+                name: {
+                    "rate": state.rate,
+                    "concurrency": int(state.concurrency),
+                    "latency": state.latency,
+                    "blocked_for": max(state.blocked_until - time.monotonic(), 0.0),
+                }
+                for name, state in hosts.items()
+            }
+
+def fetching_content(url, fetcher=None):
+    """Mengambil konten HTML dari URL yang diberikan.
+
+    Gunakan `fetcher` yang sama untuk banyak URL agar koneksi dipakai ulang; tanpa
+    fetcher, session sementara dibuat lalu langsung ditutup.
+    """
+    if fetcher is not None:
+        return fetcher.get(url)
+
+    with Fetcher() as own_fetcher:
+        return own_fetcher.get(url)
  
  
 def extract_fashion_data(article):
@@ -56,40 +402,366 @@ def extract_fashion_data(article):
         return None
 
 
-def clean_data(fashion_data):
-    """Membersihkan data fashion dengan menghapus nilai yang tidak valid."""
-    try:
-        dirty_patterns = {
-            "Title": ["Unknown Product"],
-            "Rating": ["⭐ Invalid Rating / 5", "Not Rated"],
-            "Price": ["Price Unavailable", None]
+class FashionColumns:
+    """Penampung data fashion berorientasi kolom sebagai pengganti list of dict.
+
+    Title dan Price disimpan sebagai list string, Rating/Colors/Timestamp sebagai list string
+    yang di-intern (nilai yang sama memakai satu objek), sedangkan Size dan Gender disimpan
+    sebagai kode array('H') beserta daftar kategorinya.
+
+    Kolom Site (nama situs dari utils.sites) hanya ada jika datanya memuat Site; disimpan sebagai
+    kategori seperti Size dan Gender. Daftar kolom yang ada tersedia di `fields`.
+    """
+
+    FIELDS = ("Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp")
+    INTERNED_FIELDS = ("Rating", "Colors", "Timestamp")
+    CATEGORY_FIELDS = ("Size", "Gender")
+    SITE_FIELD = "Site"
+
+    __slots__ = ("values", "codes", "categories", "_lookup")
+
+    def __init__(self):
+        self.values = {field: [] for field in self.FIELDS if field not in self.CATEGORY_FIELDS}
+        self.codes = {field: array('H') for field in self.CATEGORY_FIELDS}
+        self.categories = {field: [] for field in self.CATEGORY_FIELDS}
+        self._lookup = {field: {} for field in self.CATEGORY_FIELDS}
+
+    @property
+    def fields(self):
+        """Kolom yang ada: FIELDS, ditambah Site jika ada."""
+        return self.FIELDS + ((self.SITE_FIELD,) if self.SITE_FIELD in self.codes else ())
+
+    def _add_site(self, rows):
+        """Menyiapkan kolom Site; `rows` baris yang sudah ada diisi None."""
+        self.codes[self.SITE_FIELD] = array('H', [0] * rows)
+        self.categories[self.SITE_FIELD] = [None] if rows else []
+        self._lookup[self.SITE_FIELD] = {None: 0} if rows else {}
+
+    def append(self, fashion):
+        """Menambahkan satu data fashion (dict) ke setiap kolom."""
+        if self.SITE_FIELD in fashion and self.SITE_FIELD not in self.codes:
+            self._add_site(len(self))
+        for field, column in self.values.items():
+            value = fashion[field]
+            if field in self.INTERNED_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            column.append(value)
+
+        for field in self.codes:
+            value = fashion.get(field)
+            lookup = self._lookup[field]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self.categories[field])
+                self.categories[field].append(value)
+            self.codes[field].append(code)
+
+    def extend(self, fashions):
+        """Menambahkan banyak data fashion sekaligus; FashionColumns lain digabung per kolom."""
+        if isinstance(fashions, FashionColumns):
+            self._extend_columns(fashions)
+            return
+        for fashion in fashions:
+            self.append(fashion)
+
+    def _extend_columns(self, other):
+        """Menggabungkan kolom FashionColumns lain dengan memetakan ulang kode kategorinya."""
+        rows = len(self)
+        if self.SITE_FIELD in other.codes and self.SITE_FIELD not in self.codes:
+            self._add_site(rows)
+        for field, column in self.values.items():
+            if field in self.INTERNED_FIELDS:
+                column.extend(sys.intern(value) if isinstance(value, str) else value for value in other.values[field])
+            else:
+                column.extend(other.values[field])
+
+        for field in self.codes:
+            if field not in other.codes:
+                # Data tanpa Site digabung ke data dengan Site: Site diisi None
+                self._extend_missing(field, len(other))
+                continue
+            lookup = self._lookup[field]
+            mapping = []
+            for value in other.categories[field]:
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(self.categories[field])
+                    self.categories[field].append(value)
+                mapping.append(code)
+            self.codes[field].extend(mapping[code] for code in other.codes[field])
+
+    def _extend_missing(self, field, rows):
+        lookup = self._lookup[field]
+        code = lookup.get(None)
+        if code is None:
+            code = lookup[None] = len(self.categories[field])
+            self.categories[field].append(None)
+        self.codes[field].extend([code] * rows)
+
+    def __len__(self):
+        return len(self.values["Title"])
+
+    def __iter__(self):
+        """Menghasilkan setiap baris sebagai dict, sehingga dapat dipakai seperti list of dict."""
+        fields = self.fields
+        columns = [
+            [self.categories[field][code] for code in self.codes[field]] if field in self.codes else self.values[field]
+            for field in fields
+        ]
+        for row in zip(*columns):
+            yield dict(zip(fields, row))
+
+    def __getstate__(self):
+        return self.values, self.codes, self.categories
+
+    def __setstate__(self, state):
+        self.values, self.codes, self.categories = state
+        self._lookup = {
+            field: {value: code for code, value in enumerate(categories)}
+            for field, categories in self.categories.items()
         }
 
-        for column, invalid_values in dirty_patterns.items():
-            if fashion_data.get(column) in invalid_values:
-                return None
-        
-        return fashion_data
+
+def _parse_page_columns(content, parser):
+    """Dijalankan di proses worker ParsePool: parsing satu halaman menjadi (FashionColumns, has_next)."""
+    records, has_next = parse_page(content, parser)
+    columns = FashionColumns()
+    columns.extend(records)
+    return columns, has_next
+
+
+class ParsePool:
+    """Pool proses untuk parsing halaman di luar GIL proses utama.
+
+    Konten mentah halaman dikirim ke worker yang mem-parsing lalu mengembalikan FashionColumns
+    (lebih ringkas untuk dikirim antar proses dibanding list of dict). Data tidak divalidasi di
+    worker; validasi dilakukan per batch oleh utils.validate. Jumlah worker bawaan sama dengan
+    jumlah core CPU.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, content, parser='html.parser'):
+        """Mengirim satu halaman ke proses worker, mengembalikan Future berisi (FashionColumns, has_next)."""
+        return self._executor.submit(_parse_page_columns, content, parser)
+
+    def parse(self, content, parser='html.parser'):
+        """Mem-parsing satu halaman di proses worker, mengembalikan (FashionColumns, has_next)."""
+        return self.submit(content, parser).result()
+
+    def close(self):
+        """Menghentikan seluruh proses worker."""
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def parse_page(content, parser='html.parser'):
+    """Mem-parsing satu halaman HTML menjadi list data fashion dan status tombol next.
+
+    Data dikembalikan apa adanya (termasuk penanda seperti "Unknown Product"); validasi dan
+    quarantine dilakukan per batch oleh utils.validate saat transformasi.
+
+    `parser` memilih backend: 'html.parser' (BeautifulSoup, bawaan), 'lxml', 'selectolax',
+    atau 'auto' untuk backend tercepat yang terpasang. `parser` juga boleh berupa callable
+    content -> (data, has_next), misalnya utils.sites.SiteExtractor untuk katalog lain.
+    """
+    if callable(parser):
+        return parser(content)
+    if parser == 'auto':
+        parser = available_parsers()[0]
+    if parser not in PARSERS:
+        raise ValueError(f"Parser tidak dikenal: {parser}")
+    return PARSERS[parser](content)
+
+
+def _parse_page_bs4(content):
+    """Backend BeautifulSoup dengan "html.parser", memakai extract_fashion_data per produk."""
+    data = []
+    soup = BeautifulSoup(content, "html.parser")
+    articles_element = soup.find_all('div', class_='product-details')
+    for article in articles_element:
+        fashion = extract_fashion_data(article)
+        if fashion:
+            data.append(fashion)
+
+    next_button = soup.find('li', class_='page-item next')
+    return data, next_button is not None
+
+
+# Penanda teks pada elemen <p> dan cara mengambil nilainya, sama seperti extract_fashion_data
+FIELD_PROBES = (
+    ("Rating", 'Rating:', lambda text: text.split(': ')[1]),
+    ("Colors", 'Colors', lambda text: text.split(' ')[0]),
+    ("Size", 'Size:', lambda text: text.split(': ')[1]),
+    ("Gender", 'Gender:', lambda text: text.split(': ')[1]),
+)
+
+
+def _match_paragraph(found, text):
+    """Mencatat teks <p> untuk setiap field yang penandanya cocok dan belum ditemukan."""
+    for field, marker, _ in FIELD_PROBES:
+        if field not in found and marker in text:
+            found[field] = text
+
+
+def _build_fashion(title, price, found, timestamp):
+    """Menyusun dict data fashion dari hasil satu kali penelusuran elemen sebuah produk."""
+    try:
+        if title is None or price is None or len(found) < len(FIELD_PROBES):
+            raise AttributeError("elemen data produk tidak lengkap")
+
+        fashions = {"Title": title, "Price": price}
+        for field, _, parse in FIELD_PROBES:
+            fashions[field] = parse(found[field])
+        fashions["Timestamp"] = timestamp
+
+        return fashions
+
+    except AttributeError as e:
+        print(f"Kesalahan saat mengekstrak data: {e}")
+        return None
 
     except Exception as e:
-        print(f"Kesalahan saat membersihkan data: {e}")
-        return None 
+        print(f"Terjadi Kesalahan: {e}")
+        return None
 
-def scrape_fashion(base_url, start_page=2, delay=2):
-    """Fungsi utama untuk mengambil keseluruhan data, mulai dari requests hingga menyimpannya dalam variabel data."""
+
+def _decode(content):
+    """Mengubah konten bytes menjadi str untuk backend parser cepat."""
+    if isinstance(content, bytes):
+        try:
+            return content.decode('utf-8')
+        except UnicodeDecodeError:
+            return content.decode('latin-1')
+    return content
+
+
+def _parse_page_lxml(content):
+    """Backend lxml: seluruh field sebuah produk diambil dalam satu kali penelusuran elemen."""
+    from lxml import etree, html as lxml_html
+
+    root = lxml_html.document_fromstring(_decode(content))
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     data = []
 
-    initial_url = 'https://fashion-studio.dicoding.dev/'
-    print(f"Scraping halaman awal: {initial_url}")
-    content = fetching_content(initial_url)
-    if content:
-        soup = BeautifulSoup(content, "html.parser")
-        articles_element = soup.find_all('div', class_='product-details')
-        for article in articles_element:
-          fashion = extract_fashion_data(article)
-          cleaned_fashion = clean_data(fashion)
-          if cleaned_fashion:
-              data.append(cleaned_fashion)
+    for article in root.iter('div'):
+        if 'product-details' not in (article.get('class') or '').split():
+            continue
+
+        title = price = None
+        found = {}
+        for element in article.iter(etree.Element):
+            if element is article:
+                continue
+            if title is None and element.tag == 'h3':
+                title = element.text_content()
+            if price is None and 'price' in (element.get('class') or '').split():
+                price = element.text_content()
+            # Sama seperti string=... pada BeautifulSoup: hanya <p> yang berisi teks saja
+            if element.tag == 'p' and len(element) == 0 and element.text:
+                _match_paragraph(found, element.text)
+
+        fashion = _build_fashion(title, price, found, timestamp)
+        if fashion:
+            data.append(fashion)
+
+    has_next = any(
+        {'page-item', 'next'} <= set((li.get('class') or '').split())
+        for li in root.iter('li')
+    )
+    return data, has_next
+
+
+def _parse_page_selectolax(content):
+    """Backend selectolax (lexbor): penelusuran satu kali per produk seperti backend lxml."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(_decode(content))
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    data = []
+
+    for article in tree.css('div.product-details'):
+        title = price = None
+        found = {}
+        for node in article.traverse():
+            if node == article:
+                continue
+            if title is None and node.tag == 'h3':
+                title = node.text()
+            if price is None and 'price' in (node.attributes.get('class') or '').split():
+                price = node.text()
+            if node.tag == 'p':
+                child = node.child
+                if child is not None and child.tag == '-text' and child.next is None:
+                    _match_paragraph(found, child.text_content)
+
+        fashion = _build_fashion(title, price, found, timestamp)
+        if fashion:
+            data.append(fashion)
+
+    has_next = tree.css_first('li.page-item.next') is not None
+    return data, has_next
+
+
+PARSERS = {
+    'html.parser': _parse_page_bs4,
+    'lxml': _parse_page_lxml,
+    'selectolax': _parse_page_selectolax,
+}
+
+
+def available_parsers():
+    """Daftar backend parser yang dapat dipakai, diurutkan dari yang tercepat."""
+    modules = {'selectolax': 'selectolax', 'lxml': 'lxml'}
+    fast = [name for name, module in modules.items() if importlib.util.find_spec(module)]
+    return fast + ['html.parser']
+
+
+def iter_fashion_pages(base_url, start_page=2, delay=2, max_workers=1, requests_per_second=None, fetcher=None,
+                       parser='html.parser', incremental=False, initial_url=INITIAL_URL, parse_pool=None):
+    """Generator yang menghasilkan (nomor_halaman, list data fashion) satu per satu halaman.
+
+    Halaman awal bernomor 1. Halaman berikutnya baru diambil ketika generator dilanjutkan,
+    sehingga data halaman pertama dapat diproses sebelum seluruh katalog selesai diunduh.
+
+    Dengan incremental=True dan fetcher yang memiliki cache, halaman yang tidak berubah sejak
+    run sebelumnya tidak di-parsing ulang dan tidak dihasilkan; pagination tetap diikuti
+    memakai status tombol next yang tersimpan di cache. `initial_url` adalah URL halaman awal
+    (bawaan: katalog fashion-studio), misalnya untuk server lokal pada benchmark; dengan
+    initial_url=None halaman awal dilewati, misalnya saat melanjutkan run dari start_page tertentu.
+
+    Dengan `parse_pool` (ParsePool), parsing dilakukan di proses worker dan setiap halaman
+    dihasilkan sebagai FashionColumns. Parsing baru berjalan paralel jika max_workers > 1,
+    karena setiap thread pengambil halaman menunggu hasil parsing halamannya sendiri.
+
+    Jika fetcher memakai AdaptiveLimiter, jeda tetap `delay` tidak dipakai; laju dan konkurensi
+    diatur limiter berdasarkan respons server (max_workers menjadi batas atas jendela).
+    """
+    if fetcher is None:
+        with Fetcher(pool_size=max(max_workers, 10)) as own_fetcher:
+            yield from iter_fashion_pages(base_url, start_page, delay, max_workers, requests_per_second, own_fetcher,
+                                          parser, incremental, initial_url, parse_pool)
+        return
+
+    if max_workers > 1:
+        yield from _iter_pages_concurrent(base_url, start_page, max_workers, requests_per_second, fetcher, parser,
+                                          incremental, initial_url, parse_pool)
+        return
+
+    if initial_url is not None:
+        print(f"Scraping halaman awal: {initial_url}")
+        content, changed = _fetch_page(initial_url, fetcher, incremental)
+        if content:
+            records, _ = _parse_changed_page(initial_url, content, changed, fetcher, parser, incremental, parse_pool)
+            if records is not None:
+                yield 1, records
 
     page_number = start_page
  
@@ -97,24 +769,127 @@ def scrape_fashion(base_url, start_page=2, delay=2):
         url = base_url.format(page_number)
         print(f"Scraping halaman: {url}")
  
-        content = fetching_content(url)
+        content, changed = _fetch_page(url, fetcher, incremental)
         if content:
-            soup = BeautifulSoup(content, "html.parser")
-            articles_element = soup.find_all('div', class_='product-details')
-            for article in articles_element:
-              fashion = extract_fashion_data(article)
-              cleaned_fashion = clean_data(fashion)
-              if cleaned_fashion:
-                  data.append(cleaned_fashion)
+            records, has_next = _parse_changed_page(url, content, changed, fetcher, parser, incremental, parse_pool)
+            if records is not None:
+                yield page_number, records
  
-            next_button = soup.find('li', class_='page-item next')
-            if next_button:
+            if has_next:
                 page_number += 1
-                time.sleep(delay)
+                # Fetcher dengan AdaptiveLimiter sudah mengatur jeda sendiri
+                if not isinstance(getattr(fetcher, 'limiter', None), AdaptiveLimiter):
+                    time.sleep(delay)
             else:
                 break
         else:
             break
+
+
+def _fetch_page(url, fetcher, incremental):
+    """Mengambil konten halaman dalam bentuk (content, changed)."""
+    if incremental:
+        return fetcher.fetch(url)
+
+    content = fetching_content(url, fetcher)
+    return content, True
+
+
+def _parse_changed_page(url, content, changed, fetcher, parser, incremental, parse_pool=None):
+    """Mem-parsing halaman yang berubah; halaman tanpa perubahan menghasilkan (None, has_next dari cache)."""
+    cache = fetcher.cache if incremental else None
+    if not changed and cache is not None:
+        entry = cache.get(url)
+        if entry and entry["has_next"] is not None:
+            return None, entry["has_next"]
+
+    if parse_pool is not None:
+        records, has_next = parse_pool.parse(content, parser)
+    else:
+        records, has_next = parse_page(content, parser)
+    if cache is not None:
+        cache.set_has_next(url, has_next)
+    return records, has_next
+
+
+def _iter_pages_concurrent(base_url, start_page, max_workers, requests_per_second, fetcher, parser='html.parser',
+                           incremental=False, initial_url=INITIAL_URL, parse_pool=None):
+    """Versi paralel dari iter_fashion_pages yang menjadwalkan halaman dengan PaginationPlanner.
+
+    Nomor halaman terakhir dibaca dari widget pagination setiap halaman (dimulai dari halaman
+    awal), sehingga seluruh halaman hingga nomor itu langsung dijadwalkan tanpa menunggu tombol
+    next halaman sebelumnya; paling banyak max_workers request berjalan bersamaan. Di luar nomor
+    tersebut, halaman diperiksa spekulatif dalam jendela max_workers halaman. Begitu ditemukan
+    halaman tanpa tombol next (atau halaman gagal diambil), halaman yang belum berjalan
+    dibatalkan, sehingga katalog yang memendek maupun bertambah tetap diikuti dengan benar.
+
+    Dengan parse_pool, setiap thread langsung mengirim kontennya ke proses worker sehingga
+    parsing beberapa halaman berjalan bersamaan; hasilnya tetap dihasilkan sesuai urutan halaman.
+    """
+    limiter = RateLimiter(requests_per_second)
+    planner = PaginationPlanner(start_page, window=max_workers, max_ahead=MAX_PAGES_AHEAD)
+
+    def fetch(url):
+        limiter.wait()
+        print(f"Scraping halaman: {url}")
+        content, changed = _fetch_page(url, fetcher, incremental)
+        parsed = None
+        if parse_pool is not None and content:
+            parsed = _parse_changed_page(url, content, changed, fetcher, parser, incremental, parse_pool)
+        return url, (content, changed), parsed
+
+    pending = deque()
+
+    def schedule():
+        for number in planner.schedule():
+            pending.append((number, executor.submit(fetch, base_url.format(number))))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            if initial_url is not None:
+                pending.append((1, executor.submit(fetch, initial_url)))
+            schedule()
+
+            while pending:
+                current_page, future = pending.popleft()
+                url, (content, changed), parsed = future.result()
+                has_next = False
+                if content:
+                    records, has_next = parsed or _parse_changed_page(url, content, changed, fetcher, parser,
+                                                                      incremental)
+                    if records is not None:
+                        yield current_page, records
+
+                # Tombol next pada halaman awal tidak menentukan akhir pagination
+                planner.observe(current_page, has_next, content)
+                if planner.finished(current_page):
+                    break
+                schedule()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def scrape_fashion(base_url, start_page=2, delay=2, max_workers=1, requests_per_second=None, fetcher=None,
+                   parser='html.parser', incremental=False, columnar=False, initial_url=INITIAL_URL, parse_pool=None):
+    """Fungsi utama untuk mengambil keseluruhan data, mulai dari requests hingga menyimpannya dalam variabel data.
+
+    Jika max_workers lebih dari 1, halaman diambil secara paralel dan jeda tetap `delay`
+    diganti dengan batas global `requests_per_second`; hasil tetap berurutan sesuai nomor halaman. Jika `fetcher` tidak diberikan,
+    fetcher milik fungsi ini dibuat dan ditutup di akhir scraping. `parser` memilih backend
+    parsing HTML (lihat parse_page). Dengan incremental=True hanya produk dari halaman yang
+    berubah yang dikembalikan (lihat iter_fashion_pages). Dengan columnar=True hasilnya berupa
+    FashionColumns yang jauh lebih hemat memori dibanding list of dict. `parse_pool` (ParsePool)
+    memindahkan parsing ke proses worker (lihat iter_fashion_pages).
+
+    Data dikembalikan mentah tanpa validasi: baris seperti "Unknown Product" atau harga
+    "Price Unavailable" ikut dikembalikan dan baru ditolak oleh utils.validate saat transformasi
+    (transform_data, transform_batches, atau TransformEngine).
+    """
+    data = FashionColumns() if columnar else []
+    pages = iter_fashion_pages(base_url, start_page, delay, max_workers, requests_per_second, fetcher, parser,
+                               incremental, initial_url, parse_pool)
+    for _, records in pages:
+        data.extend(records)
  
     return data
- 
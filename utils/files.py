@@ -0,0 +1,138 @@
+import glob
+import os
+import uuid
+from datetime import date, datetime
+
+import pandas as pd
+
+FORMATS = {
+    'parquet': '.parquet',
+    'feather': '.arrow',
+}
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Format Parquet/Arrow membutuhkan paket pyarrow (pip install pyarrow)") from e
+
+
+def _require_zstandard():
+    try:
+        import zstandard  # noqa: F401
+    except ImportError as e:
+        raise ImportError("CSV terkompresi zstd (.zst) membutuhkan paket zstandard (pip install zstandard)") from e
+
+
+def _partition_path(base_dir, fmt, run_date=None):
+    """Membuat path file baru di dalam partisi run_date=YYYY-MM-DD."""
+    run_date = run_date or date.today()
+    if isinstance(run_date, (date, datetime)):
+        run_date = run_date.strftime("%Y-%m-%d")
+
+    folder = os.path.join(base_dir, f"run_date={run_date}")
+    os.makedirs(folder, exist_ok=True)
+    name = f"part-{datetime.now().strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}{FORMATS[fmt]}"
+    return os.path.join(folder, name)
+
+
+def store_to_parquet(data, base_dir='hasil/fashion_parquet', run_date=None, compression='zstd', raise_errors=False):
+    """Fungsi untuk menyimpan data ke file Parquet terkompresi, dipartisi per tanggal run.
+
+    Setiap pemanggilan menulis file baru sehingga riwayat run sebelumnya tidak tertimpa.
+    Mengembalikan path file yang ditulis, atau None jika gagal.
+    """
+    try:
+        _require_pyarrow()
+        path = _partition_path(base_dir, 'parquet', run_date)
+        data.to_parquet(path, engine='pyarrow', compression=compression, index=False)
+        print(f"Data berhasil ditambahkan Ke format Parquet: {path}")
+        return path
+
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+        return None
+
+
+def store_to_feather(data, base_dir='hasil/fashion_arrow', run_date=None, compression='zstd', raise_errors=False):
+    """Fungsi untuk menyimpan data ke file Feather v2 (Arrow IPC) terkompresi, dipartisi per tanggal run.
+
+    Gunakan compression='uncompressed' agar read_history dapat membacanya zero-copy lewat
+    memory-map. Mengembalikan path file yang ditulis, atau None jika gagal.
+    """
+    try:
+        _require_pyarrow()
+        path = _partition_path(base_dir, 'feather', run_date)
+        data.reset_index(drop=True).to_feather(path, compression=compression)
+        print(f"Data berhasil ditambahkan Ke format Arrow: {path}")
+        return path
+
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+        return None
+
+
+def append_to_csv(data, filename='fashion_data.csv.gz', compression='infer', raise_errors=False):
+    """Fungsi untuk menambahkan data ke file CSV terkompresi (gzip atau zstd) tanpa menimpa isi lama.
+
+    Kompresi ditentukan dari ekstensi (.gz, .zst) kecuali diberikan. Header hanya ditulis
+    ketika file belum ada. Setiap pemanggilan menambah satu member/frame baru ke file.
+    Kompresi zstd membutuhkan paket zstandard.
+    """
+    try:
+        method = compression.get('method') if isinstance(compression, dict) else compression
+        if method == 'zstd' or (method == 'infer' and str(filename).endswith('.zst')):
+            _require_zstandard()
+        exists = os.path.exists(filename) and os.path.getsize(filename) > 0
+        data.to_csv(filename, mode='a', header=not exists, index=False, compression=compression)
+        print("Data berhasil ditambahkan Ke format CSV terkompresi!")
+        return filename
+
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+        return None
+
+
+def read_history(base_dir, fmt='parquet', columns=None, run_dates=None):
+    """Membaca seluruh riwayat hasil run dari folder partisi sebagai satu DataFrame.
+
+    Parquet dibaca secara kolumnar (hanya `columns` yang diminta) lewat pyarrow.dataset,
+    sedangkan Arrow IPC dibaca dengan memory-map tanpa parsing teks. Kolom run_date berasal
+    dari nama partisi; `run_dates` membatasi partisi yang dibaca.
+    """
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+
+    paths = sorted(glob.glob(os.path.join(base_dir, 'run_date=*', f"*{FORMATS[fmt]}")))
+    if run_dates is not None:
+        wanted = {f"run_date={run_date}" for run_date in run_dates}
+        paths = [path for path in paths if os.path.basename(os.path.dirname(path)) in wanted]
+    if not paths:
+        return pd.DataFrame(columns=list(columns or []) + ['run_date'])
+
+    partitioning = ds.partitioning(pa.schema([('run_date', pa.string())]), flavor='hive')
+    if fmt == 'parquet':
+        dataset = ds.dataset(paths, format='parquet', partitioning=partitioning, partition_base_dir=base_dir)
+        read_columns = None if columns is None else list(columns) + ['run_date']
+        return dataset.to_table(columns=read_columns).to_pandas()
+
+    tables = []
+    for path in paths:
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select(list(columns))
+        run_date = os.path.basename(os.path.dirname(path)).split('=', 1)[1]
+        tables.append(table.append_column('run_date', pa.array([run_date] * table.num_rows, pa.string())))
+    return pa.concat_tables(tables, promote_options='default').to_pandas()
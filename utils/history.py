@@ -0,0 +1,262 @@
+import sqlite3
+import threading
+
+import pandas as pd
+
+from utils.load import NATURAL_KEY, SITE_COLUMN, _with_site
+
+
+def _timestamps(series):
+    """Timestamp sebagai teks 'YYYY-MM-DD HH:MM:SS' (urut leksikal = urut waktu), diformat per nilai unik."""
+    codes, uniques = pd.factorize(series)
+    formatted = pd.to_datetime(pd.Series(uniques), format='ISO8601').dt.strftime('%Y-%m-%d %H:%M:%S')
+    return formatted.to_numpy(dtype=object)[codes]
+
+
+class ProductHistory:
+    """Penyimpanan riwayat produk lokal (SQLite) untuk query historis tanpa memindai CSV.
+
+    Produk diidentifikasi Site dan NATURAL_KEY (Title, Size, Gender) dan mendapat product_id;
+    Site berisi nama situs pada run dengan config.sites dan '' untuk run satu katalog. Setiap
+    observasi (harga, rating, warna per Timestamp) disimpan dengan indeks (product_id, Timestamp)
+    dan indeks Timestamp, sedangkan agregat harian harga/rating dihitung ulang hanya untuk
+    (produk, hari) yang tersentuh batch. Dengan CDC, sink hanya menerima perubahan sehingga
+    observasi tercatat saat produk berubah; baris Op='delete' menandai produk tidak aktif.
+    """
+
+    def __init__(self, path='product_history.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(products)")]
+        if columns and 'Site' not in columns:
+            # Riwayat lama dibuat sebelum ada kolom Site; UNIQUE tidak dapat diubah tanpa membangun ulang tabel
+            self._conn.executescript(
+                """
+                ALTER TABLE products RENAME TO products_old;
+                CREATE TABLE products (
+                    product_id INTEGER PRIMARY KEY,
+                    Site TEXT NOT NULL DEFAULT '',
+                    Title TEXT NOT NULL,
+                    Size TEXT NOT NULL,
+                    Gender TEXT NOT NULL,
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL,
+                    active INTEGER NOT NULL DEFAULT 1,
+                    UNIQUE (Site, Title, Size, Gender)
+                );
+                INSERT INTO products (product_id, Title, Size, Gender, first_seen, last_seen, active)
+                SELECT product_id, Title, Size, Gender, first_seen, last_seen, active FROM products_old;
+                DROP TABLE products_old;
+                """
+            )
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS products (
+                product_id INTEGER PRIMARY KEY,
+                Site TEXT NOT NULL DEFAULT '',
+                Title TEXT NOT NULL,
+                Size TEXT NOT NULL,
+                Gender TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                active INTEGER NOT NULL DEFAULT 1,
+                UNIQUE (Site, Title, Size, Gender)
+            );
+            CREATE TABLE IF NOT EXISTS observations (
+                product_id INTEGER NOT NULL,
+                Timestamp TEXT NOT NULL,
+                Price REAL,
+                Rating REAL,
+                Colors INTEGER,
+                PRIMARY KEY (product_id, Timestamp)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS observations_timestamp ON observations (Timestamp);
+            CREATE TABLE IF NOT EXISTS daily (
+                product_id INTEGER NOT NULL,
+                day TEXT NOT NULL,
+                observations INTEGER NOT NULL,
+                price_min REAL,
+                price_max REAL,
+                price_avg REAL,
+                price_last REAL,
+                rating_avg REAL,
+                PRIMARY KEY (product_id, day)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS daily_day ON daily (day);
+            """
+        )
+        self._conn.commit()
+
+    def record(self, data):
+        """Mencatat satu batch DataFrame (data lengkap atau perubahan dari utils.cdc); mengembalikan jumlah observasi."""
+        if data is None or data.empty:
+            return 0
+        if 'Op' in data.columns:
+            deleted = data[data['Op'] == 'delete']
+            data = data[data['Op'] != 'delete']
+        else:
+            deleted = data.iloc[:0]
+
+        # Batch delete dari iter_changes (mode stream) hanya berisi kolom product_key dan Op
+        key = (SITE_COLUMN,) + NATURAL_KEY
+        rows = []
+        if len(data):
+            data = _with_site(data)
+            rows = zip(
+                *(data[column].astype(str).tolist() for column in key),
+                _timestamps(data['Timestamp']).tolist(),
+                data['Price'].astype('float64').tolist(),
+                data['Rating'].astype('float64').tolist(),
+                data['Colors'].astype('int64').tolist(),
+            )
+        deleted = _with_site(deleted)
+        deleted_keys = zip(*(deleted[column].astype(str).tolist() for column in key))
+
+        with self._lock, self._conn:
+            conn = self._conn
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS staging "
+                "(Site TEXT, Title TEXT, Size TEXT, Gender TEXT, Timestamp TEXT, Price REAL, Rating REAL, Colors INTEGER)"
+            )
+            conn.execute("DELETE FROM staging")
+            conn.executemany("INSERT INTO staging VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(
+                """
+                INSERT INTO products (Site, Title, Size, Gender, first_seen, last_seen, active)
+                SELECT Site, Title, Size, Gender, MIN(Timestamp), MAX(Timestamp), 1 FROM staging
+                GROUP BY Site, Title, Size, Gender
+                ON CONFLICT (Site, Title, Size, Gender) DO UPDATE SET
+                    first_seen = MIN(first_seen, excluded.first_seen),
+                    last_seen = MAX(last_seen, excluded.last_seen),
+                    active = 1
+                """
+            )
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO observations (product_id, Timestamp, Price, Rating, Colors)
+                SELECT p.product_id, s.Timestamp, s.Price, s.Rating, s.Colors
+                FROM staging s JOIN products p USING (Site, Title, Size, Gender)
+                """
+            )
+            # Agregat harian hanya dihitung ulang untuk (produk, hari) yang ada di batch ini
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO daily
+                    (product_id, day, observations, price_min, price_max, price_avg, price_last, rating_avg)
+                SELECT t.product_id, t.day, COUNT(*), MIN(o.Price), MAX(o.Price), AVG(o.Price),
+                    (SELECT last.Price FROM observations last
+                     WHERE last.product_id = t.product_id AND last.Timestamp >= t.day
+                         AND last.Timestamp < date(t.day, '+1 day')
+                     ORDER BY last.Timestamp DESC LIMIT 1),
+                    AVG(o.Rating)
+                FROM (SELECT DISTINCT p.product_id, substr(s.Timestamp, 1, 10) AS day
+                      FROM staging s JOIN products p USING (Site, Title, Size, Gender)) t
+                JOIN observations o ON o.product_id = t.product_id
+                    AND o.Timestamp >= t.day AND o.Timestamp < date(t.day, '+1 day')
+                GROUP BY t.product_id, t.day
+                """
+            )
+            conn.executemany(
+                "UPDATE products SET active = 0 WHERE Site = ? AND Title = ? AND Size = ? AND Gender = ?", deleted_keys
+            )
+            conn.execute("DELETE FROM staging")
+        return len(data)
+
+    def _query(self, sql, parameters=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, parameters)
+            columns = [description[0] for description in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)
+
+    def _product_filter(self, title, size, gender, site=None):
+        clauses, parameters = ["p.Title = ?"], [title]
+        for column, value in (('Size', size), ('Gender', gender), ('Site', site)):
+            if value is not None:
+                clauses.append(f"p.{column} = ?")
+                parameters.append(value)
+        return " AND ".join(clauses), parameters
+
+    def latest(self, active_only=True):
+        """Snapshot terbaru: observasi terakhir setiap produk (bawaan hanya produk yang masih aktif)."""
+        return self._query(
+            f"""
+            SELECT p.Title, o.Price, o.Rating, o.Colors, p.Size, p.Gender, o.Timestamp, p.Site
+            FROM products p JOIN observations o ON o.product_id = p.product_id AND o.Timestamp = p.last_seen
+            {"WHERE p.active = 1" if active_only else ""}
+            ORDER BY p.Title, p.Size, p.Gender, p.Site
+            """
+        )
+
+    def history(self, title, size=None, gender=None, start=None, end=None, site=None):
+        """Riwayat observasi produk `title` (opsional per Size/Gender/Site dan rentang Timestamp), urut waktu."""
+        where, parameters = self._product_filter(title, size, gender, site)
+        if start is not None:
+            where += " AND o.Timestamp >= ?"
+            parameters.append(str(start))
+        if end is not None:
+            where += " AND o.Timestamp <= ?"
+            parameters.append(str(end))
+        return self._query(
+            f"""
+            SELECT p.Title, o.Price, o.Rating, o.Colors, p.Size, p.Gender, o.Timestamp, p.Site
+            FROM products p JOIN observations o ON o.product_id = p.product_id
+            WHERE {where} ORDER BY p.product_id, o.Timestamp
+            """,
+            parameters,
+        )
+
+    def daily(self, title, size=None, gender=None, site=None):
+        """Agregat harian harga dan rating produk `title`, urut per hari."""
+        where, parameters = self._product_filter(title, size, gender, site)
+        return self._query(
+            f"""
+            SELECT p.Title, p.Size, p.Gender, p.Site, d.day, d.observations, d.price_min, d.price_max,
+                d.price_avg, d.price_last, d.rating_avg
+            FROM products p JOIN daily d ON d.product_id = p.product_id
+            WHERE {where} ORDER BY p.product_id, d.day
+            """,
+            parameters,
+        )
+
+    def top_changes(self, n=10, day=None):
+        """`n` produk dengan perubahan harga terbesar pada `day` (bawaan hari terakhir) dibanding hari tercatat sebelumnya."""
+        return self._query(
+            """
+            SELECT p.Title, p.Size, p.Gender, p.Site, previous.day AS previous_day, previous.price_last AS price_before,
+                today.price_last AS price_after, today.price_last - previous.price_last AS change
+            FROM daily today
+            JOIN daily previous ON previous.product_id = today.product_id AND previous.day = (
+                SELECT MAX(d.day) FROM daily d WHERE d.product_id = today.product_id AND d.day < today.day)
+            JOIN products p ON p.product_id = today.product_id
+            WHERE today.day = COALESCE(?, (SELECT MAX(day) FROM daily)) AND today.price_last != previous.price_last
+            ORDER BY ABS(today.price_last - previous.price_last) DESC, p.Title, p.Size, p.Gender
+            LIMIT ?
+            """,
+            (None if day is None else str(day)[:10], n),
+        )
+
+    def close(self):
+        """Menutup koneksi SQLite."""
+        with self._lock:
+            self._conn.close()
+
+
+def store_to_history(data, path='product_history.sqlite', raise_errors=False):
+    """Fungsi untuk menyimpan data ke riwayat produk lokal (ProductHistory).
+
+    Dengan raise_errors=True, kesalahan diteruskan ke pemanggil setelah dicetak.
+    """
+    history = None
+    try:
+        history = ProductHistory(path)
+        rows = history.record(data)
+        print(f"{rows} observasi ditambahkan ke riwayat produk {path}")
+        return rows
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+    finally:
+        if history is not None:
+            history.close()
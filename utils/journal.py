@@ -0,0 +1,281 @@
+import pickle
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+from utils.extract import FashionColumns
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _page_key(run_id, source):
+    """Kunci halaman di tabel pages: run_id, atau run_id/source untuk situs tertentu."""
+    return run_id if source is None else f"{run_id}/{source}"
+
+
+def batch_digest(data):
+    """Sidik jari isi batch DataFrame untuk memastikan batch hasil replay sama dengan yang tercatat."""
+    import pandas as pd
+
+    return format(int(pd.util.hash_pandas_object(data, index=False).sum()), 'x')
+
+
+class RunJournal:
+    """Jurnal run ETL di disk (SQLite) agar run yang gagal dapat dilanjutkan dari checkpoint terakhir.
+
+    Dicatat per run: halaman yang sudah diambil beserta datanya, batch yang sudah ditransformasi
+    (jumlah baris dan sidik jarinya), dan sink yang sudah berhasil menulis setiap batch. Run yang
+    dilanjutkan memakai ulang halaman dari jurnal tanpa fetch ulang dan melewati sink yang sudah
+    commit, sehingga data tidak dikirim dua kali.
+
+    Hanya run terakhir setiap mode yang dapat dilanjutkan. Saat run baru dimulai, run lama dengan
+    mode yang sama yang belum selesai ditandai 'superseded' dan data halaman serta batch-nya
+    dihapus, sehingga jurnal tidak menyimpan salinan katalog dari setiap run yang gagal.
+    """
+
+    def __init__(self, path='run_journal.sqlite'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                mode TEXT NOT NULL,
+                status TEXT NOT NULL,
+                extracted INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                started_at TEXT NOT NULL,
+                finished_at TEXT
+            );
+            CREATE TABLE IF NOT EXISTS pages (
+                run_id TEXT NOT NULL,
+                page_number INTEGER NOT NULL,
+                records BLOB NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, page_number)
+            );
+            CREATE TABLE IF NOT EXISTS batches (
+                run_id TEXT NOT NULL,
+                batch_number INTEGER NOT NULL,
+                rows INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                transformed_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, batch_number)
+            );
+            CREATE TABLE IF NOT EXISTS commits (
+                run_id TEXT NOT NULL,
+                batch_number INTEGER NOT NULL,
+                sink TEXT NOT NULL,
+                committed_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, batch_number, sink)
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                run_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                extracted_at TEXT NOT NULL,
+                PRIMARY KEY (run_id, source)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _execute(self, sql, parameters=()):
+        with self._lock:
+            cursor = self._conn.execute(sql, parameters)
+            self._conn.commit()
+            return cursor
+
+    def _fetch(self, sql, parameters=()):
+        with self._lock:
+            return self._conn.execute(sql, parameters).fetchall()
+
+    def _prune(self, run_ids):
+        """Menghapus data halaman, batch, dan commit run `run_ids` (catatan run-nya tetap ada)."""
+        with self._lock, self._conn:
+            for run_id in run_ids:
+                self._conn.execute("DELETE FROM pages WHERE run_id = ? OR run_id LIKE ?", (run_id, f"{run_id}/%"))
+                for table in ('batches', 'commits', 'sources'):
+                    self._conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+    def start_run(self, mode):
+        """Membuat run baru berstatus 'running' dan mengembalikan run_id-nya.
+
+        Run lama dengan mode yang sama yang belum selesai tidak lagi dapat dilanjutkan: statusnya
+        menjadi 'superseded' dan datanya dihapus (lihat _prune).
+        """
+        abandoned = [run_id for (run_id,) in self._fetch(
+            "SELECT run_id FROM runs WHERE mode = ? AND status NOT IN ('completed', 'superseded')", (mode,)
+        )]
+        if abandoned:
+            self._execute(
+                f"UPDATE runs SET status = 'superseded' WHERE run_id IN ({', '.join('?' * len(abandoned))})",
+                abandoned,
+            )
+            self._prune(abandoned)
+
+        run_id = uuid.uuid4().hex[:12]
+        self._execute(
+            "INSERT INTO runs (run_id, mode, status, started_at) VALUES (?, ?, 'running', ?)",
+            (run_id, mode, _now()),
+        )
+        return run_id
+
+    def resumable_run(self, mode):
+        """run_id run terakhir dengan mode yang sama jika run itu belum selesai, atau None.
+
+        Run yang gagal tidak dilanjutkan jika sesudahnya sudah ada run lain dengan mode yang sama;
+        memutar ulang halamannya akan menimpa data yang lebih baru dengan data lama.
+        """
+        rows = self._fetch(
+            "SELECT run_id, status FROM runs WHERE mode = ? ORDER BY started_at DESC, rowid DESC LIMIT 1",
+            (mode,),
+        )
+        if not rows or rows[0][1] in ('completed', 'superseded'):
+            return None
+        return rows[0][0]
+
+    def run(self, run_id):
+        """Status satu run dalam bentuk dict, atau None jika tidak ada."""
+        rows = self._fetch(
+            "SELECT mode, status, extracted, error, started_at, finished_at FROM runs WHERE run_id = ?", (run_id,)
+        )
+        if not rows:
+            return None
+        mode, status, extracted, error, started_at, finished_at = rows[0]
+        return {
+            "run_id": run_id,
+            "mode": mode,
+            "status": status,
+            "extracted": bool(extracted),
+            "error": error,
+            "started_at": started_at,
+            "finished_at": finished_at,
+        }
+
+    def finish_run(self, run_id, status, error=None):
+        """Menandai run selesai ('completed') atau gagal ('failed').
+
+        Run yang selesai tidak perlu dilanjutkan, sehingga data halamannya dihapus dari jurnal.
+        """
+        self._execute(
+            "UPDATE runs SET status = ?, error = ?, finished_at = ? WHERE run_id = ?",
+            (status, error, _now(), run_id),
+        )
+        if status == 'completed':
+            self._prune([run_id])
+
+    def record_page(self, run_id, page_number, records, source=None):
+        """Menyimpan data satu halaman (disimpan sebagai FashionColumns agar ringkas).
+
+        `source` memisahkan halaman dari beberapa situs dalam satu run (lihat pages).
+        """
+        if not isinstance(records, FashionColumns):
+            columns = FashionColumns()
+            columns.extend(records)
+            records = columns
+        self._execute(
+            "INSERT OR REPLACE INTO pages (run_id, page_number, records, fetched_at) VALUES (?, ?, ?, ?)",
+            (_page_key(run_id, source), page_number, pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL), _now()),
+        )
+
+    def mark_extracted(self, run_id, source=None):
+        """Menandai seluruh halaman katalog (atau situs `source`) sudah diambil."""
+        if source is None:
+            self._execute("UPDATE runs SET extracted = 1 WHERE run_id = ?", (run_id,))
+        else:
+            self._execute(
+                "INSERT OR REPLACE INTO sources (run_id, source, extracted_at) VALUES (?, ?, ?)",
+                (run_id, source, _now()),
+            )
+
+    def is_extracted(self, run_id, source=None):
+        """True jika seluruh halaman katalog (atau situs `source`) pada run ini sudah diambil."""
+        if source is None:
+            return self.run(run_id)["extracted"]
+        return bool(self._fetch("SELECT 1 FROM sources WHERE run_id = ? AND source = ?", (run_id, source)))
+
+    def pages(self, run_id, fetch_pages, source=None):
+        """Generator (nomor_halaman, data) yang memutar ulang halaman dari jurnal lalu melanjutkan scraping.
+
+        `fetch_pages(last_page)` dipanggil dengan nomor halaman terakhir yang tercatat (None jika
+        belum ada) dan harus menghasilkan (nomor_halaman, data) untuk halaman setelahnya, misalnya
+        iter_fashion_pages dengan start_page=last_page + 1 dan initial_url=None. Setiap halaman
+        baru dicatat sebelum dihasilkan.
+
+        Untuk run yang mengambil beberapa situs, panggil pages sekali per situs dengan `source`
+        berbeda; halaman dan status selesainya dicatat terpisah per situs.
+        """
+        last_page = None
+        for page_number, blob in self._fetch(
+            "SELECT page_number, records FROM pages WHERE run_id = ? ORDER BY page_number",
+            (_page_key(run_id, source),),
+        ):
+            last_page = page_number
+            yield page_number, pickle.loads(blob)
+
+        if self.is_extracted(run_id, source):
+            return
+
+        for page_number, records in fetch_pages(last_page):
+            self.record_page(run_id, page_number, records, source)
+            yield page_number, records
+        self.mark_extracted(run_id, source)
+
+    def record_batch(self, run_id, batch_number, data):
+        """Mencatat batch hasil transformasi; mengembalikan nama sink yang sudah commit untuk batch ini.
+
+        Jika batch dengan nomor yang sama tercatat dengan isi berbeda, catatan commit-nya dibuang
+        agar seluruh sink menulis ulang batch tersebut.
+        """
+        digest = batch_digest(data)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM batches WHERE run_id = ? AND batch_number = ?", (run_id, batch_number)
+            ).fetchone()
+            if row is not None and row[0] != digest:
+                self._conn.execute(
+                    "DELETE FROM commits WHERE run_id = ? AND batch_number = ?", (run_id, batch_number)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO batches (run_id, batch_number, rows, digest, transformed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (run_id, batch_number, len(data), digest, _now()),
+            )
+            self._conn.commit()
+            committed = self._conn.execute(
+                "SELECT sink FROM commits WHERE run_id = ? AND batch_number = ?", (run_id, batch_number)
+            ).fetchall()
+        return {sink for (sink,) in committed}
+
+    def record_commit(self, run_id, batch_number, sink):
+        """Mencatat bahwa `sink` sudah berhasil menulis batch."""
+        self._execute(
+            "INSERT OR REPLACE INTO commits (run_id, batch_number, sink, committed_at) VALUES (?, ?, ?, ?)",
+            (run_id, batch_number, sink, _now()),
+        )
+
+    def pending_sinks(self, run_id, batch_number, data, sinks):
+        """Menyaring dict sink menjadi sink yang belum commit untuk batch ini.
+
+        Sink yang dikembalikan dibungkus sehingga commit-nya dicatat begitu sink berhasil; dapat
+        langsung diberikan ke utils.load.run_sinks.
+        """
+        committed = self.record_batch(run_id, batch_number, data)
+
+        def journaled(name, sink):
+            def run(batch):
+                result = sink(batch)
+                self.record_commit(run_id, batch_number, name)
+                return result
+            return run
+
+        return {name: journaled(name, sink) for name, sink in sinks.items() if name not in committed}
+
+    def close(self):
+        """Menutup koneksi SQLite."""
+        with self._lock:
+            self._conn.close()
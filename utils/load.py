@@ -1,12 +1,73 @@
-from sqlalchemy import create_engine
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+import importlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from utils.sheets import SpreadsheetWriter, store_to_sheets
+
+# SQLAlchemy dan Google API client baru diimpor saat pertama kali dipakai (PEP 562), sehingga
+# run yang hanya scraping atau hanya menulis CSV tidak membayar waktu impornya saat start
+_LAZY_IMPORTS = {
+    **{name: 'sqlalchemy' for name in (
+        'Column', 'DateTime', 'Float', 'Integer', 'MetaData', 'String', 'Table', 'UniqueConstraint',
+        'create_engine', 'inspect', 'text', 'tuple_',
+    )},
+    'Credentials': 'google.oauth2.service_account',
+    'build': 'googleapiclient.discovery',
+}
+_SQLALCHEMY = tuple(name for name, module in _LAZY_IMPORTS.items() if module == 'sqlalchemy')
+
+
+def _import_lazy(*names):
+    """Mengimpor nama dari _LAZY_IMPORTS ke namespace modul, kecuali yang sudah ada (misalnya di-patch)."""
+    namespace = globals()
+    for name in names:
+        if name not in namespace:
+            namespace[name] = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        _import_lazy(name)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Identitas alami sebuah produk: satu baris per kombinasi ini di tabel tujuan
+NATURAL_KEY = ('Title', 'Size', 'Gender')
+FASHION_COLUMNS = ('Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'Timestamp')
+# Nama situs asal produk (utils.sites); hanya ada pada run dengan config.sites
+SITE_COLUMN = 'Site'
+
+
+def product_key(columns):
+    """Kolom identitas produk untuk data/tabel dengan `columns`: NATURAL_KEY, diawali Site jika ada.
+
+    Dengan beberapa situs, produk dengan Title, Size, dan Gender yang sama di dua situs adalah
+    produk berbeda; CDC, MySQL, dan riwayat produk memakai kunci ini.
+    """
+    return ((SITE_COLUMN,) if SITE_COLUMN in columns else ()) + NATURAL_KEY
+
+
+def _with_site(data):
+    """`data` dengan kolom Site terisi ('' untuk data tanpa situs), untuk tabel yang memuat Site."""
+    if SITE_COLUMN not in data.columns:
+        return data.assign(**{SITE_COLUMN: ''})
+    return data.assign(**{SITE_COLUMN: data[SITE_COLUMN].astype(object).where(data[SITE_COLUMN].notna(), '')})
+
+_ENGINES = {}
+_ENGINES_LOCK = threading.Lock()
  
-def store_to_mysql(data, db_url):
-    """Fungsi untuk menyimpan data ke dalam MYSQL."""
+def store_to_mysql(data, db_url, engine=None, raise_errors=False):
+    """Fungsi untuk menyimpan data ke dalam MYSQL.
+
+    Berikan `engine` yang sudah ada agar connection pool dipakai ulang antar pemanggilan.
+    Dengan raise_errors=True, kesalahan diteruskan ke pemanggil setelah dicetak.
+    """
     try:
+        _import_lazy('create_engine')
         # Membuat engine database
-        engine = create_engine(db_url)
+        if engine is None:
+            engine = create_engine(db_url)
         
         # Menyimpan data ke tabel 'bfpd' jika tabel sudah ada, data akan ditambahkan (append)
         with engine.connect() as con:
@@ -15,19 +76,293 @@ def store_to_mysql(data, db_url):
     
     except Exception as e:
         print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+
+def get_engine(db_url, **engine_kwargs):
+    """Mengambil engine SQLAlchemy yang di-cache per URL agar connection pool dipakai ulang."""
+    _import_lazy('create_engine')
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(db_url)
+        if engine is None:
+            engine = _ENGINES[db_url] = create_engine(db_url, pool_pre_ping=True, **engine_kwargs)
+        return engine
+
+
+def fashion_table(metadata, table_name='bfpd', site=False):
+    """Definisi tabel data fashion dengan unique constraint pada product_key (dengan site=True, ada kolom Site)."""
+    _import_lazy(*_SQLALCHEMY)
+    site_columns = [Column(SITE_COLUMN, String(100), nullable=False, server_default='')] if site else []
+    return Table(
+        table_name,
+        metadata,
+        Column('Title', String(100), nullable=False),
+        Column('Price', Float, nullable=False),
+        Column('Rating', Float, nullable=False),
+        Column('Colors', Integer, nullable=False),
+        Column('Size', String(10), nullable=False),
+        Column('Gender', String(20), nullable=False),
+        Column('Timestamp', DateTime, nullable=False),
+        *site_columns,
+        UniqueConstraint(*product_key([SITE_COLUMN] if site else [])),
+    )
+
+
+def _dedupe_natural_key(con, table_name):
+    """Migrasi satu kali tabel lama tanpa unique key: menyisakan satu baris per NATURAL_KEY.
+
+    Dari setiap kelompok duplikat, baris dengan Timestamp terbaru dipertahankan. Baris diganti di
+    tempat (skema tabel lama tidak diubah) dalam transaksi pemanggil. Mengembalikan jumlah baris
+    duplikat yang dihapus.
+    """
+    quote = con.dialect.identifier_preparer.quote
+    table = quote(table_name)
+    keys = ', '.join(quote(column) for column in NATURAL_KEY)
+    duplicates = con.execute(text(f"SELECT {keys} FROM {table} GROUP BY {keys} HAVING COUNT(*) > 1")).fetchall()
+    if not duplicates:
+        return 0
+
+    columns = [column['name'] for column in inspect(con).get_columns(table_name)]
+    where = ' AND '.join(f"{quote(column)} = :key{position}" for position, column in enumerate(NATURAL_KEY))
+    select = text(f"SELECT {', '.join(quote(column) for column in columns)} FROM {table} "
+                  f"WHERE {where} ORDER BY {quote('Timestamp')} DESC")
+    delete = text(f"DELETE FROM {table} WHERE {where}")
+    insert = text(f"INSERT INTO {table} ({', '.join(quote(column) for column in columns)}) "
+                  f"VALUES ({', '.join(f':value{position}' for position in range(len(columns)))})")
+
+    removed = 0
+    for key in duplicates:
+        parameters = {f"key{position}": value for position, value in enumerate(key)}
+        rows = con.execute(select, parameters).fetchall()
+        if len(rows) < 2:
+            # Kunci berisi NULL tidak cocok dengan '=' dan tidak melanggar unique index
+            continue
+        con.execute(delete, parameters)
+        con.execute(insert, {f"value{position}": value for position, value in enumerate(rows[0])})
+        removed += len(rows) - 1
+    return removed
+
+
+def _add_site_column(con, table_name):
+    """Migrasi satu kali untuk run beberapa situs: tabel dibangun ulang dengan kolom Site.
+
+    Baris lama mendapat Site '' dan unique key menjadi Site + NATURAL_KEY; tabel baru ditukar
+    dengan tabel lama seperti full refresh (lihat _swap_tables).
+    """
+    quote = con.dialect.identifier_preparer.quote
+    staging_name = f"{table_name}_staging"
+    con.execute(text(f"DROP TABLE IF EXISTS {quote(staging_name)}"))
+    fashion_table(MetaData(), staging_name, site=True).create(con)
+    columns = ', '.join(quote(column) for column in FASHION_COLUMNS)
+    con.execute(text(f"INSERT INTO {quote(staging_name)} ({columns}, {quote(SITE_COLUMN)}) "
+                     f"SELECT {columns}, '' FROM {quote(table_name)}"))
+    _swap_tables(con, table_name, staging_name)
+    print(f"Migrasi tabel {table_name}: kolom {SITE_COLUMN} ditambahkan, unique key menjadi "
+          f"{', '.join(product_key([SITE_COLUMN]))}")
 
-def store_to_csv(data):
-    """Fungsi untuk menyimpan data ke dalam CSV."""
+
+def _ensure_table(con, table_name, site=False):
+    """Membuat tabel jika belum ada dan memastikan ada unique index pada product_key.
+
+    Tabel lama (misalnya hasil to_sql) yang sudah berisi duplikat lebih dulu dimigrasi dengan
+    _dedupe_natural_key agar unique index dapat dibuat. Dengan site=True (data dari beberapa
+    situs), tabel tanpa kolom Site dimigrasi dengan _add_site_column. Tabel yang sudah memiliki
+    Site tetap memakainya walaupun data tidak memuat Site.
+    """
+    inspector = inspect(con)
+    if not inspector.has_table(table_name):
+        table = fashion_table(MetaData(), table_name, site=site)
+        table.create(con)
+        return table
+    if SITE_COLUMN in [column['name'] for column in inspector.get_columns(table_name)]:
+        return fashion_table(MetaData(), table_name, site=True)
+
+    table = fashion_table(MetaData(), table_name)
+    unique_keys = [tuple(c['column_names']) for c in inspector.get_unique_constraints(table_name)]
+    unique_keys += [tuple(i['column_names']) for i in inspector.get_indexes(table_name) if i.get('unique')]
+    if not any(set(key) == set(NATURAL_KEY) for key in unique_keys):
+        # Tabel lama (misalnya hasil to_sql) belum punya unique key
+        removed = _dedupe_natural_key(con, table_name)
+        if removed:
+            print(f"Migrasi tabel {table_name}: {removed} baris duplikat dihapus "
+                  f"(dipertahankan Timestamp terbaru) sebelum membuat unique index")
+        quote = con.dialect.identifier_preparer.quote
+        columns = ', '.join(quote(column) for column in NATURAL_KEY)
+        con.execute(text(f"CREATE UNIQUE INDEX {quote('uq_' + table_name + '_natural_key')} "
+                         f"ON {quote(table_name)} ({columns})"))
+    if site:
+        _add_site_column(con, table_name)
+        return fashion_table(MetaData(), table_name, site=True)
+    return table
+
+
+def _to_rows(data, site=False):
+    """Mengubah DataFrame menjadi list of dict bertipe Python bawaan, satu baris per product_key.
+
+    Dengan site=True (tabel tujuan memuat kolom Site), setiap baris menyertakan Site.
+    """
+    import pandas as pd
+
+    df = _with_site(data) if site else data.drop(columns=SITE_COLUMN, errors='ignore')
+    df = df.drop_duplicates(subset=list(product_key(df.columns)), keep='last')
+    columns = {column: df[column].tolist() for column in FASHION_COLUMNS + ((SITE_COLUMN,) if site else ())
+               if column != 'Timestamp'}
+    timestamps = pd.to_datetime(df['Timestamp'], errors='coerce', format='ISO8601')
+    columns['Timestamp'] = [None if pd.isna(ts) else ts.to_pydatetime() for ts in timestamps]
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def _upsert_statement(con, table, rows):
+    """Membuat satu statement INSERT multi-baris yang memperbarui baris dengan product_key sama."""
+    key = product_key(table.c.keys())
+    update_columns = [column for column in FASHION_COLUMNS if column not in key]
+    dialect = con.dialect.name
+
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table).values(rows)
+        return statement.on_duplicate_key_update({c: statement.inserted[c] for c in update_columns})
+
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        statement = insert(table).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=list(key),
+            set_={c: statement.excluded[c] for c in update_columns},
+        )
+
+    raise ValueError(f"Upsert belum didukung untuk database {dialect}")
+
+
+def _write_chunks(con, table, rows, chunksize):
+    for start in range(0, len(rows), chunksize):
+        con.execute(_upsert_statement(con, table, rows[start:start + chunksize]))
+
+
+def _swap_tables(con, table_name, staging_name):
+    """Mengganti tabel utama dengan tabel staging dalam satu transaksi/operasi atomik."""
+    quote = con.dialect.identifier_preparer.quote
+    old_name = f"{table_name}_old"
+    exists = inspect(con).has_table(table_name)
+
+    con.execute(text(f"DROP TABLE IF EXISTS {quote(old_name)}"))
+    if con.dialect.name == 'mysql':
+        if exists:
+            con.execute(text(f"RENAME TABLE {quote(table_name)} TO {quote(old_name)}, "
+                             f"{quote(staging_name)} TO {quote(table_name)}"))
+        else:
+            con.execute(text(f"RENAME TABLE {quote(staging_name)} TO {quote(table_name)}"))
+    else:
+        if exists:
+            con.execute(text(f"ALTER TABLE {quote(table_name)} RENAME TO {quote(old_name)}"))
+        con.execute(text(f"ALTER TABLE {quote(staging_name)} RENAME TO {quote(table_name)}"))
+    con.execute(text(f"DROP TABLE IF EXISTS {quote(old_name)}"))
+
+
+def upsert_to_mysql(data, engine, table_name='bfpd', chunksize=1000, full_refresh=False, raise_errors=False):
+    """Menyimpan data ke MySQL secara idempotent dengan upsert berdasarkan Title+Size+Gender (dan Site).
+
+    Data dikirim sebagai INSERT multi-baris per `chunksize` baris dalam satu transaksi, sehingga
+    menjalankan ulang pipeline tidak menumpuk baris duplikat. Dengan full_refresh=True, data
+    ditulis ke tabel staging lalu ditukar dengan tabel utama. `engine` boleh berupa URL database,
+    engine untuk URL tersebut diambil dari get_engine. Mengembalikan jumlah baris yang ditulis,
+    atau None jika gagal (atau meneruskan kesalahannya jika raise_errors=True).
+    """
     try:
-        data.to_csv('fashion_data.csv', index=False)
+        _import_lazy(*_SQLALCHEMY)
+        if isinstance(engine, str):
+            engine = get_engine(engine)
+        site = SITE_COLUMN in data.columns
+
+        if full_refresh:
+            rows = _to_rows(data, site)
+            staging_name = f"{table_name}_staging"
+            with engine.begin() as con:
+                quote = con.dialect.identifier_preparer.quote
+                con.execute(text(f"DROP TABLE IF EXISTS {quote(staging_name)}"))
+                staging = fashion_table(MetaData(), staging_name, site=site)
+                staging.create(con)
+                _write_chunks(con, staging, rows, chunksize)
+            with engine.begin() as con:
+                _swap_tables(con, table_name, staging_name)
+        else:
+            with engine.begin() as con:
+                table = _ensure_table(con, table_name, site)
+                rows = _to_rows(data, SITE_COLUMN in table.c)
+                _write_chunks(con, table, rows, chunksize)
+
+        print("Data berhasil disimpan (upsert) Ke dalam Database!")
+        return len(rows)
+
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+        return None
+
+def apply_changes_to_mysql(changes, engine, table_name='bfpd', chunksize=1000, raise_errors=False):
+    """Menerapkan DataFrame perubahan (lihat utils.cdc) ke MySQL dalam satu transaksi.
+
+    Baris Op 'insert'/'update' di-upsert berdasarkan product_key, baris Op 'delete' dihapus
+    berdasarkan product_key. Mengembalikan {"upserted": n, "deleted": n}, atau None jika gagal.
+    """
+    try:
+        _import_lazy(*_SQLALCHEMY)
+        if isinstance(engine, str):
+            engine = get_engine(engine)
+        is_delete = changes['Op'] == 'delete'
+
+        deleted = 0
+        with engine.begin() as con:
+            table = _ensure_table(con, table_name, SITE_COLUMN in changes.columns)
+            site = SITE_COLUMN in table.c
+            rows = _to_rows(changes[~is_delete], site) if (~is_delete).any() else []
+            key = product_key(table.c.keys())
+            deletes = _with_site(changes[is_delete]) if site else changes[is_delete]
+            keys = list(deletes[list(key)].itertuples(index=False, name=None))
+            _write_chunks(con, table, rows, chunksize)
+            key_columns = tuple_(*(table.c[column] for column in key))
+            for start in range(0, len(keys), chunksize):
+                result = con.execute(table.delete().where(key_columns.in_(keys[start:start + chunksize])))
+                deleted += result.rowcount
+
+        print(f"Perubahan berhasil diterapkan Ke dalam Database: {len(rows)} upsert, {deleted} delete")
+        return {"upserted": len(rows), "deleted": deleted}
+
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+        return None
+
+def store_to_csv(data, filename='fashion_data.csv', append=False, raise_errors=False):
+    """Fungsi untuk menyimpan data ke dalam CSV.
+
+    Dengan append=True, data ditambahkan ke akhir file tanpa menulis ulang header.
+    Dengan raise_errors=True, kesalahan diteruskan ke pemanggil setelah dicetak.
+    """
+    try:
+        if append:
+            data.to_csv(filename, mode='a', header=False, index=False)
+        else:
+            data.to_csv(filename, index=False)
         print("Data berhasil ditambahkan Ke format  CSV!")
     
     except Exception as e :
         print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
 
-def store_to_spreedsheet(data):
-    """Fungsi untuk menyimpan data ke dalam Spreedsheet."""
+def store_to_spreedsheet(data, include_header=True, raise_errors=False):
+    """Fungsi untuk menyimpan data ke dalam Spreedsheet.
+
+    Dengan raise_errors=True, kesalahan diteruskan ke pemanggil setelah dicetak.
+    """
     try:
+        _import_lazy('Credentials', 'build')
         SERVICE_ACCOUNT_FILE = './google-sheets-api.json'
         SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
@@ -42,8 +377,9 @@ def store_to_spreedsheet(data):
 
          # Mengonversi DataFrame menjadi list dan Mengambil header kolom
         values = data.values.tolist()
-        header = data.columns.tolist()
-        values.insert(0, header) 
+        if include_header:
+            header = data.columns.tolist()
+            values.insert(0, header) 
 
         body = {
             'values': values
@@ -60,4 +396,184 @@ def store_to_spreedsheet(data):
         print("Data berhasil disimpan ke Google Sheets!")
 
     except Exception as e :
-        print(f"Terjadi kesalahan saat menyimpan data: {e}")
\ No newline at end of file
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+
+def _run_sink(sink, data):
+    """Menjalankan satu sink dan mencatat status, durasi, serta kesalahannya."""
+    started = time.perf_counter()
+    try:
+        sink(data)
+        return {"status": "success", "seconds": time.perf_counter() - started, "error": None}
+    except Exception as e:
+        return {"status": "failed", "seconds": time.perf_counter() - started, "error": f"{type(e).__name__}: {e}"}
+
+
+def _summary_status(sink_results):
+    statuses = {result["status"] for result in sink_results.values()}
+    if statuses <= {"success"}:
+        return "success"
+    if "success" in statuses:
+        return "partial"
+    return "failed"
+
+
+def run_sinks(data, sinks, timeout=None):
+    """Menjalankan seluruh sink secara paralel lalu mengembalikan ringkasan hasilnya.
+
+    `sinks` berupa dict nama -> callable(data) yang melempar exception jika gagal (misalnya
+    store_to_csv dengan raise_errors=True). Ringkasan berisi status keseluruhan ('success',
+    'partial', atau 'failed'), jumlah baris, durasi total, dan status/durasi/kesalahan per sink.
+    Sink yang belum selesai setelah `timeout` detik dicatat sebagai 'timeout'.
+    """
+    started = time.perf_counter()
+    results = {}
+
+    executor = ThreadPoolExecutor(max_workers=max(len(sinks), 1))
+    try:
+        futures = {name: executor.submit(_run_sink, sink, data) for name, sink in sinks.items()}
+        for name, future in futures.items():
+            remaining = None if timeout is None else max(timeout - (time.perf_counter() - started), 0)
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FuturesTimeoutError:
+                results[name] = {
+                    "status": "timeout",
+                    "seconds": time.perf_counter() - started,
+                    "error": f"Sink tidak selesai dalam {timeout} detik",
+                }
+    finally:
+        # Sink yang macet tidak ditunggu agar ringkasan tetap dikembalikan
+        executor.shutdown(wait=False)
+
+    return {
+        "status": _summary_status(results),
+        "rows": 0 if data is None else len(data),
+        "seconds": time.perf_counter() - started,
+        "sinks": results,
+    }
+
+
+def default_sinks(db_url, first_batch=True, parquet_dir=None, csv_path='fashion_data.csv', writer=None,
+                  history_path=None, upload_id=None):
+    """Sink bawaan pipeline (MySQL, CSV, Google Sheets) yang melempar exception saat gagal.
+
+    Google Sheets ditulis lewat utils.sheets.store_to_sheets: per batch, dengan backoff dan
+    checkpoint, serta header hanya saat sheet masih kosong (`writer` untuk SpreadsheetWriter
+    dengan spreadsheet/kredensial lain, `upload_id` sebagai kunci checkpoint-nya, lihat
+    SpreadsheetWriter.write). Jika `parquet_dir` diberikan, data juga ditulis ke
+    Parquet yang dipartisi per tanggal run (utils.files). Jika `history_path` diberikan, data
+    juga dicatat ke riwayat produk lokal (utils.history).
+    """
+    sinks = {
+        "mysql": lambda data: upsert_to_mysql(data, db_url, raise_errors=True),
+        "csv": lambda data: store_to_csv(data, csv_path, append=not first_batch, raise_errors=True),
+        "spreadsheet": lambda data: store_to_sheets(data, writer=writer, run_id=upload_id, raise_errors=True),
+    }
+    if parquet_dir is not None:
+        sinks["parquet"] = _parquet_sink(parquet_dir)
+    if history_path is not None:
+        sinks["history"] = _history_sink(history_path)
+    return sinks
+
+
+def delta_sinks(db_url, changes_csv='fashion_changes.csv', parquet_dir=None, writer=None, history_path=None,
+                upload_id=None):
+    """Sink untuk DataFrame perubahan (utils.cdc) yang hanya menerapkan delta.
+
+    MySQL menerapkan upsert dan delete, sedangkan CSV, Google Sheets, dan Parquet (jika
+    `parquet_dir` diberikan) menambahkan baris perubahan beserta kolom Op sebagai log perubahan.
+    Riwayat produk (`history_path`) mencatat perubahan sebagai observasi baru. `upload_id`
+    seperti pada default_sinks.
+    """
+    sinks = {
+        "mysql": lambda changes: apply_changes_to_mysql(changes, db_url, raise_errors=True),
+        "csv": lambda changes: store_to_csv(changes, changes_csv, append=os.path.exists(changes_csv),
+                                            raise_errors=True),
+        "spreadsheet": lambda changes: store_to_sheets(changes, writer=writer, run_id=upload_id, raise_errors=True),
+    }
+    if parquet_dir is not None:
+        sinks["parquet"] = _parquet_sink(parquet_dir)
+    if history_path is not None:
+        sinks["history"] = _history_sink(history_path)
+    return sinks
+
+
+def _parquet_sink(parquet_dir):
+    def sink(data):
+        # PyArrow baru diimpor saat sink parquet benar-benar dipakai
+        from utils.files import store_to_parquet
+        return store_to_parquet(data, parquet_dir, raise_errors=True)
+    return sink
+
+
+def _history_sink(history_path):
+    def sink(data):
+        from utils.history import store_to_history
+        return store_to_history(data, history_path, raise_errors=True)
+    return sink
+
+
+def spreadsheet_writer(config):
+    """SpreadsheetWriter untuk spreadsheet, range, dan kredensial pada `config`."""
+    return SpreadsheetWriter(spreadsheet_id=config.spreadsheet_id, range_name=config.sheet_range,
+                             service_account_file=config.credentials_path)
+
+
+def sinks_from_config(config, first_batch=True, delta=False, upload_id=None):
+    """Sink yang diaktifkan pada `config.sinks` (utils.config.PipelineConfig).
+
+    Dengan delta=True dipakai delta_sinks untuk DataFrame perubahan dari utils.cdc. `upload_id`
+    (misalnya "run_id/nomor_batch") menjadi kunci checkpoint Google Sheets. Dependensi
+    setiap sink (SQLAlchemy, Google API client, PyArrow, utils.history) baru diimpor saat sink tersebut dipanggil,
+    sehingga run yang hanya menulis CSV tidak pernah memuatnya.
+    """
+    writer = spreadsheet_writer(config)
+    parquet_dir = config.parquet_dir if 'parquet' in config.sinks else None
+    history_path = config.history_path if 'history' in config.sinks else None
+    if delta:
+        sinks = delta_sinks(config.db_url, config.changes_csv, parquet_dir, writer=writer, history_path=history_path,
+                            upload_id=upload_id)
+    else:
+        sinks = default_sinks(config.db_url, first_batch, parquet_dir, config.csv_path, writer=writer,
+                              history_path=history_path, upload_id=upload_id)
+    return {name: sink for name, sink in sinks.items() if name in config.sinks}
+
+
+def store_batches(batches, db_url, sinks_factory=None, timeout=None, journal=None, run_id=None):
+    """Menyimpan setiap batch DataFrame ke seluruh sink secara paralel begitu batch tersebut tersedia.
+
+    Dipakai pada mode streaming: baris pertama sudah tersimpan ketika halaman berikutnya
+    masih diunduh. `sinks_factory(first_batch, upload_id)` menghasilkan dict sink untuk setiap
+    batch (bawaan: default_sinks); upload_id berisi "run_id/nomor_batch" (None tanpa run_id)
+    untuk checkpoint Google Sheets. Mengembalikan ringkasan gabungan seperti run_sinks.
+
+    Dengan `journal` (utils.journal.RunJournal) dan `run_id`, commit setiap sink per batch dicatat
+    dan sink yang sudah commit pada run sebelumnya dilewati (dihitung pada "skipped").
+    """
+    if sinks_factory is None:
+        sinks_factory = lambda first_batch, upload_id: default_sinks(db_url, first_batch, upload_id=upload_id)
+
+    started = time.perf_counter()
+    summary = {"status": "success", "rows": 0, "batches": 0, "skipped": 0, "seconds": 0.0, "sinks": {}}
+    for index, batch in enumerate(batches):
+        sinks = sinks_factory(index == 0, None if run_id is None else f"{run_id}/{index}")
+        if journal is not None:
+            pending = journal.pending_sinks(run_id, index, batch, sinks)
+            summary["skipped"] += len(sinks) - len(pending)
+            sinks = pending
+        result = run_sinks(batch, sinks, timeout=timeout)
+        summary["rows"] += result["rows"]
+        summary["batches"] += 1
+
+        for name, sink_result in result["sinks"].items():
+            total = summary["sinks"].setdefault(name, {"status": "success", "seconds": 0.0, "error": None})
+            total["seconds"] += sink_result["seconds"]
+            if sink_result["status"] != "success":
+                total["status"] = sink_result["status"]
+                total["error"] = sink_result["error"]
+
+    summary["status"] = _summary_status(summary["sinks"])
+    summary["seconds"] = time.perf_counter() - started
+    return summary
@@ -0,0 +1,185 @@
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+
+def _atomic_write(path, text):
+    """Menulis file lewat file sementara lalu os.replace agar pembaca tidak melihat file setengah jadi."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        file.write(text)
+    os.replace(temporary_path, path)
+
+
+def _label(value):
+    """Meng-escape nilai label Prometheus."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class RunMetrics:
+    """Pencatat metrik satu run ETL: durasi per tahap, HTTP, jumlah baris, dan hasil per sink.
+
+    Aman dipakai bersama oleh banyak thread (misalnya Fetcher pada scraping paralel). Hasilnya
+    dapat ditulis sebagai laporan JSON (write_json) dan file teks Prometheus (write_prometheus)
+    yang bisa dibaca node_exporter textfile collector.
+    """
+
+    def __init__(self, run_id=None):
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.http_status = Counter()
+        self.bytes_downloaded = 0
+        self.pages_fetched = 0
+        self.rows = {}
+        self.rejected = Counter()
+        self.sinks = {}
+        self.status = None
+        self.profile_result = {}
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager yang menambahkan durasi blok ke tahap `name` (extract, transform, load, ...)."""
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+                stage["seconds"] += elapsed
+                stage["calls"] += 1
+
+    def record_response(self, status, size=0):
+        """Mencatat satu respons HTTP; `status` None berarti request gagal tanpa respons."""
+        with self._lock:
+            self.http_status["error" if status is None else str(status)] += 1
+            self.bytes_downloaded += size
+            if status is not None and status < 400:
+                self.pages_fetched += 1
+
+    def record_rows(self, stage, rows_in, rows_out):
+        """Menambahkan jumlah baris masuk dan keluar pada tahap `stage`."""
+        with self._lock:
+            rows = self.rows.setdefault(stage, {"in": 0, "out": 0})
+            rows["in"] += rows_in
+            rows["out"] += rows_out
+
+    def record_transform(self, report, stage='transform'):
+        """Mencatat laporan transformasi ({"rows_in", "rows_out", "rejected"}) dari transform_data/TransformEngine."""
+        self.record_rows(stage, report.get("rows_in", 0), report.get("rows_out", 0))
+        with self._lock:
+            self.rejected.update(report.get("rejected", {}))
+
+    def record_sinks(self, summary):
+        """Mencatat ringkasan run_sinks/store_batches: status keseluruhan dan hasil per sink."""
+        with self._lock:
+            self.status = summary.get("status")
+            for name, result in summary.get("sinks", {}).items():
+                self.sinks[name] = {"status": result["status"], "seconds": result["seconds"], "error": result["error"]}
+        self.record_rows("load", summary.get("rows", 0), summary.get("rows", 0))
+
+    @contextmanager
+    def profile(self, cprofile_path=None, trace_memory=False):
+        """Profiling opsional untuk satu run: cProfile ke `cprofile_path` dan/atau puncak memori via tracemalloc.
+
+        Tanpa argumen, context manager ini tidak melakukan apa-apa sehingga dapat selalu dipasang.
+        """
+        profiler = cProfile.Profile() if cprofile_path else None
+        tracing = trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                folder = os.path.dirname(cprofile_path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+                profiler.dump_stats(cprofile_path)
+                self.profile_result["cprofile"] = cprofile_path
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.profile_result["peak_memory_bytes"] = peak
+
+    def to_dict(self):
+        """Laporan run dalam bentuk dict yang dapat di-serialisasi ke JSON."""
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "seconds": time.perf_counter() - self._started,
+                "status": self.status,
+                "stages": {name: dict(stage) for name, stage in self.stages.items()},
+                "http": {
+                    "pages_fetched": self.pages_fetched,
+                    "bytes_downloaded": self.bytes_downloaded,
+                    "status": dict(self.http_status),
+                },
+                "rows": {name: dict(rows) for name, rows in self.rows.items()},
+                "rejected": dict(self.rejected),
+                "sinks": {name: dict(result) for name, result in self.sinks.items()},
+                "profile": dict(self.profile_result),
+            }
+
+    def to_prometheus(self):
+        """Metrik run dalam format teks eksposisi Prometheus."""
+        report = self.to_dict()
+        lines = []
+
+        def metric(name, kind, description, samples):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                labels = ",".join(f'{key}="{_label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+
+        # run_id hanya dipasang pada etl_run_info agar seri metrik lain tidak bertambah di setiap run
+        metric("etl_run_info", "gauge", "Identitas run ETL terakhir.", [({"run_id": report["run_id"]}, 1)])
+        metric("etl_run_duration_seconds", "gauge", "Durasi total run ETL.", [({}, report["seconds"])])
+        metric("etl_run_success", "gauge", "1 jika seluruh sink berhasil.",
+               [({}, int(report["status"] == "success"))])
+        metric("etl_stage_duration_seconds", "gauge", "Durasi per tahap ETL.",
+               [({"stage": name}, stage["seconds"]) for name, stage in report["stages"].items()])
+        metric("etl_pages_fetched_total", "counter", "Jumlah halaman yang berhasil diambil.",
+               [({}, report["http"]["pages_fetched"])])
+        metric("etl_downloaded_bytes_total", "counter", "Jumlah byte konten yang diunduh.",
+               [({}, report["http"]["bytes_downloaded"])])
+        metric("etl_http_responses_total", "counter", "Jumlah respons HTTP per status.",
+               [({"status": status}, count) for status, count in sorted(report["http"]["status"].items())])
+        metric("etl_rows_total", "counter", "Jumlah baris masuk/keluar per tahap.",
+               [({"stage": name, "direction": direction}, count)
+                for name, rows in report["rows"].items() for direction, count in rows.items()])
+        metric("etl_rows_rejected_total", "counter", "Jumlah baris yang dibuang per alasan.",
+               [({"reason": reason}, count) for reason, count in sorted(report["rejected"].items())])
+        metric("etl_sink_duration_seconds", "gauge", "Durasi penulisan per sink.",
+               [({"sink": name}, result["seconds"]) for name, result in report["sinks"].items()])
+        metric("etl_sink_success", "gauge", "1 jika sink berhasil.",
+               [({"sink": name}, int(result["status"] == "success")) for name, result in report["sinks"].items()])
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        """Menulis laporan run sebagai JSON."""
+        _atomic_write(path, json.dumps(self.to_dict(), indent=2))
+        return path
+
+    def write_prometheus(self, path):
+        """Menulis metrik run sebagai file teks Prometheus (.prom)."""
+        _atomic_write(path, self.to_prometheus())
+        return path
@@ -0,0 +1,68 @@
+import re
+
+# Nomor halaman pada widget pagination, misalnya <li class="page-item"><a class="page-link" href="/page3">3</a></li>
+PAGE_LINK_PATTERN = re.compile(
+    r'<li class="page-item[^"]*">\s*<a class="page-link"[^>]*>\s*(\d+)\s*</a>'
+)
+
+
+def last_page_hint(content):
+    """Nomor halaman terbesar pada widget pagination sebuah halaman, atau None jika tidak ada.
+
+    Widget dapat hanya menampilkan sebagian halaman (misalnya 1-3), sehingga nilainya adalah
+    batas bawah jumlah halaman, bukan jumlah pastinya.
+    """
+    if content is None:
+        return None
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', errors='replace')
+    numbers = [int(number) for number in PAGE_LINK_PATTERN.findall(content)]
+    return max(numbers) if numbers else None
+
+
+class PaginationPlanner:
+    """Menentukan halaman yang boleh dijadwalkan tanpa menunggu tombol next halaman sebelumnya.
+
+    Halaman hingga perkiraan halaman terakhir (`last_page`, dari widget pagination; lihat
+    last_page_hint) langsung dijadwalkan seluruhnya. Di luar perkiraan itu, halaman diperiksa
+    secara spekulatif dalam jendela `window` halaman di depan halaman terakhir yang sudah
+    diproses. Begitu sebuah halaman tanpa tombol next ditemukan, `end` terisi dan halaman di
+    belakangnya tidak lagi dijadwalkan (yang sudah berjalan sebaiknya dibatalkan pemanggil).
+    Perkiraan diperbarui dari setiap halaman sehingga katalog yang bertambah atau berkurang
+    tetap ditangani dengan benar. `max_ahead` membatasi jumlah halaman yang dijadwalkan di depan
+    halaman terakhir yang sudah diproses agar memori tetap terbatas pada katalog yang besar.
+    """
+
+    def __init__(self, start_page=2, window=4, last_page=None, max_ahead=None):
+        self.start_page = start_page
+        self.window = max(window, 1)
+        self.last_page = last_page
+        self.max_ahead = max_ahead
+        self.next_page = start_page
+        self.processed = start_page - 1
+        self.end = None
+
+    def observe(self, page_number, has_next, content=None):
+        """Mencatat hasil satu halaman: tombol next-nya dan (opsional) perkiraan dari widget-nya."""
+        hint = last_page_hint(content)
+        if hint is not None:
+            self.last_page = max(self.last_page or 0, hint)
+        if page_number >= self.start_page:
+            self.processed = max(self.processed, page_number)
+            if not has_next:
+                self.end = page_number if self.end is None else min(self.end, page_number)
+
+    def schedule(self):
+        """Nomor halaman baru yang boleh dijadwalkan sekarang, berurutan."""
+        limit = max(self.last_page or 0, self.processed + self.window)
+        if self.max_ahead is not None:
+            limit = min(limit, self.processed + max(self.max_ahead, self.window))
+        if self.end is not None:
+            limit = min(limit, self.end)
+        pages = list(range(self.next_page, limit + 1))
+        self.next_page = max(self.next_page, limit + 1)
+        return pages
+
+    def finished(self, page_number):
+        """True jika `page_number` adalah halaman terakhir atau berada di belakangnya."""
+        return self.end is not None and page_number >= self.end
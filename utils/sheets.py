@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+
+SERVICE_ACCOUNT_FILE = './google-sheets-api.json'
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+SPREADSHEET_ID = '1mYb2HVAmiUnBmjNQF3U7GGItsfSEnJvdsDymKey2bpk'
+RANGE_NAME = 'Sheet1!A1:G'
+
+# Status HTTP dari Sheets API yang layak dicoba ulang (kuota habis dan gangguan server)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_SERVICES = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_sheets_service(service_account_file=SERVICE_ACCOUNT_FILE):
+    """Membangun service Google Sheets sekali per file kredensial lalu memakainya ulang."""
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(service_account_file)
+        if service is None:
+            from google.oauth2.service_account import Credentials
+            from googleapiclient.discovery import build
+
+            credential = Credentials.from_service_account_file(service_account_file, scopes=SCOPES)
+            service = _SERVICES[service_account_file] = build('sheets', 'v4', credentials=credential)
+        return service
+
+
+def _to_values(data):
+    """Mengubah DataFrame menjadi list baris bertipe Python bawaan yang dapat dikirim sebagai JSON."""
+    import pandas as pd
+
+    columns = []
+    for column in data.columns:
+        series = data[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            series = series.dt.strftime("%Y-%m-%d %H:%M:%S")
+        columns.append(series.astype(object).where(series.notna(), '').tolist())
+    return [list(row) for row in zip(*columns)]
+
+
+def _http_status(error):
+    """Mengambil status HTTP dari HttpError googleapiclient (atau objek serupa)."""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+class SpreadsheetWriter:
+    """Penulis Google Sheets yang mengirim data per batch dan dapat melanjutkan upload yang terputus.
+
+    Setiap batch dikirim dengan values().append dan dicoba ulang dengan backoff eksponensial
+    jika terkena kuota (429) atau gangguan server. Jumlah baris yang sudah terkirim dicatat di
+    file checkpoint per (spreadsheet, range, run_id), sehingga run ulang untuk data yang sama
+    melanjutkan dari batch terakhir tanpa menduplikasi baris. Header hanya ditulis jika sheet
+    masih kosong.
+    """
+
+    def __init__(self, service=None, spreadsheet_id=SPREADSHEET_ID, range_name=RANGE_NAME, batch_size=500,
+                 max_retries=5, backoff_factor=1.0, checkpoint_path='sheets_checkpoint.json',
+                 service_account_file=SERVICE_ACCOUNT_FILE):
+        self.service = service
+        self.service_account_file = service_account_file
+        self.spreadsheet_id = spreadsheet_id
+        self.range_name = range_name
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.checkpoint_path = checkpoint_path
+
+    def _sheet(self):
+        if self.service is None:
+            self.service = get_sheets_service(self.service_account_file)
+        return self.service.spreadsheets()
+
+    def _execute(self, request):
+        """Menjalankan request API dengan backoff eksponensial untuk error kuota/server."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return request.execute()
+            except Exception as e:
+                if _http_status(e) not in RETRY_STATUS or attempt == self.max_retries:
+                    raise
+                wait = self.backoff_factor * (2 ** attempt)
+                print(f"Kuota Google Sheets terlampaui, mencoba ulang dalam {wait:.1f} detik: {e}")
+                time.sleep(wait)
+
+    def _load_checkpoints(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path, encoding='utf-8') as file:
+            return json.load(file)
+
+    def _save_checkpoint(self, key, state):
+        checkpoints = self._load_checkpoints()
+        checkpoints[key] = state
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(checkpoints, file, indent=2)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def _sheet_is_empty(self):
+        first_sheet = self.range_name.split('!')[0]
+        result = self._execute(
+            self._sheet().values().get(spreadsheetId=self.spreadsheet_id, range=f"{first_sheet}!A1:A1")
+        )
+        return not result.get('values')
+
+    def forget(self, run_id):
+        """Menghapus checkpoint upload `run_id` dan upload per batch-nya (`run_id`/nomor_batch).
+
+        Dipanggil setelah run selesai agar file checkpoint tidak terus bertambah.
+        """
+        checkpoints = self._load_checkpoints()
+        prefix = f"{self.spreadsheet_id}|{self.range_name}|"
+        kept = {
+            key: state for key, state in checkpoints.items()
+            if not (key == prefix + run_id or key.startswith(f"{prefix}{run_id}/"))
+        }
+        if len(kept) == len(checkpoints):
+            return
+        temporary_path = f"{self.checkpoint_path}.tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(kept, file, indent=2)
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def write(self, data, run_id=None):
+        """Mengirim seluruh baris DataFrame per batch; mengembalikan jumlah baris yang dikirim pada pemanggilan ini.
+
+        `run_id` menandai satu upload; pipeline memakai run_id jurnal dan nomor batch
+        ("run_id/nomor_batch") sehingga batch yang isinya sama pada run lain tetap dikirim. Tanpa
+        run_id dipakai hash isi data sehingga pemanggilan ulang dengan data yang sama otomatis
+        melanjutkan checkpoint-nya.
+        """
+        if run_id is None:
+            import pandas as pd
+            run_id = format(int(pd.util.hash_pandas_object(data, index=False).sum()), 'x')
+        key = f"{self.spreadsheet_id}|{self.range_name}|{run_id}"
+        state = self._load_checkpoints().get(key, {"rows_sent": 0, "complete": False})
+        if state["complete"]:
+            print("Data ini sudah pernah dikirim ke Google Sheets, dilewati.")
+            return 0
+
+        values = _to_values(data)
+        if state["rows_sent"] == 0 and self._sheet_is_empty():
+            self._append([data.columns.tolist()])
+
+        sent = 0
+        for start in range(state["rows_sent"], len(values), self.batch_size):
+            batch = values[start:start + self.batch_size]
+            self._append(batch)
+            sent += len(batch)
+            state["rows_sent"] = start + len(batch)
+            self._save_checkpoint(key, state)
+
+        state["complete"] = True
+        self._save_checkpoint(key, state)
+        return sent
+
+    def _append(self, values):
+        self._execute(
+            self._sheet().values().append(
+                spreadsheetId=self.spreadsheet_id,
+                range=self.range_name,
+                valueInputOption='RAW',
+                body={'values': values},
+            )
+        )
+
+
+def store_to_sheets(data, writer=None, run_id=None, raise_errors=False):
+    """Fungsi untuk menyimpan data ke Google Sheets per batch dengan checkpoint (lihat SpreadsheetWriter)."""
+    try:
+        writer = writer or SpreadsheetWriter()
+        sent = writer.write(data, run_id=run_id)
+        print(f"{sent} baris berhasil disimpan ke Google Sheets!")
+        return sent
+
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data: {e}")
+        if raise_errors:
+            raise
+        return None
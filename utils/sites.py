@@ -0,0 +1,300 @@
+import importlib.util
+import json
+import queue
+import re
+import threading
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from utils.extract import AdaptiveLimiter, FashionColumns, _decode, iter_fashion_pages
+
+# Spesifikasi deklaratif katalog fashion-studio, setara dengan extract_fashion_data.
+# Field harus tepat SITE_FIELDS (kolom data fashion selain Timestamp). Setiap field berupa
+# selector CSS di dalam elemen produk (`item`), opsional `contains` (teks elemen harus memuat
+# penanda ini), `pattern` (regex; grup pertama dipakai jika ada), dan `attribute` (mengambil
+# atribut alih-alih teks). `reject` (opsional) berisi nilai field yang
+# membuat produk dibuang saat extract; fashion-studio tidak memakainya karena penanda seperti
+# "Unknown Product" ditolak per batch oleh utils.validate dan masuk quarantine. `pagination.next`
+# adalah selector tombol halaman berikutnya.
+FASHION_STUDIO = {
+    'name': 'fashion-studio',
+    'initial_url': 'https://fashion-studio.dicoding.dev/',
+    'page_url': 'https://fashion-studio.dicoding.dev/page{}',
+    'item': 'div.product-details',
+    'fields': {
+        'Title': {'selector': 'h3'},
+        'Price': {'selector': '.price'},
+        'Rating': {'selector': 'p', 'contains': 'Rating:', 'pattern': r'Rating: (.*)'},
+        'Colors': {'selector': 'p', 'contains': 'Colors', 'pattern': r'^([^ ]*)'},
+        'Size': {'selector': 'p', 'contains': 'Size:', 'pattern': r'Size: (.*)'},
+        'Gender': {'selector': 'p', 'contains': 'Gender:', 'pattern': r'Gender: (.*)'},
+    },
+    'pagination': {'next': 'li.page-item.next', 'start_page': 2},
+    'concurrency': 4,
+    'requests_per_second': 5.0,
+}
+
+BUILTIN_SITES = {FASHION_STUDIO['name']: FASHION_STUDIO}
+
+FIELD_KEYS = ('selector', 'contains', 'pattern', 'attribute', 'optional')
+
+# Field yang harus didefinisikan setiap spesifikasi: kolom FashionColumns selain Timestamp (diisi extractor)
+SITE_FIELDS = tuple(field for field in FashionColumns.FIELDS if field != 'Timestamp')
+
+
+def _backend(name):
+    """Fungsi (select, text, attribute) untuk backend HTML yang dipakai SiteExtractor."""
+    if name == 'selectolax':
+        return (
+            lambda node, selector: node.css(selector),
+            lambda node: node.text(),
+            lambda node, attribute: node.attributes.get(attribute),
+        )
+    return (
+        lambda node, selector: node.select(selector),
+        lambda node: node.get_text(),
+        lambda node, attribute: node.get(attribute),
+    )
+
+
+class SiteExtractor:
+    """Extractor hasil kompilasi satu spesifikasi situs (lihat FASHION_STUDIO).
+
+    Spesifikasi divalidasi dan regex-nya dikompilasi sekali saat dibuat; backend HTML dipilih
+    sekali (selectolax jika terpasang, selain itu BeautifulSoup). Objek ini dapat dipanggil
+    seperti backend parser: extractor(content) -> (list data, ada_halaman_berikutnya), sehingga
+    dapat diberikan sebagai `parser` ke iter_fashion_pages, termasuk lewat ParsePool.
+    """
+
+    def __init__(self, spec, backend='auto'):
+        self.spec = spec
+        missing = [key for key in ('name', 'page_url', 'item', 'fields') if key not in spec]
+        if missing:
+            raise ValueError(f"Spesifikasi situs tidak lengkap, tidak ada: {', '.join(missing)}")
+        if '{}' not in spec['page_url']:
+            raise ValueError(f"page_url situs {spec['name']} harus memuat {{}} untuk nomor halaman")
+
+        self.name = spec['name']
+        self.page_url = spec['page_url']
+        self.initial_url = spec.get('initial_url')
+        self.item_selector = spec['item']
+        pagination = spec.get('pagination', {})
+        self.next_selector = pagination.get('next')
+        self.start_page = pagination.get('start_page', 2 if self.initial_url else 1)
+        self.concurrency = spec.get('concurrency', 1)
+        self.requests_per_second = spec.get('requests_per_second')
+        self.host = urlsplit(self.page_url).netloc
+
+        missing = [name for name in SITE_FIELDS if name not in spec['fields']]
+        unknown = [name for name in spec['fields'] if name not in SITE_FIELDS]
+        if missing or unknown:
+            raise ValueError(f"Field situs {spec['name']} harus tepat {', '.join(SITE_FIELDS)}"
+                             + (f"; tidak ada: {', '.join(missing)}" if missing else "")
+                             + (f"; tidak dikenal: {', '.join(unknown)}" if unknown else ""))
+
+        fields = []
+        for name, field in spec['fields'].items():
+            unknown = set(field) - set(FIELD_KEYS)
+            if 'selector' not in field or unknown:
+                raise ValueError(f"Field {name} pada situs {self.name} harus punya selector "
+                                 f"dan hanya memakai {', '.join(FIELD_KEYS)}")
+            pattern = re.compile(field['pattern']) if field.get('pattern') else None
+            fields.append((name, field['selector'], field.get('contains'), pattern, field.get('attribute'),
+                           field.get('optional', False)))
+        self.fields = tuple(fields)
+        self.reject = {name: frozenset(values) for name, values in spec.get('reject', {}).items()}
+
+        if backend == 'auto':
+            backend = 'selectolax' if importlib.util.find_spec('selectolax') else 'html.parser'
+        self.backend = backend
+        self._select, self._text, self._attribute = _backend(backend)
+
+    def __getstate__(self):
+        # Lambda backend tidak dapat di-pickle (ParsePool); dikompilasi ulang di proses worker
+        return self.spec, self.backend
+
+    def __setstate__(self, state):
+        spec, backend = state
+        self.__init__(spec, backend)
+
+    def _root(self, content):
+        if self.backend == 'selectolax':
+            from selectolax.lexbor import LexborHTMLParser
+            return LexborHTMLParser(_decode(content))
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(content, "html.parser")
+
+    def _field(self, item, selector, contains, pattern, attribute):
+        """Nilai field dari elemen pertama yang cocok dengan selector, penanda, dan pattern; None jika tidak ada."""
+        for node in self._select(item, selector):
+            value = self._attribute(node, attribute) if attribute else self._text(node)
+            if value is None or (contains is not None and contains not in value):
+                continue
+            if pattern is not None:
+                match = pattern.search(value)
+                if match is None:
+                    continue
+                value = match.group(1) if pattern.groups else match.group(0)
+            return value
+        return None
+
+    def extract(self, item, timestamp):
+        """Mengambil satu produk (dict) dari elemen `item`, atau None jika tidak lengkap atau ditolak.
+
+        Kolom Site berisi nama situs sehingga produk yang sama dari dua situs tetap dibedakan
+        (lihat utils.load.product_key).
+        """
+        record = {}
+        for name, selector, contains, pattern, attribute, optional in self.fields:
+            value = self._field(item, selector, contains, pattern, attribute)
+            if value is None and not optional:
+                print(f"Kesalahan saat mengekstrak data: field {name} tidak ditemukan ({self.name})")
+                return None
+            record[name] = value
+
+        for name, values in self.reject.items():
+            if record.get(name) in values:
+                return None
+        record["Timestamp"] = timestamp
+        record[FashionColumns.SITE_FIELD] = self.name
+        return record
+
+    def __call__(self, content):
+        """Mem-parsing satu halaman menjadi (list data, ada_halaman_berikutnya)."""
+        root = self._root(content)
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        data = []
+        for item in self._select(root, self.item_selector):
+            record = self.extract(item, timestamp)
+            if record is not None:
+                data.append(record)
+
+        has_next = bool(self.next_selector) and bool(self._select(root, self.next_selector))
+        return data, has_next
+
+    def __repr__(self):
+        return f"SiteExtractor({self.name!r}, backend={self.backend!r})"
+
+
+def load_site_specs(sources):
+    """Spesifikasi situs dari nama bawaan (BUILTIN_SITES) atau file JSON berisi satu spesifikasi atau list."""
+    specs = []
+    for source in sources:
+        if source in BUILTIN_SITES:
+            specs.append(BUILTIN_SITES[source])
+            continue
+        with open(source, encoding='utf-8') as file:
+            loaded = json.load(file)
+        specs.extend(loaded if isinstance(loaded, list) else [loaded])
+
+    names = [spec.get('name') for spec in specs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Nama situs harus unik: {', '.join(map(str, duplicates))}")
+    return specs
+
+
+def compile_sites(sources, backend='auto'):
+    """Mengompilasi spesifikasi situs (lihat load_site_specs) menjadi list SiteExtractor."""
+    return [SiteExtractor(spec, backend) for spec in load_site_specs(sources)]
+
+
+def site_limits(extractors, max_rate=5.0):
+    """Batas per host untuk AdaptiveLimiter(host_limits=...) dari anggaran setiap situs."""
+    return {
+        extractor.host: (extractor.requests_per_second or max_rate, extractor.concurrency)
+        for extractor in extractors
+    }
+
+
+def site_pages(extractor, fetcher=None, start_page=None, include_initial=True, incremental=False, parse_pool=None):
+    """Generator (nomor_halaman, list data) untuk satu situs, memakai iter_fashion_pages dengan extractor-nya.
+
+    Jendela halaman yang diambil bersamaan dibatasi `extractor.concurrency`; dengan
+    include_initial=False halaman awal dilewati, misalnya saat melanjutkan dari start_page tertentu.
+    """
+    # Dengan AdaptiveLimiter, laju per situs diatur lewat host_limits (site_limits), bukan jeda tetap
+    rate = extractor.requests_per_second
+    if isinstance(getattr(fetcher, 'limiter', None), AdaptiveLimiter):
+        rate = None
+    return iter_fashion_pages(
+        extractor.page_url,
+        start_page=extractor.start_page if start_page is None else start_page,
+        delay=1.0 / rate if rate else 0,
+        max_workers=extractor.concurrency,
+        requests_per_second=rate,
+        fetcher=fetcher,
+        parser=extractor,
+        incremental=incremental,
+        initial_url=extractor.initial_url if include_initial else None,
+        parse_pool=parse_pool,
+    )
+
+
+_DONE = object()
+
+
+def iter_sites(sources, max_pending_pages=16):
+    """Menjalankan beberapa aliran halaman (dict nama -> iterable (nomor_halaman, data)) bersamaan.
+
+    Setiap situs diambil di thread-nya sendiri, tetapi hasilnya dihasilkan sebagai (nama,
+    nomor_halaman, data) bergiliran satu halaman per situs sesuai urutan `sources`, bukan sesuai
+    thread yang selesai lebih dulu. Urutan ini sama pada setiap run sehingga batch yang
+    dilanjutkan (--resume) berisi baris yang sama dan commit-nya di jurnal tetap berlaku. Paling
+    banyak `max_pending_pages` halaman (dibagi rata antar situs) menunggu diproses. Jika satu situs
+    gagal, situs lain tetap diselesaikan, lalu kesalahan pertama dilempar.
+    """
+    stop = threading.Event()
+    per_site = max(max_pending_pages // max(len(sources), 1), 1)
+    queues = {name: queue.Queue(maxsize=per_site) for name in sources}
+
+    def put(results, item):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(name, pages):
+        results = queues[name]
+        try:
+            for page_number, records in pages:
+                if not put(results, (page_number, records)):
+                    break
+            put(results, (_DONE, None))
+        except Exception as e:
+            put(results, (_DONE, e))
+        finally:
+            close = getattr(pages, 'close', None)
+            if close is not None:
+                close()
+
+    threads = [
+        threading.Thread(target=produce, args=(name, pages), name=f"site-{name}", daemon=True)
+        for name, pages in sources.items()
+    ]
+    for thread in threads:
+        thread.start()
+
+    errors = []
+    active = list(sources)
+    try:
+        while active:
+            for name in list(active):
+                page_number, records = queues[name].get()
+                if page_number is _DONE:
+                    active.remove(name)
+                    if records is not None:
+                        print(f"Scraping situs {name} gagal: {records}")
+                        errors.append(records)
+                    continue
+                yield name, page_number, records
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
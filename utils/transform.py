@@ -1,41 +1,286 @@
+import numpy as np
 import pandas as pd
+from utils.validate import DEFAULT_VALIDATOR, RATING_PATTERN
 
 def transform_to_DataFrame(data):
-    """Mengubah data menjadi DataFrame."""
+    """Mengubah data menjadi DataFrame.
+
+    `data` dapat berupa list of dict atau utils.extract.FashionColumns; untuk FashionColumns
+    DataFrame dibangun langsung dari kolomnya tanpa pivot baris ke kolom.
+    """
     try:
         if not data:  # Jika data kosong (empty list atau None)
             return None
+        if hasattr(data, 'codes') and hasattr(data, 'categories'):
+            return _columns_to_DataFrame(data)
         df = pd.DataFrame(data)
         return df
     except Exception as e:
         print(f"Terjadi kesalahan: {e}")
         return None
 
-def transform_data(data, exchange_rate):
-    """Menggabungkan semua transformasi data menjadi satu fungsi."""
+def _columns_to_DataFrame(data):
+    """Membangun DataFrame dari FashionColumns; Size dan Gender langsung menjadi category."""
+    columns = {}
+    for field in data.fields:
+        if field in data.codes:
+            codes = np.frombuffer(data.codes[field], dtype=np.uint16).astype(np.int32)
+            categories = data.categories[field]
+            if None in categories:
+                # Kategori None (misalnya Site yang kosong) menjadi NaN
+                null = categories.index(None)
+                codes = np.where(codes == null, -1, codes - (codes > null))
+                categories = categories[:null] + categories[null + 1:]
+            columns[field] = pd.Categorical.from_codes(codes, categories=categories)
+        else:
+            columns[field] = data.values[field]
+    return pd.DataFrame(columns)
+
+def transform_data(data, exchange_rate, report=None, quarantine=None):
+    """Menggabungkan semua transformasi data menjadi satu fungsi.
+
+    Data lebih dulu divalidasi dengan utils.validate.RULES; baris yang ditolak diberikan ke
+    `quarantine` (callable, misalnya utils.validate.QuarantineWriter) beserta alasannya.
+    Jika `report` (dict) diberikan, jumlah baris masuk/keluar dan baris yang dibuang per aturan
+    validasi dan duplicate ditambahkan ke dalamnya dengan format yang sama seperti TransformEngine.
+
+    `exchange_rate` berupa kurs tetap, atau utils.currency.CurrencyConverter untuk kurs sesuai
+    tanggal Timestamp setiap baris dan kolom harga tambahan dalam mata uang lain.
+    """
     try:
         if data.empty:
             return None
             
         # Copy dataframe untuk menghindari SettingWithCopyWarning
         df = data.copy()
-        
+
+        # Validasi: baris yang gagal salah satu aturan dipisahkan ke quarantine
+        rows_in = len(df)
+        df, rejected, rule_counts = DEFAULT_VALIDATOR.validate(df)
+        if quarantine is not None:
+            quarantine(rejected)
+
         # Transform Rating
-        df['Rating'] = df['Rating'].str.extract(r'(\d+\.\d+)').astype(float)
+        df['Rating'] = df['Rating'].str.extract(RATING_PATTERN, expand=False).astype(float)
         
         # Transform Price - akan menghasilkan NaN untuk format tidak valid
         df['Price'] = df['Price'].replace({'\$': '', '[^\d.]': ''}, regex=True)
         df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
-        df['Price'] = df['Price'] * exchange_rate
-        
-        # Hapus baris dengan nilai NaN (data invalid)
-        df = df.dropna()
+        if isinstance(exchange_rate, (int, float)):
+            df['Price'] = df['Price'] * exchange_rate
+        else:
+            df = exchange_rate.apply(df)
         
         # Hapus duplikat
+        rows_valid = len(df)
         df = df.drop_duplicates()
         
+        if report is not None:
+            _add_report(report, rows_in, len(df), {**rule_counts, "duplicate": rows_valid - len(df)})
+        
         return df if not df.empty else None
         
     except Exception as e:
         print(f"Terjadi kesalahan: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def _add_report(report, rows_in, rows_out, rejected):
+    """Menambahkan hitungan baris ke dict laporan transformasi."""
+    report["rows_in"] = report.get("rows_in", 0) + rows_in
+    report["rows_out"] = report.get("rows_out", 0) + rows_out
+    totals = report.setdefault("rejected", {})
+    for reason, count in rejected.items():
+        totals[reason] = totals.get(reason, 0) + count
+
+def transform_batches(pages, exchange_rate, batch_size=None, report=None, quarantine=None, seen=None, engine=None):
+    """Mentransformasi aliran list data fashion menjadi aliran micro-batch DataFrame.
+
+    Setiap elemen `pages` adalah list data fashion (misalnya satu halaman). Data dikumpulkan
+    hingga minimal `batch_size` baris (tanpa batch_size, setiap halaman menjadi satu batch),
+    lalu ditransformasi dengan transform_data. Duplikat antar batch juga dibuang. Jika `report`
+    diberikan, hitungan baris seluruh batch diakumulasi ke dalamnya; baris yang gagal validasi
+    diberikan ke `quarantine` (lihat transform_data).
+
+    Hash baris yang sudah dikirim disimpan di `seen` (utils.dedup.RowHashSet); berikan
+    RowHashSet dengan max_memory kecil agar deduplikasi katalog yang lebih besar dari memori
+    tetap dalam batas memori tetap (kelebihannya ditumpahkan ke disk).
+
+    Dengan `engine` (TransformEngine), setiap batch ditransformasi dengan engine.transform
+    sebagai pengganti transform_data; `exchange_rate` dan `quarantine` engine itu yang dipakai.
+    """
+    if seen is None:
+        from utils.dedup import RowHashSet
+
+        with RowHashSet() as own_seen:
+            yield from transform_batches(pages, exchange_rate, batch_size, report, quarantine, own_seen, engine)
+        return
+
+    buffer = []
+
+    def flush(records):
+        df = transform_to_DataFrame(records)
+        if df is None:
+            return None
+        if engine is not None:
+            df, batch_report = engine.transform(df)
+        else:
+            batch_report = {}
+            df = transform_data(df, exchange_rate, batch_report, quarantine)
+        if df is None:
+            if report is not None and batch_report:
+                _add_report(report, batch_report["rows_in"], 0, batch_report["rejected"])
+            return None
+
+        # Buang baris yang sudah pernah dikirim pada batch sebelumnya
+        fresh = seen.add(pd.util.hash_pandas_object(df, index=False).to_numpy())
+        df = df[fresh]
+        if report is not None:
+            batch_report["rejected"]["duplicate"] += int((~fresh).sum())
+            _add_report(report, batch_report["rows_in"], len(df), batch_report["rejected"])
+        return df if not df.empty else None
+
+    for records in pages:
+        buffer.extend(records)
+        if batch_size and len(buffer) < batch_size:
+            continue
+
+        batch = flush(buffer)
+        buffer = []
+        if batch is not None:
+            yield batch
+
+    if buffer:
+        batch = flush(buffer)
+        if batch is not None:
+            yield batch
+
+
+def _parse_unique(series, parse):
+    """Menjalankan `parse` hanya pada nilai unik kolom lalu menyebarkannya kembali ke setiap baris.
+
+    Kolom hasil scraping memiliki sedikit nilai unik (rating, ukuran, timestamp per detik),
+    sehingga regex dan konversi tipe cukup dijalankan sekali per nilai unik.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = parse(pd.Series(uniques, dtype=object))
+    return parsed, codes
+
+
+def _take(parsed, codes, fill):
+    """Mengambil nilai hasil parsing per baris; baris kosong (kode -1) diisi `fill`."""
+    values = np.asarray(parsed)
+    if len(values) == 0:
+        return np.full(len(codes), fill, dtype=values.dtype)
+    result = values[np.where(codes < 0, 0, codes)]
+    result[codes < 0] = fill
+    return result
+
+
+class TransformEngine:
+    """Mesin transformasi vektor yang mengubah setiap kolom langsung ke tipe akhirnya.
+
+    Price menjadi float32 (sudah dikalikan kurs), Rating float32, Colors int8, Size dan Gender
+    category (tanpa prefix "Size: "/"Gender: "), dan Timestamp datetime64. Sebelum parsing,
+    batch divalidasi dengan `validator` (bawaan utils.validate.DEFAULT_VALIDATOR); baris yang
+    gagal dihitung per aturan dan diberikan ke `quarantine` jika ada.
+
+    `exchange_rate` dapat berupa utils.currency.CurrencyConverter; harga kemudian dikonversi
+    sesuai tanggal Timestamp dan kolom mata uang tambahan (misalnya Price_EUR) ikut dihasilkan.
+    """
+
+    RATING_PATTERN = RATING_PATTERN
+    PRICE_JUNK_PATTERN = r'[^\d.]'
+    COLORS_PATTERN = r'(\d+)'
+    PREFIX_PATTERNS = {
+        'Size': r'^\s*Size:\s*',
+        'Gender': r'^\s*Gender:\s*',
+    }
+    COLUMNS = ["Title", "Price", "Rating", "Colors", "Size", "Gender", "Timestamp"]
+
+    def __init__(self, exchange_rate, validator=None, quarantine=None):
+        self.exchange_rate = exchange_rate
+        self.validator = validator or DEFAULT_VALIDATOR
+        self.quarantine = quarantine
+
+    def _price(self, uniques):
+        cleaned = uniques.str.replace(self.PRICE_JUNK_PATTERN, '', regex=True)
+        price = pd.to_numeric(cleaned, errors='coerce')
+        if not isinstance(self.exchange_rate, (int, float)):
+            # Kurs per tanggal baru diterapkan setelah Timestamp diparsing (lihat transform)
+            return price.astype('float64')
+        return (price * self.exchange_rate).astype('float32')
+
+    def _rating(self, uniques):
+        return pd.to_numeric(uniques.str.extract(self.RATING_PATTERN, expand=False), errors='coerce').astype('float32')
+
+    def _colors(self, uniques):
+        colors = pd.to_numeric(uniques.str.extract(self.COLORS_PATTERN, expand=False), errors='coerce')
+        # Nilai di luar rentang int8 dianggap tidak valid
+        return colors.where((colors >= 0) & (colors <= np.iinfo(np.int8).max)).astype('float32')
+
+    def _category(self, series, prefix_pattern):
+        """Membersihkan prefix pada nilai unik lalu membentuk kolom category tanpa menyalin string per baris."""
+        parsed, codes = _parse_unique(series, lambda uniques: uniques.str.replace(prefix_pattern, '', regex=True).str.strip())
+        parsed = parsed.where(parsed != '')
+        category_codes, categories = pd.factorize(parsed, use_na_sentinel=True)
+        final_codes = _take(category_codes, codes, -1)
+        return pd.Categorical.from_codes(final_codes, categories=categories)
+
+    def transform(self, data):
+        """Mentransformasi DataFrame mentah, mengembalikan (DataFrame atau None, laporan)."""
+        report = {"rows_in": 0, "rows_out": 0, "rejected": {}}
+        try:
+            if data is None or data.empty:
+                return None, report
+            report["rows_in"] = len(data)
+
+            data, rejected, rule_counts = self.validator.validate(data)
+            report["rejected"].update(rule_counts)
+            if self.quarantine is not None:
+                self.quarantine(rejected)
+            if data.empty:
+                report["rejected"]["duplicate"] = 0
+                return None, report
+
+            price, codes = _parse_unique(data['Price'], self._price)
+            price = _take(price, codes, np.nan)
+            rating, codes = _parse_unique(data['Rating'], self._rating)
+            rating = _take(rating, codes, np.nan)
+            colors, codes = _parse_unique(data['Colors'], self._colors)
+            colors = _take(colors, codes, np.nan)
+            size = self._category(data['Size'], self.PREFIX_PATTERNS['Size'])
+            gender = self._category(data['Gender'], self.PREFIX_PATTERNS['Gender'])
+            timestamp, codes = _parse_unique(
+                data['Timestamp'], lambda uniques: pd.to_datetime(uniques, errors='coerce', format='ISO8601')
+            )
+            timestamp = _take(timestamp.to_numpy(dtype='datetime64[ns]'), codes, np.datetime64('NaT'))
+            title = data['Title'].to_numpy(dtype=object)
+            extra_prices = {}
+            if not isinstance(self.exchange_rate, (int, float)):
+                extra_prices = self.exchange_rate.convert(price, timestamp)
+                price = extra_prices.pop(self.exchange_rate.column).astype('float32')
+
+            df = pd.DataFrame({
+                "Title": title,
+                "Price": price,
+                "Rating": rating,
+                "Colors": colors.astype('int8'),
+                "Size": size,
+                "Gender": gender,
+                "Timestamp": timestamp,
+            })
+            for position, (name, values) in enumerate(extra_prices.items(), start=2):
+                df.insert(position, name, values.astype('float32'))
+            if 'Site' in data.columns:
+                df['Site'] = pd.Categorical(data['Site'])
+
+            before = len(df)
+            df = df.drop_duplicates(ignore_index=True)
+            report["rejected"]["duplicate"] = before - len(df)
+            report["rows_out"] = len(df)
+
+            return (df if not df.empty else None), report
+
+        except Exception as e:
+            print(f"Terjadi kesalahan: {e}")
+            return None, report
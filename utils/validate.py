@@ -0,0 +1,129 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Aturan validasi data mentah hasil scraping (extract tidak memvalidasi data), menggantikan
+# dropna implisit di transform_data. Setiap aturan memeriksa satu kolom dengan salah satu
+# atau beberapa kunci berikut (nilai kosong gagal, kecuali untuk aturan yang hanya berisi reject):
+#   required  nilai tidak boleh kosong
+#   reject    nilai yang langsung ditolak, misalnya penanda "Unknown Product" dari katalog
+#   pattern   regex yang harus ditemukan pada nilai
+#   between   rentang (min, max) angka dari grup pertama pattern
+#   datetime  nilai harus dapat diparsing sebagai waktu (ISO 8601)
+# Nama aturan dipakai sebagai alasan penolakan di quarantine dan laporan transformasi.
+
+# Rating berupa angka bulat atau desimal sebelum "/ 5", misalnya "⭐ 4.8 / 5" atau "4/5"
+RATING_PATTERN = r'(\d+(?:\.\d+)?)\s*/\s*5'
+
+RULES = (
+    {'name': 'title_missing', 'column': 'Title', 'required': True},
+    {'name': 'title_unknown', 'column': 'Title', 'reject': ['Unknown Product']},
+    {'name': 'price_invalid', 'column': 'Price', 'pattern': r'^\s*\$?\s*\d[\d,]*(?:\.\d+)?\s*$'},
+    {'name': 'rating_invalid', 'column': 'Rating', 'pattern': RATING_PATTERN, 'between': (0, 5)},
+    {'name': 'colors_invalid', 'column': 'Colors', 'pattern': r'(\d+)', 'between': (0, np.iinfo(np.int8).max)},
+    {'name': 'size_missing', 'column': 'Size', 'pattern': r'^\s*(?:Size:)?\s*[^\s:][^:]*$'},
+    {'name': 'gender_missing', 'column': 'Gender', 'pattern': r'^\s*(?:Gender:)?\s*[^\s:][^:]*$'},
+    {'name': 'timestamp_invalid', 'column': 'Timestamp', 'datetime': True},
+)
+
+RULE_KEYS = ('name', 'column', 'required', 'reject', 'pattern', 'between', 'datetime')
+
+REASON_COLUMN = 'Reason'
+
+
+class Validator:
+    """Tahap validasi deklaratif: menjalankan RULES sebagai predikat kolom atas satu batch.
+
+    Setiap aturan dievaluasi hanya pada nilai unik kolomnya (pd.factorize) lalu disebarkan ke
+    seluruh baris sebagai mask boolean, sehingga tidak ada pemeriksaan Python per data. Baris
+    yang gagal satu aturan atau lebih dipisahkan beserta alasannya.
+    """
+
+    def __init__(self, rules=RULES):
+        for rule in rules:
+            unknown = set(rule) - set(RULE_KEYS)
+            if 'name' not in rule or 'column' not in rule or unknown:
+                raise ValueError(f"Aturan validasi harus punya name dan column dan hanya memakai "
+                                 f"{', '.join(RULE_KEYS)}: {rule!r}")
+        self.rules = tuple(rules)
+
+    def _check(self, rule, uniques):
+        """Mask boolean nilai unik yang lolos `rule`."""
+        passed = np.ones(len(uniques), dtype=bool)
+        if rule.get('reject'):
+            passed &= ~uniques.isin(rule['reject']).to_numpy()
+        if rule.get('pattern'):
+            text = uniques.astype(str)
+            if rule.get('between'):
+                low, high = rule['between']
+                number = pd.to_numeric(text.str.extract(rule['pattern'], expand=False), errors='coerce')
+                passed &= ((number >= low) & (number <= high)).to_numpy()
+            else:
+                passed &= text.str.contains(rule['pattern'], regex=True).to_numpy()
+        if rule.get('datetime'):
+            passed &= pd.to_datetime(uniques, errors='coerce', format='ISO8601').notna().to_numpy()
+        return passed
+
+    def masks(self, data):
+        """Dict nama aturan -> mask boolean baris `data` yang gagal aturan tersebut."""
+        factorized = {}
+        masks = {}
+        for rule in self.rules:
+            column = rule['column']
+            if column not in factorized:
+                codes, uniques = pd.factorize(data[column], use_na_sentinel=True)
+                factorized[column] = codes, pd.Series(uniques, dtype=object)
+            codes, uniques = factorized[column]
+            passed = self._check(rule, uniques)
+            # Nilai kosong (kode -1) ditangani aturan required/pattern/datetime, bukan reject
+            missing_passes = not any(rule.get(key) for key in ('required', 'pattern', 'datetime'))
+            masks[rule['name']] = ~np.append(passed, missing_passes)[codes]
+        return masks
+
+    def validate(self, data):
+        """Memisahkan `data` menjadi (baris valid, baris ditolak dengan kolom Reason, jumlah per aturan)."""
+        masks = self.masks(data)
+        counts = {name: int(mask.sum()) for name, mask in masks.items()}
+        rejected = np.zeros(len(data), dtype=bool)
+        for mask in masks.values():
+            rejected |= mask
+
+        quarantined = data[rejected]
+        if len(quarantined):
+            failed = np.column_stack([mask[rejected] for mask in masks.values()])
+            names = np.array(list(masks), dtype=object)
+            reasons = [';'.join(names[row]) for row in failed]
+            quarantined = quarantined.assign(**{REASON_COLUMN: reasons})
+        else:
+            quarantined = quarantined.assign(**{REASON_COLUMN: pd.Series(dtype=object)})
+        return data[~rejected], quarantined, counts
+
+
+DEFAULT_VALIDATOR = Validator()
+
+
+class QuarantineWriter:
+    """Sink quarantine: menulis baris yang ditolak validasi (beserta kolom Reason) ke CSV.
+
+    Penulisan pertama menimpa file (satu file per run), penulisan berikutnya menambahkan baris
+    tanpa header. Dapat diberikan sebagai `quarantine` ke transform_data, transform_batches,
+    atau TransformEngine.
+    """
+
+    def __init__(self, path='hasil/quarantine.csv'):
+        self.path = path
+        self.rows = 0
+
+    def __call__(self, rejected):
+        if rejected is None or rejected.empty:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            if self.rows:
+                rejected.to_csv(self.path, mode='a', header=False, index=False)
+            else:
+                rejected.to_csv(self.path, index=False)
+            self.rows += len(rejected)
+        except Exception as e:
+            print(f"Terjadi kesalahan saat menyimpan data quarantine: {e}")